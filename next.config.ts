@@ -1,11 +1,83 @@
 import type { NextConfig } from "next";
+import { existsSync, readFileSync } from "fs";
+import path from "path";
+
+// Written by `python3 scripts/precompress.py --json` in prebuild:
+// {path under public/: {bytes, '.gz': bytes | null, '.br': bytes | null}}
+const PRECOMPRESS_REPORT = path.join(process.cwd(), '.cache', 'precompressed.json');
+const CONTENT_TYPES: Record<string, string> = {
+  '.glb': 'model/gltf-binary',
+  '.gltf': 'model/gltf+json',
+  '.bin': 'application/octet-stream',
+  '.geojson': 'application/geo+json',
+  '.json': 'application/json',
+  '.js': 'text/javascript',
+  '.mjs': 'text/javascript',
+  '.wasm': 'application/wasm',
+  '.svg': 'image/svg+xml',
+  '.css': 'text/css',
+  '.txt': 'text/plain',
+  '.xml': 'application/xml',
+};
+// Brotli is preferred when the client accepts both
+const ENCODINGS = [
+  { suffix: '.br', encoding: 'br' },
+  { suffix: '.gz', encoding: 'gzip' },
+] as const;
+
+type PrecompressReport = Record<string, Record<string, number | null>>;
+
+// Public files with a .br/.gz sibling. Next serves public/ as is, so each
+// one gets a rewrite to its variant plus the headers the variant needs.
+function precompressedAssets() {
+  if (!existsSync(PRECOMPRESS_REPORT)) return [];
+  const report = JSON.parse(readFileSync(PRECOMPRESS_REPORT, 'utf-8')) as PrecompressReport;
+  return Object.entries(report).map(([file, entry]) => ({
+    source: '/' + file.split(path.sep).join('/'),
+    type: CONTENT_TYPES[path.extname(file)] ?? 'application/octet-stream',
+    encodings: ENCODINGS.filter(({ suffix }) => entry[suffix]),
+  }));
+}
+
+function accepts(encoding: string) {
+  return [{ type: 'header' as const, key: 'accept-encoding', value: `.*\\b${encoding}\\b.*` }];
+}
+
+const PRECOMPRESSED = precompressedAssets();
 
 const nextConfig: NextConfig = {
   allowedDevOrigins: ['192.168.1.99'],
   reactCompiler: true,
   poweredByHeader: false,
+  async rewrites() {
+    return {
+      beforeFiles: PRECOMPRESSED.flatMap(({ source, encodings }) =>
+        encodings.map(({ suffix, encoding }) => ({ source, has: accepts(encoding), destination: source + suffix })),
+      ),
+      afterFiles: [],
+      fallback: [],
+    };
+  },
   async headers() {
     return [
+      // Headers match the requested path, so when both variants match the
+      // later (Brotli) rule wins, like the first matching rewrite above
+      ...PRECOMPRESSED.flatMap(({ source, type, encodings }) => [
+        { source, headers: [{ key: 'Vary', value: 'Accept-Encoding' }] },
+        ...[...encodings].reverse().map(({ encoding }) => ({
+          source,
+          has: accepts(encoding),
+          headers: [
+            { key: 'Content-Encoding', value: encoding },
+            { key: 'Content-Type', value: type },
+          ],
+        })),
+      ]),
+      {
+        // Content-hashed models published by scripts/model_manifest.py
+        source: '/models/:path*/:file([\\w-]+\\.[0-9a-f]{12}\\.glb)',
+        headers: [{ key: 'Cache-Control', value: 'public, max-age=31536000, immutable' }],
+      },
       {
         source: '/(.*)',
         headers: [
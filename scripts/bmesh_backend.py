@@ -0,0 +1,190 @@
+"""
+Operator-free construction helpers for generate-skill-models.py.
+
+Drop-in replacements for the helpers that go through bpy.ops (primitive
+adds, transform_apply, shade_smooth, text convert, modifier_apply and the
+select-all/delete in clear_scene). Primitives are built with the same
+bmesh ops the primitive_*_add operators call, the torus with the torus
+add-on's own vertex and UV layout, and objects are linked through the data
+API. Nothing here touches the selection or the active object, and no
+operator runs, so a builder placing dozens of parts no longer pays for a
+context override and a depsgraph update per call.
+
+The geometry is the same as the operator path: same vertex order, UVs and
+object/mesh names. Only run inside Blender.
+"""
+
+import math
+
+import bmesh
+import bpy
+from mathutils import Matrix, Vector
+
+__all__ = [
+    "clear_scene", "smooth_shade", "add_uv_sphere", "add_torus", "add_cylinder", "add_cube",
+    "apply_scale", "add_text", "instance_copies",
+]
+
+
+def clear_scene():
+    for obj in list(bpy.data.objects):
+        bpy.data.objects.remove(obj)
+    for m in list(bpy.data.meshes):
+        bpy.data.meshes.remove(m)
+    for m in list(bpy.data.materials):
+        bpy.data.materials.remove(m)
+    for c in list(bpy.data.curves):
+        bpy.data.curves.remove(c)
+    bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
+
+
+def link_object(name, data, location, rotation=(0, 0, 0)):
+    obj = bpy.data.objects.new(name, data)
+    obj.location = location
+    obj.rotation_euler = rotation
+    bpy.context.collection.objects.link(obj)
+    return obj
+
+
+def bmesh_primitive(name, create, location, **params):
+    """Run one bmesh create_* op into a new mesh, with UVs as calc_uvs leaves them."""
+    bm = bmesh.new()
+    bm.loops.layers.uv.new("UVMap")
+    create(bm, calc_uvs=True, **params)
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    return link_object(name, mesh, location)
+
+
+def smooth_shade(obj):
+    polygons = obj.data.polygons
+    polygons.foreach_set("use_smooth", [True] * len(polygons))
+    obj.data.update()
+
+
+def add_uv_sphere(radius, location, segments=32, ring_count=16):
+    return bmesh_primitive("Sphere", bmesh.ops.create_uvsphere, location,
+                           u_segments=segments, v_segments=ring_count, radius=radius)
+
+
+def add_cylinder(radius, depth, location, vertices=32):
+    # primitive_cylinder_add's default N-gon caps
+    return bmesh_primitive("Cylinder", bmesh.ops.create_cone, location, cap_ends=True, cap_tris=False,
+                           segments=vertices, radius1=radius, radius2=radius, depth=depth)
+
+
+def add_cube(size, location):
+    return bmesh_primitive("Cube", bmesh.ops.create_cube, location, size=size)
+
+
+def torus_geometry(major_radius, minor_radius, major_segments, minor_segments):
+    """Flat coordinates and quad loops in the order primitive_torus_add writes them."""
+    coords = []
+    loops = []
+    total = major_segments * minor_segments
+    i1 = 0
+    for major in range(major_segments):
+        turn = Matrix.Rotation(major / major_segments * 2 * math.pi, 3, 'Z')
+        for minor in range(minor_segments):
+            angle = 2 * math.pi * minor / minor_segments
+            co = turn @ Vector((major_radius + math.cos(angle) * minor_radius, 0.0, math.sin(angle) * minor_radius))
+            coords.extend(co[:])
+            if minor + 1 == minor_segments:
+                i2 = major * minor_segments
+                i3 = i1 + minor_segments
+                i4 = i2 + minor_segments
+            else:
+                i2 = i1 + 1
+                i3 = i1 + minor_segments
+                i4 = i3 + 1
+            loops.extend([i1, i3 % total, i4 % total, i2 % total])
+            i1 += 1
+    return coords, loops
+
+
+def torus_uvs(major_segments, minor_segments):
+    """Per-loop UVs as the torus add-on lays them out, wrapping at 1.0."""
+    u_step = 1.0 / major_segments
+    v_step = 1.0 / minor_segments
+    u_wrap = 1.0 - u_step / 2
+    v_wrap = 1.0 - v_step / 2
+    uvs = []
+    u_prev = 0.5 + math.fmod(0.5, u_step)
+    u_next = u_prev + u_step
+    for _ in range(major_segments):
+        v_prev = 0.5 + math.fmod(0.5, v_step)
+        v_next = v_prev + v_step
+        for _ in range(minor_segments):
+            uvs.extend((u_prev, v_prev, u_next, v_prev, u_next, v_next, u_prev, v_next))
+            v_prev = v_next - 1.0 if v_next > v_wrap else v_next
+            v_next = v_prev + v_step
+        u_prev = u_next - 1.0 if u_next > u_wrap else u_next
+        u_next = u_prev + u_step
+    return uvs
+
+
+def add_torus(major_radius, minor_radius, location, major_segments=48, minor_segments=12, rotation=(0, 0, 0)):
+    coords, loops = torus_geometry(major_radius, minor_radius, major_segments, minor_segments)
+    mesh = bpy.data.meshes.new("Torus")
+    mesh.vertices.add(len(coords) // 3)
+    mesh.loops.add(len(loops))
+    mesh.polygons.add(len(loops) // 4)
+    mesh.vertices.foreach_set("co", coords)
+    mesh.polygons.foreach_set("loop_start", range(0, len(loops), 4))
+    mesh.loops.foreach_set("vertex_index", loops)
+    mesh.uv_layers.new(name="UVMap").data.foreach_set("uv", torus_uvs(major_segments, minor_segments))
+    mesh.update()
+    return link_object("Torus", mesh, location, rotation)
+
+
+def apply_scale(obj, scale):
+    obj.data.transform(Matrix.Diagonal((*scale, 1.0)))
+    # transform_apply keeps faces pointing outwards under a mirroring scale
+    if scale[0] * scale[1] * scale[2] < 0:
+        obj.data.flip_normals()
+    obj.data.update()
+    obj.scale = (1, 1, 1)
+
+
+def add_text(body, location, size, extrude, bevel_depth):
+    curve = bpy.data.curves.new("Text", type='FONT')
+    curve.body = body
+    curve.size = size
+    curve.extrude = extrude
+    curve.bevel_depth = bevel_depth
+    curve.bevel_resolution = 3
+    curve.align_x = 'CENTER'
+    curve.align_y = 'CENTER'
+    source = link_object("Text", curve, location)
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    mesh = bpy.data.meshes.new_from_object(source.evaluated_get(depsgraph))
+    bpy.data.objects.remove(source)
+    mesh.name = "Text"
+    return link_object("Text", mesh, location)
+
+
+def instance_copies(proto, name, transforms):
+    """instance_copies from generate-skill-models.py, applying modifiers without modifier_apply."""
+    if proto.modifiers:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        mesh = bpy.data.meshes.new_from_object(proto.evaluated_get(depsgraph))
+        original = proto.data
+        proto.modifiers.clear()
+        proto.data = mesh
+        mesh_name = original.name
+        bpy.data.meshes.remove(original)
+        mesh.name = mesh_name
+    group = bpy.data.objects.new(name, None)
+    bpy.context.collection.objects.link(group)
+    copies = []
+    for location, rotation, scale in transforms:
+        obj = proto.copy()
+        obj.parent = group
+        obj.location = location
+        obj.rotation_euler = rotation
+        obj.scale = scale
+        bpy.context.collection.objects.link(obj)
+        copies.append(obj)
+    bpy.data.objects.remove(proto)
+    return copies
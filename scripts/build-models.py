@@ -0,0 +1,370 @@
+"""
+Build the hero sculpture and skill GLB models across a pool of headless
+Blender workers. Each model is generated by its own `blender --background`
+process, so the files in public/models/ match a serial run byte for byte.
+Once the batch is done turntable sprite strips are rendered for changed
+skills (see turntable.py) and every model is published under a
+content-hashed name (see model_manifest.py), and the .br/.gz siblings in
+public/models/ are refreshed (see precompress.py). The skill atlas
+(skill_atlas.py) is only repacked with --atlas, since no page loads it yet.
+
+Models whose cache key is unchanged since the last build are skipped. The
+key covers the builder's source, the pbr_material/add_subsurf/add_bevel
+calls it makes, the shared helpers and exporter settings, and the Blender
+version (or the NumPy backend's source). Keys are stored in
+.cache/build-models.json, outside public/ so the cache isn't deployed.
+
+With --backend numpy, skill models are built in plain Python through
+numpy_backend.py. The hero sculpture and the text badges still need Blender.
+--construction bmesh has the Blender workers build parts through bmesh and
+the data API instead of bpy.ops (bmesh_backend.py).
+
+--profile merges the skill workers' stage timings, operator counts and
+peak memory into one report, with each worker's Blender startup, as JSON
+(a Chrome/Perfetto trace) and collapsed stacks (see profiling.py).
+Run: python scripts/build-models.py [--only hero,react,rust] [--jobs 4] [--force] [--bake-hero] [--atlas]
+     [--bake-lighting none|ao|full] [--profile report.json]
+     [--backend blender|numpy] [--construction ops|bmesh] [--compression none|draco|meshopt] [--blender /path/to/blender]
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from model_manifest import publish_models
+from precompress import precompress
+from profiling import merge_reports, read_report, write_report
+from skill_atlas import pack_atlas
+from turntable import render_turntables
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SKILL_SCRIPT = os.path.join(SCRIPTS_DIR, "generate-skill-models.py")
+HERO_SCRIPT = os.path.join(SCRIPTS_DIR, "generate-hero-sculpture.py")
+NUMPY_BACKEND_SOURCES = [os.path.join(SCRIPTS_DIR, f) for f in ("numpy_backend.py", "gltf_io.py")]
+BMESH_BACKEND_SOURCE = os.path.join(SCRIPTS_DIR, "bmesh_backend.py")
+# Post-export passes run inside every skill worker
+POST_EXPORT_SOURCES = [os.path.join(SCRIPTS_DIR, f) for f in ("glb_optimize.py", "gltf_io.py", "material_palette.py", "vertex_lighting.py")]
+MODELS_DIR = os.path.join(os.path.dirname(SCRIPTS_DIR), "public", "models")
+CACHE_PATH = os.path.join(os.path.dirname(SCRIPTS_DIR), ".cache", "build-models.json")
+
+HERO = "hero"
+KEYED_HELPERS = {"pbr_material", "add_subsurf", "add_bevel"}
+
+
+def read_source(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def discover_models():
+    """Model names in declaration order, read from the make_* builders."""
+    tree = ast.parse(read_source(SKILL_SCRIPT))
+    return [
+        node.name[len("make_"):]
+        for node in tree.body
+        if isinstance(node, ast.FunctionDef) and node.name.startswith("make_")
+    ]
+
+
+def output_path(name):
+    if name == HERO:
+        return os.path.join(MODELS_DIR, "hero-sculpture.glb")
+    return os.path.join(MODELS_DIR, "skills", f"{name}.glb")
+
+
+def blender_version(blender):
+    try:
+        proc = subprocess.run([blender, "--version"], capture_output=True, text=True)
+    except OSError as e:
+        raise SystemExit(f"Cannot run Blender ({blender}): {e}")
+    lines = proc.stdout.strip().splitlines()
+    return lines[0] if lines else "unknown"
+
+
+def skill_cache_inputs(source):
+    """Per-builder key material for generate-skill-models.py.
+
+    Everything outside the make_* builders (helpers, export_glb settings,
+    module constants) is shared by all models; each builder adds its own
+    source plus the helper calls it makes. Also reports whether the builder
+    makes text badges, which only the Blender backend can build.
+    """
+    tree = ast.parse(source)
+    shared = []
+    builders = {}
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name.startswith("make_"):
+            called = [
+                call for call in ast.walk(node)
+                if isinstance(call, ast.Call) and isinstance(call.func, ast.Name)
+            ]
+            calls = [ast.unparse(call) for call in called if call.func.id in KEYED_HELPERS]
+            uses_text = any(call.func.id == "add_text" for call in called)
+            builders[node.name[len("make_"):]] = (ast.get_source_segment(source, node), calls, uses_text)
+        else:
+            shared.append(ast.get_source_segment(source, node))
+    return "\n".join(shared), builders
+
+
+def model_backends(names, backend):
+    """Backend per model: NumPy where asked for and possible, else Blender."""
+    _, builders = skill_cache_inputs(read_source(SKILL_SCRIPT))
+    return {
+        name: "numpy" if backend == "numpy" and name != HERO and not builders[name][2] else "blender"
+        for name in names
+    }
+
+
+def skill_options(args):
+    """Generator flags forwarded to every skill worker; part of the cache key."""
+    # Workers each build one model; the atlas and manifest are written once after the batch
+    options = ["--no-publish", "--compression", args.compression]
+    if args.compression == "draco":
+        options += [
+            "--draco-position-bits", str(args.draco_position_bits),
+            "--draco-normal-bits", str(args.draco_normal_bits),
+        ]
+    if not args.lods:
+        options.append("--no-lods")
+    if not args.gpu_instances:
+        options.append("--no-instancing")
+    if not args.quantize:
+        options.append("--no-quantize")
+    if not args.palette:
+        options.append("--no-palette")
+    if args.bake_lighting != "none":
+        options += ["--bake-lighting", args.bake_lighting]
+    if args.construction != "ops":
+        options += ["--construction", args.construction]
+    return options
+
+
+def hero_options(args):
+    """Flags forwarded to the hero worker; part of its cache key."""
+    if not args.bake_hero:
+        return []
+    return ["--bake", "--bake-size", str(args.bake_size)]
+
+
+def compute_keys(backends, blender, options, hero):
+    # Only pay for `blender --version` when something is built with Blender
+    version = blender_version(blender) if "blender" in backends.values() else None
+    numpy_version = "numpy backend " + hashlib.sha256(
+        "".join(read_source(p) for p in NUMPY_BACKEND_SOURCES).encode()).hexdigest()[:16]
+    keys = {}
+    params = {}
+    shared, builders = skill_cache_inputs(read_source(SKILL_SCRIPT))
+    shared += "".join(read_source(p) for p in POST_EXPORT_SOURCES)
+    if "bmesh" in options:
+        shared += read_source(BMESH_BACKEND_SOURCE)
+    for name, backend in backends.items():
+        h = hashlib.sha256()
+        h.update((version if backend == "blender" else numpy_version).encode())
+        if name == HERO:
+            h.update(read_source(HERO_SCRIPT).encode())
+            h.update(" ".join(hero).encode())
+        else:
+            builder_source, calls, _ = builders[name]
+            h.update(shared.encode())
+            h.update(builder_source.encode())
+            h.update("\n".join(calls).encode())
+            h.update(" ".join(options).encode())
+            params[name] = calls
+        keys[name] = h.hexdigest()
+    return version, keys, params
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_cache():
+    if not os.path.exists(CACHE_PATH):
+        return {"models": {}}
+    with open(CACHE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_cache(cache):
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    tmp = CACHE_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, CACHE_PATH)
+
+
+def is_fresh(entry, key, path):
+    # The output hash guards against hand-edited or half-written files
+    return (
+        entry is not None
+        and entry.get("key") == key
+        and os.path.exists(path)
+        and file_digest(path) == entry.get("sha256")
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate hero and skill GLB models in parallel Blender workers.")
+    parser.add_argument("--only", default="", help="comma-separated model names, e.g. hero,react,rust")
+    parser.add_argument("--force", action="store_true", help="rebuild even when the cache key is unchanged")
+    parser.add_argument("--backend", choices=["blender", "numpy"], default="blender",
+                        help="geometry backend for the skill models")
+    parser.add_argument("--construction", choices=["ops", "bmesh"], default="ops",
+                        help="build skill model parts with bpy.ops or with bmesh and the data API")
+    parser.add_argument("--compression", choices=["none", "draco", "meshopt"], default="none",
+                        help="skill model compression profile")
+    parser.add_argument("--draco-position-bits", type=int, default=14)
+    parser.add_argument("--draco-normal-bits", type=int, default=10)
+    parser.add_argument("--no-lods", dest="lods", action="store_false", help="skip the decimated LOD chain")
+    parser.add_argument("--no-instancing", dest="gpu_instances", action="store_false",
+                        help="write repeated parts as separate nodes instead of EXT_mesh_gpu_instancing")
+    parser.add_argument("--no-quantize", dest="quantize", action="store_false",
+                        help="skip the KHR_mesh_quantization and index reordering pass")
+    parser.add_argument("--no-palette", dest="palette", action="store_false",
+                        help="skip merging meshes that share a material")
+    parser.add_argument("--bake-lighting", choices=["none", "ao", "full"], default="none",
+                        help="bake occlusion/static lighting into skill model vertex colors")
+    parser.add_argument("--bake-hero", action="store_true",
+                        help="also export the low-poly hero variant with a Cycles-baked normal map")
+    parser.add_argument("--bake-size", type=int, default=512, help="hero normal map resolution")
+    parser.add_argument("--atlas", action="store_true",
+                        help="also repack the skills into atlas.glb (skill_atlas.py)")
+    parser.add_argument("--profile", metavar="REPORT.json",
+                        help="write a merged per-stage profile of the skill workers (and a .folded file)")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="number of Blender workers")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    return parser.parse_args()
+
+
+def select_models(only, available):
+    if not only:
+        return list(available)
+    names = [n.strip() for n in only.split(",") if n.strip()]
+    unknown = [n for n in names if n not in available]
+    if unknown:
+        raise SystemExit(f"Unknown model(s): {', '.join(unknown)} (choose from {', '.join(available)})")
+    return names
+
+
+def run_worker(blender, name, backend, options):
+    if backend == "numpy":
+        cmd = [sys.executable, SKILL_SCRIPT, "--backend", "numpy", "--only", name] + options
+    elif name == HERO:
+        cmd = [blender, "--background", "--python-exit-code", "1",
+               "--python", HERO_SCRIPT, "--", "--no-publish"] + options
+    else:
+        cmd = [blender, "--background", "--python-exit-code", "1",
+               "--python", SKILL_SCRIPT, "--", "--only", name] + options
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    return name, proc, time.perf_counter() - start
+
+
+def write_profile(path, profile_dir, timings, total):
+    """Merge the workers' reports; models built without a report (hero) get their wall time only."""
+    reports = []
+    for name in sorted(timings):
+        report_path = os.path.join(profile_dir, f"{name}.json")
+        if os.path.exists(report_path):
+            reports.append((name, *read_report(report_path)))
+    merged = merge_reports(reports, generator="build-models.py", totalSeconds=round(total, 3))
+    for name, elapsed in timings.items():
+        merged["workers"].setdefault(name, {})["seconds"] = round(elapsed, 3)
+    write_report(path, merged)
+    shutil.rmtree(profile_dir, ignore_errors=True)
+    print(f"  Profile written to {path} (python scripts/profiling.py {path})")
+
+
+def compress_models():
+    # Variants of replaced or unpublished GLBs would otherwise be served stale
+    report, removed = precompress([MODELS_DIR])
+    written = sum(1 for entry in report.values() for suffix in (".br", ".gz") if entry.get(suffix))
+    print(f"  Precompressed {len(report)} asset(s) into {written} variant(s), removed {len(removed)} stale")
+
+
+def main():
+    args = parse_args()
+    batch_start = time.perf_counter()
+    selected = select_models(args.only, [HERO] + discover_models())
+
+    options = skill_options(args)
+    hero = hero_options(args)
+    backends = model_backends(selected, args.backend)
+    version, keys, params = compute_keys(backends, args.blender, options, hero)
+    cache = load_cache()
+    entries = cache.setdefault("models", {})
+    names = [
+        n for n in selected
+        if args.force or not is_fresh(entries.get(n), keys[n], output_path(n))
+    ]
+    for name in selected:
+        if name not in names:
+            print(f"  {name:<12} cached")
+    if not names:
+        publish_models()
+        compress_models()
+        print(f"=== All {len(selected)} model(s) up to date ({time.perf_counter() - batch_start:.2f}s) ===")
+        return
+    jobs = max(1, min(args.jobs, len(names)))
+    profile_dir = tempfile.mkdtemp(prefix="build-profile-") if args.profile else None
+
+    def worker_options(name):
+        if name == HERO:
+            return hero
+        if profile_dir is None:
+            return options
+        return options + ["--profile", os.path.join(profile_dir, f"{name}.json")]
+
+    on = ", ".join(sorted({version if backends[n] == "blender" else "NumPy" for n in names}))
+    print(f"=== Building {len(names)} model(s) with {jobs} worker(s) on {on} ===")
+    timings = {}
+    failed = []
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(run_worker, args.blender, name, backends[name], worker_options(name))
+            for name in names
+        ]
+        for future in as_completed(futures):
+            name, proc, elapsed = future.result()
+            timings[name] = elapsed
+            if proc.returncode != 0:
+                failed.append(name)
+                print(f"  FAILED {name} after {elapsed:.2f}s")
+                sys.stderr.write(proc.stdout + proc.stderr)
+            else:
+                print(f"  {name:<12} {elapsed:6.2f}s  ({backends[name]})")
+                entries[name] = {
+                    "key": keys[name],
+                    "sha256": file_digest(output_path(name)),
+                    "params": params.get(name, []),
+                }
+    if version:
+        cache["blender"] = version
+    save_cache(cache)
+    if any(n != HERO and n not in failed for n in names):
+        if args.atlas:
+            pack_atlas()
+        render_turntables()
+    publish_models()
+    compress_models()
+    total = time.perf_counter() - batch_start
+    if profile_dir is not None:
+        write_profile(args.profile, profile_dir, timings, total)
+
+    print(f"=== Batch finished in {total:.2f}s (sum of model times {sum(timings.values()):.2f}s) ===")
+    if failed:
+        raise SystemExit(f"Failed: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+"""
+Compress the animation clips of robot-expressive.glb and optionally split
+them into separately loadable files that share one skeleton.
+
+Every channel is resampled onto a uniform grid (--fps) and keys that linear
+or slerp interpolation reproduces within tolerance are dropped. Channels
+that hold the rest pose for the whole clip are removed, since three.js
+restores the rest pose of properties no action drives. Rotations are stored
+as normalized int16 quaternions. glTF only allows float translations, so
+those are snapped to a grid well inside the tolerance instead, which leaves
+them far more compressible over the wire.
+
+Output goes to public/models/robot-expressive/. robot.glb holds the mesh,
+skeleton and the --keep clips (all of them without --split); with --split
+every other clip is written to clips/{name}.glb with just a named node per
+animated joint; three.js binds the tracks to the model by name, so mesh
+nodes that share a joint's name are renamed. index.json lists each clip's keys,
+bytes and the maximum world-space joint error against the source, measured
+by forward kinematics over the skins' joints. The results are then
+published under content-hashed names (see model_manifest.py).
+Run: python scripts/compress-animations.py [--split] [--keep Idle] [--fps 24] [--tolerance 0.001] [--no-publish]
+"""
+
+import argparse
+import copy
+import json
+import os
+
+import numpy as np
+
+from gltf_io import BinWriter, COMPONENT_DTYPES, accessor_nbytes, compact, encode_glb, read_floats, read_glb
+from model_manifest import is_hashed, publish_models
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "public", "models", "robot-expressive.glb")
+OUTPUT_DIR = os.path.join(ROOT, "public", "models", "robot-expressive")
+MODEL_NAME = "robot.glb"
+CLIPS_DIR = "clips"
+INDEX_NAME = "index.json"
+
+FLOAT, SHORT = 5126, 5122
+# Scale and morph weight tracks are unitless, so they get fixed tolerances
+SCALE_TOLERANCE = 1e-4
+WEIGHT_TOLERANCE = 1 / 1024
+# Translations are snapped to tolerance / TRANSLATION_STEPS in local units
+TRANSLATION_STEPS = 8
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Resample, reduce, quantize and split GLB animation clips.")
+    parser.add_argument("source", nargs="?", default=SOURCE)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--fps", type=float, default=24.0, help="resampling rate before key reduction")
+    parser.add_argument("--tolerance", type=float, default=0.001,
+                        help="translation tolerance in world units (converted per joint)")
+    parser.add_argument("--rotation-tolerance", type=float, default=0.001, help="rotation tolerance in radians")
+    parser.add_argument("--split", action="store_true", help="write clips not in --keep to separate files")
+    parser.add_argument("--keep", default="Idle", help="comma-separated clips that stay in robot.glb with --split")
+    parser.add_argument("--no-publish", dest="publish", action="store_false",
+                        help="don't publish content-hashed copies after writing")
+    return parser.parse_args()
+
+
+def slerp(a, b, t):
+    dot = np.sum(a * b, axis=1, keepdims=True)
+    b = np.where(dot < 0, -b, b)
+    theta = np.arccos(np.clip(np.abs(dot), 0, 1))
+    sin = np.sin(theta)
+    small = sin < 1e-6
+    t = t[:, None]
+    wa = np.where(small, 1 - t, np.sin((1 - t) * theta) / np.where(small, 1, sin))
+    wb = np.where(small, t, np.sin(t * theta) / np.where(small, 1, sin))
+    out = wa * a + wb * b
+    return out / np.linalg.norm(out, axis=1, keepdims=True)
+
+
+def sample(times, values, path, at, interpolation="LINEAR"):
+    """Evaluate a sampler at the times in `at`, clamped to its range."""
+    if len(times) == 1:
+        return np.repeat(values[:1], len(at), axis=0)
+    at = np.clip(at, times[0], times[-1])
+    i = np.clip(np.searchsorted(times, at, side="right") - 1, 0, len(times) - 2)
+    if interpolation == "STEP":
+        return values[np.where(at >= times[i + 1], i + 1, i)]
+    span = times[i + 1] - times[i]
+    u = np.where(span > 0, (at - times[i]) / np.where(span > 0, span, 1), 0.0)
+    if path == "rotation":
+        return slerp(values[i], values[i + 1], u)
+    return values[i] + (values[i + 1] - values[i]) * u[:, None]
+
+
+def track_error(path, a, b):
+    if path == "rotation":
+        return 2 * np.arccos(np.clip(np.abs(np.sum(a * b, axis=1)), 0, 1))
+    return np.abs(a - b).max(axis=1)
+
+
+def reduce_keys(times, values, path, tolerance):
+    """Keep a key only where interpolating straight past it would exceed tolerance."""
+    if track_error(path, values, np.repeat(values[:1], len(values), axis=0)).max() <= tolerance:
+        return [0]
+    keep = [0]
+    anchor = 0
+    for j in range(2, len(times)):
+        inner = np.arange(anchor + 1, j)
+        approx = sample(times[[anchor, j]], values[[anchor, j]], path, times[inner])
+        if track_error(path, approx, values[inner]).max() > tolerance:
+            keep.append(j - 1)
+            anchor = j - 1
+    keep.append(len(times) - 1)
+    return keep
+
+
+def quantize_track(path, values, tolerance):
+    """Values as they will read back after storage, and the storage spec."""
+    if path == "rotation":
+        # Keep neighbouring keys in the same hemisphere so slerp takes the short way
+        for i in range(1, len(values)):
+            if np.dot(values[i - 1], values[i]) < 0:
+                values[i] = -values[i]
+        stored = np.round(values * 32767)
+        return stored / 32767, (stored, SHORT, True)
+    if path == "translation":
+        step = tolerance / TRANSLATION_STEPS
+        snapped = np.round(values / step) * step
+        return snapped, (snapped, FLOAT, False)
+    return values, (values, FLOAT, False)
+
+
+def quat_matrices(q):
+    x, y, z, w = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    m = np.empty((len(q), 3, 3))
+    m[:, 0, 0] = 1 - 2 * (y * y + z * z)
+    m[:, 0, 1] = 2 * (x * y - z * w)
+    m[:, 0, 2] = 2 * (x * z + y * w)
+    m[:, 1, 0] = 2 * (x * y + z * w)
+    m[:, 1, 1] = 1 - 2 * (x * x + z * z)
+    m[:, 1, 2] = 2 * (y * z - x * w)
+    m[:, 2, 0] = 2 * (x * z - y * w)
+    m[:, 2, 1] = 2 * (y * z + x * w)
+    m[:, 2, 2] = 1 - 2 * (x * x + y * y)
+    return m
+
+
+class Skeleton:
+    def __init__(self, gltf):
+        self.nodes = gltf["nodes"]
+        self.parents = {}
+        for index, node in enumerate(self.nodes):
+            for child in node.get("children", []):
+                self.parents[child] = index
+        self.order = []
+        for root in gltf["scenes"][gltf.get("scene", 0)]["nodes"]:
+            self._walk(root)
+        self.joints = sorted({j for skin in gltf.get("skins", []) for j in skin["joints"]})
+        rest = self.world({}, np.zeros(1))
+        # Scale from world units to each node's local translation units
+        self.parent_scale = {
+            i: float(np.linalg.norm(rest[self.parents[i]][0, :3, :3], axis=0).max()) if i in self.parents else 1.0
+            for i in self.order
+        }
+
+    def _walk(self, index):
+        self.order.append(index)
+        for child in self.nodes[index].get("children", []):
+            self._walk(child)
+
+    def rest(self, index, path):
+        node = self.nodes[index]
+        return np.asarray(node.get(path, {"translation": (0, 0, 0), "rotation": (0, 0, 0, 1),
+                                           "scale": (1, 1, 1)}[path]), dtype=np.float64)
+
+    def world(self, tracks, at):
+        """World matrices per node, shape (len(at), 4, 4), with tracks {(node, path): (times, values)}."""
+        count = len(at)
+        world = {}
+        for index in self.order:
+            node = self.nodes[index]
+            if "matrix" in node:
+                local = np.tile(np.asarray(node["matrix"], dtype=np.float64).reshape(4, 4).T, (count, 1, 1))
+            else:
+                trs = {}
+                for path in ("translation", "rotation", "scale"):
+                    track = tracks.get((index, path))
+                    trs[path] = sample(*track[:2], path, at) if track else np.tile(self.rest(index, path), (count, 1))
+                local = np.tile(np.eye(4), (count, 1, 1))
+                local[:, :3, :3] = quat_matrices(trs["rotation"]) * trs["scale"][:, None, :]
+                local[:, :3, 3] = trs["translation"]
+            parent = self.parents.get(index)
+            world[index] = local if parent is None else world[parent] @ local
+        return world
+
+    def joint_positions(self, tracks, at):
+        world = self.world(tracks, at)
+        return np.stack([world[j][:, :3, 3] for j in self.joints], axis=1)
+
+
+def clip_tracks(gltf, binary, animation):
+    tracks = {}
+    for channel in animation["channels"]:
+        target = channel["target"]
+        if "node" not in target:
+            continue
+        sampler = animation["samplers"][channel["sampler"]]
+        interpolation = sampler.get("interpolation", "LINEAR")
+        if interpolation == "CUBICSPLINE":
+            raise SystemExit(f"{animation.get('name')}: CUBICSPLINE samplers are not supported")
+        times = read_floats(gltf, binary, sampler["input"]).ravel()
+        values = read_floats(gltf, binary, sampler["output"]).reshape(len(times), -1)
+        tracks[(target["node"], target["path"])] = (times, values, interpolation)
+    return tracks
+
+
+def compress_clip(gltf, binary, animation, skeleton, args):
+    """Compressed tracks plus stats for one animation."""
+    source = clip_tracks(gltf, binary, animation)
+    start = min(t[0][0] for t in source.values())
+    end = max(t[0][-1] for t in source.values())
+    grid = np.linspace(start, end, max(2, int(round((end - start) * args.fps)) + 1))
+
+    tracks = {}
+    keys_before = sum(len(t[0]) for t in source.values())
+    for (node, path), (times, values, interpolation) in sorted(source.items()):
+        resampled = sample(times, values, path, grid, interpolation)
+        if path == "rotation":
+            tolerance = args.rotation_tolerance
+        elif path == "translation":
+            tolerance = args.tolerance / skeleton.parent_scale.get(node, 1.0)
+        elif path == "scale":
+            tolerance = SCALE_TOLERANCE
+        else:
+            tolerance = WEIGHT_TOLERANCE
+        keep = reduce_keys(grid, resampled, path, tolerance)
+        kept_times, kept_values = grid[keep], resampled[keep]
+
+        if len(keep) == 1:
+            if path == "weights":
+                weights = gltf["meshes"][gltf["nodes"][node]["mesh"]].get("weights")
+                rest = np.zeros(kept_values.shape[1]) if weights is None else np.asarray(weights, dtype=np.float64)
+            else:
+                rest = skeleton.rest(node, path)
+            if track_error(path, kept_values, rest[None]).max() <= tolerance:
+                continue  # holds the rest pose for the whole clip
+        decoded, stored = quantize_track(path, kept_values.copy(), tolerance)
+        tracks[(node, path)] = (kept_times, decoded, stored)
+
+    # Joint error over the source keys and the midpoints between them
+    source_times = np.unique(np.concatenate([t[0] for t in source.values()]))
+    at = np.unique(np.concatenate([source_times, (source_times[1:] + source_times[:-1]) / 2]))
+    reference = skeleton.joint_positions({k: v[:2] for k, v in source.items() if k[1] != "weights"}, at)
+    compressed = skeleton.joint_positions({k: v[:2] for k, v in tracks.items() if k[1] != "weights"}, at)
+    error = float(np.linalg.norm(reference - compressed, axis=2).max()) if skeleton.joints else 0.0
+
+    return tracks, {
+        "duration": round(float(end - start), 4),
+        "channels": [len(source), len(tracks)],
+        "keys": [keys_before, sum(len(t[0]) for t in tracks.values())],
+        "maxJointError": error,
+    }
+
+
+class AnimationWriter:
+    """Writes compressed tracks into a glTF, sharing identical time accessors.
+
+    All accessors go into one buffer view, written by finish(), to keep the
+    JSON of small clip files down.
+    """
+
+    def __init__(self, gltf, writer):
+        self.gltf = gltf
+        self.writer = writer
+        self.inputs = {}
+        self.data = bytearray()
+        self.pending = []
+
+    def accessor(self, array, component_type, accessor_type, normalized=False, bounds=False):
+        array = np.ascontiguousarray(array, dtype=COMPONENT_DTYPES[component_type])
+        rows = array.reshape(len(array), -1)
+        self.data.extend(b"\x00" * (-len(self.data) % 4))
+        accessor = {
+            "byteOffset": len(self.data),
+            "componentType": component_type,
+            "count": len(rows),
+            "type": accessor_type,
+        }
+        if normalized:
+            accessor["normalized"] = True
+        if bounds:
+            accessor["min"] = rows.min(axis=0).tolist()
+            accessor["max"] = rows.max(axis=0).tolist()
+        self.data.extend(array.tobytes())
+        self.pending.append(accessor)
+        self.gltf.setdefault("accessors", []).append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+    def finish(self):
+        if self.pending:
+            view = self.writer.add_view(bytes(self.data))
+            for accessor in self.pending:
+                accessor["bufferView"] = view
+
+    def animation(self, name, tracks):
+        samplers = []
+        channels = []
+        for (node, path), (times, _, (values, component_type, normalized)) in sorted(tracks.items()):
+            key = np.asarray(times, dtype=np.float32).tobytes()
+            if key not in self.inputs:
+                self.inputs[key] = self.accessor(times, FLOAT, "SCALAR", bounds=True)
+            accessor_type = {"translation": "VEC3", "rotation": "VEC4", "scale": "VEC3", "weights": "SCALAR"}[path]
+            output = self.accessor(values, component_type, accessor_type, normalized=normalized)
+            samplers.append({"input": self.inputs[key], "output": output, "interpolation": "LINEAR"})
+            channels.append({"sampler": len(samplers) - 1, "target": {"node": node, "path": path}})
+        return {"name": name, "channels": channels, "samplers": samplers}
+
+
+def clip_bytes(gltf, animation):
+    used = {s["input"] for s in animation["samplers"]} | {s["output"] for s in animation["samplers"]}
+    return sum(accessor_nbytes(gltf["accessors"][i]) for i in used)
+
+
+def unique_node_names(gltf):
+    """Rename mesh nodes that share a joint's name so tracks bind unambiguously."""
+    seen = {node.get("name") for node in gltf["nodes"] if "mesh" not in node}
+    for node in gltf["nodes"]:
+        if "mesh" in node and node.get("name") in seen:
+            base = node["name"] + "_mesh"
+            name, suffix = base, 1
+            while name in seen:
+                suffix += 1
+                name = f"{base}{suffix}"
+            node["name"] = name
+        seen.add(node.get("name"))
+
+
+def clip_document(source, animation_tracks, name):
+    """A GLB holding one clip and a named node for each node it animates."""
+    targets = sorted({node for node, _ in animation_tracks})
+    remap = {node: i for i, node in enumerate(targets)}
+    gltf = {
+        "asset": {"generator": "portfolio compress-animations", "version": "2.0"},
+        "scene": 0,
+        "scenes": [{"nodes": list(range(len(targets)))}],
+        "nodes": [{"name": source["nodes"][node]["name"]} for node in targets],
+    }
+    tracks = {(remap[node], path): track for (node, path), track in animation_tracks.items()}
+    writer = BinWriter(gltf)
+    animations = AnimationWriter(gltf, writer)
+    gltf["animations"] = [animations.animation(name, tracks)]
+    animations.finish()
+    return gltf, bytes(writer.data)
+
+
+def write(path, gltf, binary):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = encode_glb(gltf, binary)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def main():
+    args = parse_args()
+    gltf, binary = read_glb(args.source)
+    unique_node_names(gltf)
+    skeleton = Skeleton(gltf)
+    keep = {n.strip() for n in args.keep.split(",") if n.strip()}
+    names = [a.get("name", f"clip{i}") for i, a in enumerate(gltf.get("animations", []))]
+    unknown = keep - set(names)
+    if args.split and unknown:
+        raise SystemExit(f"Unknown clip(s): {', '.join(sorted(unknown))} (choose from {', '.join(names)})")
+
+    model = copy.deepcopy(gltf)
+    writer = BinWriter(model, binary)
+    animations = AnimationWriter(model, writer)
+    model["animations"] = []
+    clips = {}
+    split = {}
+    for name, animation in zip(names, gltf.get("animations", [])):
+        tracks, stats = compress_clip(gltf, binary, animation, skeleton, args)
+        stats["bytes"] = [clip_bytes(gltf, animation), 0]
+        # Clip files carry no meshes, so morph weight tracks could not bind there
+        if args.split and name not in keep and not any(path == "weights" for _, path in tracks):
+            split[name] = tracks
+            stats["file"] = f"{CLIPS_DIR}/{name}.glb"
+        else:
+            model["animations"].append(animations.animation(name, tracks))
+            stats["bytes"][1] = clip_bytes(model, model["animations"][-1])
+            stats["file"] = MODEL_NAME
+        clips[name] = stats
+
+    animations.finish()
+    model["asset"] = dict(model.get("asset", {}), generator="portfolio compress-animations")
+    model, model_binary = compact(model, bytes(writer.data))
+    model_size = write(os.path.join(args.output_dir, MODEL_NAME), model, model_binary)
+
+    clips_dir = os.path.join(args.output_dir, CLIPS_DIR)
+    if os.path.isdir(clips_dir):
+        for filename in os.listdir(clips_dir):
+            # Stale hashed copies are publish_models' job
+            if filename.endswith(".glb") and not is_hashed(filename) and filename[:-len(".glb")] not in split:
+                os.remove(os.path.join(clips_dir, filename))
+    for name, tracks in split.items():
+        clip, clip_binary = clip_document(gltf, tracks, name)
+        clips[name]["bytes"][1] = clip_bytes(clip, clip["animations"][0])
+        clips[name]["fileBytes"] = write(os.path.join(clips_dir, f"{name}.glb"), clip, clip_binary)
+
+    source_size = os.path.getsize(args.source)
+    total = model_size + sum(clips[n]["fileBytes"] for n in split)
+    print(f"=== {os.path.basename(args.source)}: {source_size / 1024:.0f}KB -> {MODEL_NAME} "
+          f"{model_size / 1024:.0f}KB" + (f" + {len(split)} clip file(s), {total / 1024:.0f}KB total" if split else "")
+          + " ===")
+    print(f"  {'clip':<10} {'file':<22} {'keys':>13} {'track bytes':>17} {'file':>8} {'max joint err':>14}")
+    for name, stats in clips.items():
+        keys = f"{stats['keys'][0]} -> {stats['keys'][1]}"
+        size = f"{stats['bytes'][0]} -> {stats['bytes'][1]}"
+        file_size = stats.get("fileBytes", "")
+        print(f"  {name:<10} {stats['file']:<22} {keys:>13} {size:>17} {file_size:>8} {stats['maxJointError']:>14.2e}")
+
+    index = {
+        "source": os.path.basename(args.source),
+        "model": MODEL_NAME,
+        "bytes": model_size,
+        "fps": args.fps,
+        "tolerance": {"translation": args.tolerance, "rotation": args.rotation_tolerance},
+        "clips": {
+            name: dict(stats, maxJointError=round(stats["maxJointError"], 6))
+            for name, stats in clips.items()
+        },
+    }
+    with open(os.path.join(args.output_dir, INDEX_NAME), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+        f.write("\n")
+
+    if args.publish:
+        publish_models()
+
+
+if __name__ == "__main__":
+    main()
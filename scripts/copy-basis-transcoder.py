@@ -0,0 +1,37 @@
+"""
+Copy three's Basis Universal transcoder into public/basis/ so KTX2Loader can
+fetch it at runtime (the Globe's .ktx2 tiers from generate-globe-textures.py).
+
+The files come from the installed three package, so the copy always matches
+the KTX2Loader version that loads them.
+Run: python scripts/copy-basis-transcoder.py
+"""
+
+import os
+import shutil
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIR = os.path.join(ROOT, "node_modules", "three", "examples", "jsm", "libs", "basis")
+OUTPUT_DIR = os.path.join(ROOT, "public", "basis")
+FILES = ("basis_transcoder.js", "basis_transcoder.wasm")
+
+
+def main():
+    if not os.path.isdir(SOURCE_DIR):
+        raise SystemExit(f"{SOURCE_DIR} not found; run npm install first")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    for name in FILES:
+        source = os.path.join(SOURCE_DIR, name)
+        target = os.path.join(OUTPUT_DIR, name)
+        with open(source, "rb") as f:
+            data = f.read()
+        if os.path.exists(target):
+            with open(target, "rb") as f:
+                if f.read() == data:
+                    continue
+        shutil.copyfile(source, target)
+        print(f"  {name}: {len(data) / 1024:.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Precompile world-110m.geojson into a binary line-segment buffer for the Globe.
+
+Every ring is projected onto the unit sphere with the same lat/lng mapping as
+latLngToVec3() in Globe.tsx and expanded into LineSegments vertex pairs. The
+client scales the unit sphere to its globe radius, so it can hand the buffer
+straight to a BufferAttribute without touching individual points.
+
+File layout (little endian):
+    bytes 0-3    magic "CLN1"
+    bytes 4-7    uint32 vertex count (two per segment)
+    bytes 8-11   uint32 flags, bit 0 set = int16 normalized, else float32
+    bytes 12-15  reserved (0)
+    bytes 16-    xyz positions
+
+Rings can be simplified with Douglas-Peucker (tolerance in degrees) before
+projection. --benchmark compares bytes, parse time and allocations of the
+GeoJSON path against the binary buffer.
+Needs NumPy.
+Run: python scripts/generate-country-lines.py [--tolerance 0.1] [--float32] [--benchmark]
+"""
+
+import argparse
+import json
+import math
+import os
+import struct
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GEOJSON_PATH = os.path.join(ROOT, "public", "data", "world-110m.geojson")
+OUTPUT_PATH = os.path.join(ROOT, "public", "data", "country-lines.bin")
+
+MAGIC = b"CLN1"
+HEADER = struct.Struct("<4sIII")
+FLAG_INT16 = 1
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build the binary country-border buffer for Globe.tsx.")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="Douglas-Peucker tolerance in degrees (0 keeps every point)")
+    parser.add_argument("--float32", action="store_true", help="store float32 positions instead of int16")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--benchmark", action="store_true", help="compare against parsing the GeoJSON")
+    return parser.parse_args()
+
+
+def load_rings(path):
+    with open(path, encoding="utf-8") as f:
+        geojson = json.load(f)
+    rings = []
+    for feature in geojson["features"]:
+        geometry = feature["geometry"]
+        if geometry["type"] == "Polygon":
+            polygons = [geometry["coordinates"]]
+        elif geometry["type"] == "MultiPolygon":
+            polygons = geometry["coordinates"]
+        else:
+            continue
+        for polygon in polygons:
+            for ring in polygon:
+                rings.append(np.asarray(ring, dtype=np.float64)[:, :2])
+    return rings
+
+
+def simplify(ring, tolerance):
+    """Douglas-Peucker over (lng, lat); keeps both endpoints of the ring."""
+    if tolerance <= 0 or len(ring) < 3:
+        return ring
+    keep = np.zeros(len(ring), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(ring) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        a, b = ring[start], ring[end]
+        points = ring[start + 1:end]
+        ab = b - a
+        length_sq = ab @ ab
+        if length_sq == 0:
+            # Closed ring: the chord is a point, fall back to radial distance
+            dist = np.linalg.norm(points - a, axis=1)
+        else:
+            t = np.clip((points - a) @ ab / length_sq, 0.0, 1.0)
+            dist = np.linalg.norm(points - (a + t[:, None] * ab), axis=1)
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = start + 1 + i
+            keep[mid] = True
+            stack.append((start, mid))
+            stack.append((mid, end))
+    return ring[keep]
+
+
+def project(lnglat):
+    """Same mapping as latLngToVec3() in Globe.tsx, on the unit sphere."""
+    phi = np.radians(90.0 - lnglat[:, 1])
+    theta = np.radians(lnglat[:, 0] + 180.0)
+    sin_phi = np.sin(phi)
+    return np.stack([-sin_phi * np.cos(theta), np.cos(phi), sin_phi * np.sin(theta)], axis=1)
+
+
+def segment_buffer(rings, tolerance):
+    pairs = []
+    for ring in rings:
+        pts = project(simplify(ring, tolerance))
+        if len(pts) < 2:
+            continue
+        # Interleave (p0, p1), (p1, p2), ... for LineSegments
+        seg = np.empty((len(pts) - 1, 2, 3), dtype=np.float64)
+        seg[:, 0] = pts[:-1]
+        seg[:, 1] = pts[1:]
+        pairs.append(seg.reshape(-1, 3))
+    return np.concatenate(pairs)
+
+
+def encode(positions, quantize):
+    if quantize:
+        data = np.round(np.clip(positions, -1.0, 1.0) * 32767).astype("<i2")
+        flags = FLAG_INT16
+    else:
+        data = positions.astype("<f4")
+        flags = 0
+    return HEADER.pack(MAGIC, len(positions), flags, 0) + data.tobytes()
+
+
+def decode(buf):
+    magic, count, flags, _ = HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError("not a country-lines buffer")
+    dtype = "<i2" if flags & FLAG_INT16 else "<f4"
+    return np.frombuffer(buf, dtype=dtype, count=count * 3, offset=HEADER.size)
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def geojson_path(raw):
+    # Mirrors useCountryLines(): parse the JSON, then one vector per point
+    # and a flat list of numbers before the final Float32Array.
+    geojson = json.loads(raw)
+    positions = []
+    for feature in geojson["features"]:
+        geometry = feature["geometry"]
+        coords = geometry["coordinates"]
+        rings = coords if geometry["type"] == "Polygon" else [r for p in coords for r in p]
+        for ring in rings:
+            pts = []
+            for lng, lat in ring:
+                phi = math.radians(90 - lat)
+                theta = math.radians(lng + 180)
+                pts.append((-math.sin(phi) * math.cos(theta), math.cos(phi), math.sin(phi) * math.sin(theta)))
+            for i in range(len(pts) - 1):
+                positions.extend(pts[i])
+                positions.extend(pts[i + 1])
+    return np.asarray(positions, dtype=np.float32)
+
+
+def benchmark(binary):
+    with open(GEOJSON_PATH, "rb") as f:
+        raw = f.read()
+    rows = []
+    _, elapsed, peak = measure(lambda: geojson_path(raw))
+    rows.append(("geojson", len(raw), elapsed, peak))
+    for label, buf in binary:
+        _, elapsed, peak = measure(lambda: decode(buf))
+        rows.append((label, len(buf), elapsed, peak))
+    print(f"  {'source':<22} {'bytes':>10} {'parse ms':>10} {'peak alloc':>12}")
+    for label, size, elapsed, peak in rows:
+        print(f"  {label:<22} {size:>10} {elapsed * 1000:>10.2f} {peak:>12}")
+
+
+def main():
+    args = parse_args()
+    rings = load_rings(GEOJSON_PATH)
+    positions = segment_buffer(rings, args.tolerance)
+    buf = encode(positions, quantize=not args.float32)
+    with open(args.output, "wb") as f:
+        f.write(buf)
+    print(f"Wrote {args.output}: {len(positions) // 2} segments, {len(buf) / 1024:.0f}KB")
+
+    if args.benchmark:
+        variants = []
+        for tolerance in (0.0, 0.05, 0.2):
+            pts = segment_buffer(rings, tolerance)
+            variants.append((f"bin f32 tol={tolerance}", encode(pts, quantize=False)))
+            variants.append((f"bin i16 tol={tolerance}", encode(pts, quantize=True)))
+        benchmark(variants)
+
+
+if __name__ == "__main__":
+    main()
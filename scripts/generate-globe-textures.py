@@ -0,0 +1,166 @@
+"""
+Generate resolution tiers of the Globe earth maps as KTX2 (Basis Universal)
+with precomputed mipmaps, plus plain JPEG/PNG fallbacks.
+
+The day map is encoded as ETC1S in sRGB. Topology and water are packed into
+one linear "relief" texture (R = topology, G = water mask) encoded as UASTC,
+so the globe needs two GPU-compressed textures instead of three RGBA uploads.
+A manifest (src/data/globe-textures.json, read by src/lib/globeTextures.ts)
+lists every tier with its dimensions and byte sizes so the Globe can pick one
+for the device. No map is upscaled past its source: the relief
+map stops at the narrower of topology and water, and tiers above that point
+at the largest relief actually written instead of a duplicate.
+
+Needs Pillow, and toktx from KTX-Software on PATH for the .ktx2 files.
+Run: python scripts/generate-globe-textures.py [--tiers 1024,2048,4096] [--no-ktx2]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIR = os.path.join(ROOT, "public", "textures")
+OUTPUT_DIR = os.path.join(SOURCE_DIR, "globe")
+MANIFEST_PATH = os.path.join(ROOT, "src", "data", "globe-textures.json")
+BASE_URL = "/textures/globe/"
+
+DAY_SOURCE = "earth-day.jpg"
+TOPOLOGY_SOURCE = "earth-topology.png"
+WATER_SOURCE = "earth-water.png"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build tiered, GPU-compressed Globe textures.")
+    parser.add_argument("--tiers", default="1024,2048,4096", help="comma-separated tier widths (2:1 equirectangular)")
+    parser.add_argument("--no-ktx2", dest="ktx2", action="store_false", help="only write JPEG/PNG tiers")
+    parser.add_argument("--toktx", default=shutil.which("toktx") or "toktx", help="toktx executable")
+    return parser.parse_args()
+
+
+def load(name, mode):
+    return Image.open(os.path.join(SOURCE_DIR, name)).convert(mode)
+
+
+def fit(image, width):
+    """Resize to a width x width/2 tier, never upscaling past the source."""
+    width = min(width, image.width)
+    if image.width == width:
+        return image
+    return image.resize((width, width // 2), Image.Resampling.LANCZOS)
+
+
+def relief_width(topology, water, width):
+    """Tier width of the relief map, capped by the smaller source so neither is upscaled."""
+    return min(width, topology.width, water.width)
+
+
+def relief_map(topology, water, width):
+    # Topology and water may have different source sizes; bring both to the
+    # tier size first, then pack into R and G (B unused).
+    size = (width, width // 2)
+    topology = fit(topology, width)
+    water = fit(water, width)
+    blank = Image.new("L", size, 0)
+    return Image.merge("RGB", (topology, water, blank))
+
+
+def mip_chain(image):
+    levels = [image]
+    while levels[-1].width > 1 or levels[-1].height > 1:
+        prev = levels[-1]
+        size = (max(1, prev.width // 2), max(1, prev.height // 2))
+        levels.append(prev.resize(size, Image.Resampling.BOX))
+    return levels
+
+
+def write_ktx2(toktx, image, path, srgb):
+    with tempfile.TemporaryDirectory() as tmp:
+        level_paths = []
+        for i, level in enumerate(mip_chain(image)):
+            level_path = os.path.join(tmp, f"level{i}.png")
+            level.save(level_path)
+            level_paths.append(level_path)
+        # Compressed textures can't be flipped on upload, so store them bottom-up
+        # the way three's UV sphere expects
+        cmd = [toktx, "--t2", "--mipmap", "--lower_left_maps_to_s0t0"]
+        if srgb:
+            cmd += ["--encode", "etc1s", "--clevel", "4", "--qlevel", "255", "--assign_oetf", "srgb"]
+        else:
+            cmd += ["--encode", "uastc", "--uastc_quality", "2", "--zcmp", "19", "--assign_oetf", "linear"]
+        subprocess.run(cmd + [path] + level_paths, check=True)
+    return os.path.getsize(path)
+
+
+def main():
+    args = parse_args()
+    tiers = sorted(int(t) for t in args.tiers.split(",") if t.strip())
+    if args.ktx2 and shutil.which(args.toktx) is None:
+        raise SystemExit(f"toktx not found ({args.toktx}); install KTX-Software or pass --no-ktx2")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    day_source = load(DAY_SOURCE, "RGB")
+    topology_source = load(TOPOLOGY_SOURCE, "L")
+    water_source = load(WATER_SOURCE, "L")
+    manifest = {"base": BASE_URL, "tiers": []}
+    relief_entry = None
+    print("=== Generating Globe texture tiers ===")
+    for width in tiers:
+        label = f"{width // 1024}k" if width % 1024 == 0 else str(width)
+        day = fit(day_source, width)
+
+        tier = {"label": label, "width": day.width, "height": day.height, "files": {}}
+        day_jpg = f"earth-day.{label}.jpg"
+        day.save(os.path.join(OUTPUT_DIR, day_jpg), quality=85, optimize=True, progressive=True)
+        tier["files"]["day"] = {"fallback": day_jpg, "fallbackBytes": os.path.getsize(os.path.join(OUTPUT_DIR, day_jpg))}
+        if args.ktx2:
+            day_ktx2 = f"earth-day.{label}.ktx2"
+            tier["files"]["day"]["ktx2"] = day_ktx2
+            tier["files"]["day"]["ktx2Bytes"] = write_ktx2(
+                args.toktx, day, os.path.join(OUTPUT_DIR, day_ktx2), srgb=True)
+
+        width = relief_width(topology_source, water_source, width)
+        if relief_entry is None or relief_entry["width"] != width:
+            relief = relief_map(topology_source, water_source, width)
+            relief_png = f"earth-relief.{label}.png"
+            relief.save(os.path.join(OUTPUT_DIR, relief_png), optimize=True)
+            relief_entry = {
+                "fallback": relief_png,
+                "fallbackBytes": os.path.getsize(os.path.join(OUTPUT_DIR, relief_png)),
+                "channels": {"topology": "r", "water": "g"},
+                "width": relief.width,
+                "height": relief.height,
+            }
+            if args.ktx2:
+                relief_ktx2 = f"earth-relief.{label}.ktx2"
+                relief_entry["ktx2"] = relief_ktx2
+                relief_entry["ktx2Bytes"] = write_ktx2(
+                    args.toktx, relief, os.path.join(OUTPUT_DIR, relief_ktx2), srgb=False)
+        else:
+            # Capped by the sources: reuse the largest relief instead of writing it again
+            stale = [f"earth-relief.{label}.png", f"earth-relief.{label}.ktx2"]
+            for name in stale:
+                if os.path.exists(os.path.join(OUTPUT_DIR, name)):
+                    os.remove(os.path.join(OUTPUT_DIR, name))
+        tier["files"]["relief"] = dict(relief_entry)
+
+        manifest["tiers"].append(tier)
+        sizes = ", ".join(
+            f"{kind} {entry.get('ktx2Bytes', entry['fallbackBytes']) / 1024:.0f}KB"
+            for kind, entry in tier["files"].items()
+        )
+        print(f"  {label:<5} {day.width}x{day.height}: {sizes}")
+
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    print(f"=== Wrote {MANIFEST_PATH} ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,90 +1,234 @@
-"""Generate an abstract hero sculpture and export as compressed GLB."""
+"""
+Generate an abstract hero sculpture and export as compressed GLB, then
+publish a content-hashed copy (see model_manifest.py).
+
+With --bake, a second low-poly variant is exported as
+hero-sculpture-baked.glb: the twisted torus without subdivision, shrinkwrapped
+onto the subdivided surface so the silhouette matches, with the high-poly
+detail baked into a tangent-space normal map by Cycles on the CPU. The
+map is embedded as a JPEG (NORMAL_MAP_QUALITY), since a PNG of it would
+outweigh the Draco mesh several times over. Triangle counts and byte sizes
+of both variants go to hero-sculpture.json; the baked variant is published
+when it has fewer triangles than the full mesh, and HeroScene loads it on
+mobile, where vertex cost matters more than the extra texture.
+
+--subdiv-levels, --no-draco, the Draco bit depths and --output-dir are for
+sweeps (rate-distortion.py) rather than the published model.
+Run: blender --background --python scripts/generate-hero-sculpture.py [-- --bake] [--bake-size 512] [--no-publish]
+"""
+import argparse
 import bpy
+import json
 import math
 import os
-
-# Clear scene
-bpy.ops.object.select_all(action='SELECT')
-bpy.ops.object.delete()
-
-# Create a torus knot via curve
-bpy.ops.curve.primitive_nurbs_path_add()
-bpy.ops.object.delete()
-
-# Build torus knot manually with a mesh
-bpy.ops.mesh.primitive_torus_add(
-    align='WORLD',
-    major_radius=1.2,
-    minor_radius=0.35,
-    major_segments=64,
-    minor_segments=16,
-)
-torus = bpy.context.active_object
-torus.name = "HeroSculpture"
-
-# Add twist deformation via Simple Deform
-mod_twist = torus.modifiers.new(name="Twist", type='SIMPLE_DEFORM')
-mod_twist.deform_method = 'TWIST'
-mod_twist.angle = math.radians(360)
-mod_twist.deform_axis = 'Z'
-
-# Add a second twist on X
-mod_twist2 = torus.modifiers.new(name="Twist2", type='SIMPLE_DEFORM')
-mod_twist2.deform_method = 'TWIST'
-mod_twist2.angle = math.radians(180)
-mod_twist2.deform_axis = 'X'
-
-# Subdivision surface for smoothness
-mod_sub = torus.modifiers.new(name="Subdiv", type='SUBSURF')
-mod_sub.levels = 2
-mod_sub.render_levels = 2
-
-# Apply all modifiers
-for mod in torus.modifiers:
-    bpy.ops.object.modifier_apply(modifier=mod.name)
-
-# Smooth shading
-bpy.ops.object.shade_smooth()
-
-# Create metallic material
-mat = bpy.data.materials.new(name="SculptureMetal")
-mat.use_nodes = True
-nodes = mat.node_tree.nodes
-links = mat.node_tree.links
-
-# Clear defaults
-for n in nodes:
-    nodes.remove(n)
-
-# Principled BSDF
-bsdf = nodes.new('ShaderNodeBsdfPrincipled')
-bsdf.inputs['Base Color'].default_value = (0.7, 0.75, 0.8, 1.0)
-bsdf.inputs['Metallic'].default_value = 0.9
-bsdf.inputs['Roughness'].default_value = 0.15
-bsdf.inputs['IOR'].default_value = 2.5
-
-output = nodes.new('ShaderNodeOutputMaterial')
-links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
-
-torus.data.materials.append(mat)
-
-# Center and normalize scale
-bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='MEDIAN')
-torus.location = (0, 0, 0)
-
-# Export as GLB with Draco compression
-output_path = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-    "public", "models", "hero-sculpture.glb"
-)
-
-bpy.ops.export_scene.gltf(
-    filepath=output_path,
-    export_format='GLB',
-    export_draco_mesh_compression_enable=True,
-    export_draco_mesh_compression_level=6,
-    export_materials='EXPORT',
-    export_apply=True,
-)
-
-print(f"Exported to {output_path}")
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "public", "models")
+FULL_NAME = "hero-sculpture.glb"
+BAKED_NAME = "hero-sculpture-baked.glb"
+STATS_NAME = "hero-sculpture.json"
+NORMAL_MAP_QUALITY = 90
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="generate-hero-sculpture.py")
+    parser.add_argument("--bake", action="store_true", help="also export a low-poly variant with a baked normal map")
+    parser.add_argument("--bake-size", type=int, default=512, help="normal map resolution in pixels")
+    parser.add_argument("--bake-samples", type=int, default=8, help="Cycles samples per bake texel")
+    parser.add_argument("--no-publish", dest="publish", action="store_false",
+                        help="don't publish content-hashed copies after exporting")
+    parser.add_argument("--subdiv-levels", type=int, default=2, help="subdivision levels of the full-detail torus")
+    parser.add_argument("--no-draco", dest="draco", action="store_false", help="export without Draco compression")
+    parser.add_argument("--draco-position-bits", type=int, default=14)
+    parser.add_argument("--draco-normal-bits", type=int, default=10)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR, help="write the variants and their stats here instead")
+    return parser.parse_args(argv)
+
+
+def build_torus(name, subdiv_levels):
+    # Build torus knot manually with a mesh
+    bpy.ops.mesh.primitive_torus_add(
+        align='WORLD',
+        major_radius=1.2,
+        minor_radius=0.35,
+        major_segments=64,
+        minor_segments=16,
+        generate_uvs=True,
+    )
+    torus = bpy.context.active_object
+    torus.name = name
+
+    # Add twist deformation via Simple Deform
+    mod_twist = torus.modifiers.new(name="Twist", type='SIMPLE_DEFORM')
+    mod_twist.deform_method = 'TWIST'
+    mod_twist.angle = math.radians(360)
+    mod_twist.deform_axis = 'Z'
+
+    # Add a second twist on X
+    mod_twist2 = torus.modifiers.new(name="Twist2", type='SIMPLE_DEFORM')
+    mod_twist2.deform_method = 'TWIST'
+    mod_twist2.angle = math.radians(180)
+    mod_twist2.deform_axis = 'X'
+
+    # Subdivision surface for smoothness
+    if subdiv_levels:
+        mod_sub = torus.modifiers.new(name="Subdiv", type='SUBSURF')
+        mod_sub.levels = subdiv_levels
+        mod_sub.render_levels = subdiv_levels
+
+    # Apply all modifiers
+    for mod in list(torus.modifiers):
+        bpy.ops.object.modifier_apply(modifier=mod.name)
+
+    # Smooth shading
+    bpy.ops.object.shade_smooth()
+    return torus
+
+
+def sculpture_material(name):
+    # Create metallic material
+    mat = bpy.data.materials.new(name=name)
+    mat.use_nodes = True
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+
+    # Clear defaults
+    for n in nodes:
+        nodes.remove(n)
+
+    # Principled BSDF
+    bsdf = nodes.new('ShaderNodeBsdfPrincipled')
+    bsdf.inputs['Base Color'].default_value = (0.7, 0.75, 0.8, 1.0)
+    bsdf.inputs['Metallic'].default_value = 0.9
+    bsdf.inputs['Roughness'].default_value = 0.15
+    bsdf.inputs['IOR'].default_value = 2.5
+
+    output = nodes.new('ShaderNodeOutputMaterial')
+    links.new(bsdf.outputs['BSDF'], output.inputs['Surface'])
+    return mat
+
+
+def triangle_count(obj):
+    obj.data.calc_loop_triangles()
+    return len(obj.data.loop_triangles)
+
+
+def export(obj, filename, args, tangents=False):
+    """Export one object as a Draco GLB (plain with --no-draco), textures as JPEG; returns its byte size."""
+    bpy.ops.object.select_all(action='DESELECT')
+    obj.select_set(True)
+    filepath = os.path.join(args.output_dir, filename)
+    bpy.ops.export_scene.gltf(
+        filepath=filepath,
+        export_format='GLB',
+        use_selection=True,
+        export_draco_mesh_compression_enable=args.draco,
+        export_draco_mesh_compression_level=6,
+        export_draco_position_quantization=args.draco_position_bits,
+        export_draco_normal_quantization=args.draco_normal_bits,
+        export_materials='EXPORT',
+        export_apply=True,
+        export_tangents=tangents,
+        export_image_format='JPEG',
+        export_image_quality=NORMAL_MAP_QUALITY,
+    )
+    print(f"Exported to {filepath}")
+    return os.path.getsize(filepath)
+
+
+def bake_low_poly(high, size, samples):
+    """Low-poly twisted torus carrying high's surface detail in a normal map."""
+    low = build_torus("HeroSculptureBaked", subdiv_levels=0)
+
+    # Pull the cage onto the subdivided surface so both silhouettes agree
+    wrap = low.modifiers.new(name="Shrinkwrap", type='SHRINKWRAP')
+    wrap.target = high
+    wrap.wrap_method = 'NEAREST_SURFACEPOINT'
+    bpy.ops.object.modifier_apply(modifier=wrap.name)
+
+    image = bpy.data.images.new("HeroSculptureNormal", width=size, height=size, alpha=False)
+    image.colorspace_settings.name = 'Non-Color'
+
+    mat = sculpture_material("SculptureMetalBaked")
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    tex = nodes.new('ShaderNodeTexImage')
+    tex.image = image
+    normal_map = nodes.new('ShaderNodeNormalMap')
+    normal_map.space = 'TANGENT'
+    links.new(tex.outputs['Color'], normal_map.inputs['Color'])
+    links.new(normal_map.outputs['Normal'], nodes['Principled BSDF'].inputs['Normal'])
+    # Cycles bakes into the active image node of the active object
+    nodes.active = tex
+    low.data.materials.append(mat)
+
+    scene = bpy.context.scene
+    scene.render.engine = 'CYCLES'
+    scene.cycles.device = 'CPU'
+    scene.cycles.samples = samples
+    bake = scene.render.bake
+    bake.use_selected_to_active = True
+    bake.cage_extrusion = 0.02
+    bake.max_ray_distance = 0.1
+    bake.margin = 16
+    bake.normal_space = 'TANGENT'
+
+    bpy.ops.object.select_all(action='DESELECT')
+    high.select_set(True)
+    low.select_set(True)
+    bpy.context.view_layer.objects.active = low
+    bpy.ops.object.bake(type='NORMAL')
+
+    # Keep the baked pixels in the .blend data so the exporter embeds them
+    image.pack()
+    return low
+
+
+def main():
+    args = parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # Clear scene
+    bpy.ops.object.select_all(action='SELECT')
+    bpy.ops.object.delete()
+
+    torus = build_torus("HeroSculpture", subdiv_levels=args.subdiv_levels)
+    torus.data.materials.append(sculpture_material("SculptureMetal"))
+    low = bake_low_poly(torus, args.bake_size, args.bake_samples) if args.bake else None
+
+    # Center and normalize scale; the baked variant moves with it
+    bpy.ops.object.select_all(action='DESELECT')
+    torus.select_set(True)
+    bpy.context.view_layer.objects.active = torus
+    bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY', center='MEDIAN')
+    if low is not None:
+        low.location = -torus.location
+    torus.location = (0, 0, 0)
+
+    variants = {"full": {"file": FULL_NAME, "triangles": triangle_count(torus), "bytes": export(torus, FULL_NAME, args)}}
+    if low is not None:
+        variants["baked"] = {
+            "file": BAKED_NAME,
+            "triangles": triangle_count(low),
+            "bytes": export(low, BAKED_NAME, args, tangents=True),
+            "normalMap": args.bake_size,
+        }
+
+    print("=== Hero sculpture variants ===")
+    for label, stats in variants.items():
+        print(f"  {label:<6} {stats['file']:<26} {stats['triangles']:>7} tris  {stats['bytes'] / 1024:7.0f}KB")
+    if low is not None and variants["baked"]["triangles"] >= variants["full"]["triangles"]:
+        print("  The baked variant has no fewer triangles than the full mesh; it won't be published")
+    with open(os.path.join(args.output_dir, STATS_NAME), "w", encoding="utf-8") as f:
+        json.dump({"variants": variants}, f, indent=2)
+        f.write("\n")
+
+    if args.publish:
+        from model_manifest import publish_models
+        publish_models()
+
+
+main()
@@ -1,16 +1,115 @@
 """
 Generate professional 3D skill logo GLB models using Blender Python API.
 Higher quality: subdivision surfaces, PBR materials, emission accents.
-Run: blender --background --python scripts/generate-skill-models.py
+Also renders turntable sprite strips for the cards (see turntable.py) and
+publishes content-hashed copies with a manifest (see model_manifest.py);
+--atlas packs every skill into atlas.glb as well (see skill_atlas.py).
+Uncompressed exports have the meshes sharing a material merged into one
+draw call (material_palette.py), then are quantized and
+reordered by glb_optimize.py; with --bake-lighting, occlusion and static
+lighting are baked into vertex colors by vertex_lighting.py in between.
+Builders can also run without Blender on the NumPy backend (numpy_backend.py),
+except the text badges. In Blender, --construction bmesh builds and
+transforms parts through bmesh and the data API instead of bpy.ops
+(bmesh_backend.py), with the same geometry. --profile writes per-stage timings, bpy.ops counts
+and peak memory for each model (see profiling.py). --max-subsurf, --lod-ratios,
+--no-budgets and --output-dir are for sweeps (rate-distortion.py) rather than published builds.
+Run: blender --background --python scripts/generate-skill-models.py [-- --only react,rust --compression draco]
+     blender --background --python scripts/generate-skill-models.py -- --construction bmesh
+     python scripts/generate-skill-models.py --backend numpy [--only react,rust] [--bake-lighting full]
+     ... --profile report.json
 """
 
-import bpy
+import argparse
+import fcntl
+import json
 import os
 import math
+import shutil
+import subprocess
+import sys
+import time
+
+try:
+    import bpy
+except ImportError:  # plain Python: only the NumPy backend is available
+    bpy = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "public", "models", "skills")
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+# Outside public/ so the lock file is never deployed
+LOCK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "skill-manifest.lock")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Byte budgets per compression profile; export_glb fails the build when a
+# model exceeds its budget. Uncompressed budgets sit just above the sizes
+# the current builders produce. The draco and meshopt budgets are
+# provisional estimates (about a fifth and a quarter of uncompressed) until
+# they are measured from real Draco/gltfpack exports.
+BYTE_BUDGETS = {
+    "none": {
+        "react": 780_000, "typescript": 210_000, "nodejs": 60_000, "database": 185_000,
+        "design": 375_000, "ai": 135_000, "c": 170_000, "rust": 215_000,
+        "python": 275_000, "networking": 470_000,
+    },
+    "draco": {
+        "react": 160_000, "typescript": 50_000, "nodejs": 16_000, "database": 40_000,
+        "design": 80_000, "ai": 35_000, "c": 40_000, "rust": 50_000,
+        "python": 60_000, "networking": 100_000,
+    },
+    "meshopt": {
+        "react": 220_000, "typescript": 65_000, "nodejs": 20_000, "database": 55_000,
+        "design": 110_000, "ai": 45_000, "c": 55_000, "rust": 65_000,
+        "python": 80_000, "networking": 140_000,
+    },
+}
+
+# Triangle ratios for the LOD chain. LOD0 is the full-detail {name}.glb used
+# by the detail pages; the rest are written as {name}.lod1.glb, ...
+LOD_RATIOS = (1.0, 0.4, 0.12)
+
+# Helpers timed as a profiling stage each, by stage name. Modifiers are
+# evaluated by the first depsgraph query after building (modifier_eval);
+# the glTF write reuses that evaluation.
+PROFILED_STAGES = {
+    "clear_scene": "clear_scene",
+    "add_uv_sphere": "primitives",
+    "add_torus": "primitives",
+    "add_cylinder": "primitives",
+    "add_cube": "primitives",
+    "apply_scale": "transform_apply",
+    "add_text": "text_to_mesh",
+    "instance_copies": "instancing",
+    "smooth_shade": "shade_smooth",
+    "triangle_count": "modifier_eval",
+    "draw_call_stats": "modifier_eval",
+    "export_glb": "export",
+    "export_lod": "lod",
+    "write_glb": "gltf_write",
+    "optimize_export": "post_export",
+    "consolidate_materials": "palette",
+    "update_manifest": "manifest",
+}
+
+# Filled in from the command line by main()
+EXPORT = {
+    "backend": "blender",
+    "construction": "ops",
+    "compression": "none",
+    "draco_position_bits": 14,
+    "draco_normal_bits": 10,
+    "lods": True,
+    "gpu_instances": True,
+    "quantize": True,
+    "palette": True,
+    "lighting": "none",
+    "max_subsurf": None,
+    "lod_ratios": LOD_RATIOS[1:],
+    "budgets": True,
+}
+
 
 def clear_scene():
     bpy.ops.object.select_all(action='SELECT')
@@ -19,6 +118,13 @@ def clear_scene():
         bpy.data.meshes.remove(m)
     for m in list(bpy.data.materials):
         bpy.data.materials.remove(m)
+    # Text badges leave their source curves behind after convert(); drop them
+    # so datablock names don't depend on which builders ran earlier.
+    for c in list(bpy.data.curves):
+        bpy.data.curves.remove(c)
+    # Whatever those used (fonts, node trees, images) is orphaned now; a
+    # long-lived session (watch-models.py) would otherwise keep growing.
+    bpy.data.orphans_purge(do_local_ids=True, do_linked_ids=True, do_recursive=True)
 
 
 def pbr_material(name, hex_color, metallic=0.4, roughness=0.3, emission_hex=None, emission_strength=0.0):
@@ -57,6 +163,10 @@ def smooth_shade(obj):
 
 
 def add_subsurf(obj, levels=2):
+    if EXPORT["max_subsurf"] is not None:
+        levels = min(levels, EXPORT["max_subsurf"])
+    if not levels:
+        return
     bpy.context.view_layer.objects.active = obj
     mod = obj.modifiers.new(name="Subsurf", type='SUBSURF')
     mod.levels = levels
@@ -70,20 +180,309 @@ def add_bevel(obj, width=0.02, segments=3):
     mod.segments = segments
 
 
-def export_glb(name):
-    # Apply all modifiers
-    for obj in bpy.context.scene.objects:
-        if obj.type == 'MESH':
-            smooth_shade(obj)
-    filepath = os.path.join(OUTPUT_DIR, f"{name}.glb")
+def add_uv_sphere(radius, location, segments=32, ring_count=16):
+    bpy.ops.mesh.primitive_uv_sphere_add(radius=radius, location=location, segments=segments, ring_count=ring_count)
+    return bpy.context.active_object
+
+
+def add_torus(major_radius, minor_radius, location, major_segments=48, minor_segments=12, rotation=(0, 0, 0)):
+    bpy.ops.mesh.primitive_torus_add(
+        major_radius=major_radius, minor_radius=minor_radius,
+        major_segments=major_segments, minor_segments=minor_segments,
+        location=location, rotation=rotation,
+    )
+    return bpy.context.active_object
+
+
+def add_cylinder(radius, depth, location, vertices=32):
+    bpy.ops.mesh.primitive_cylinder_add(vertices=vertices, radius=radius, depth=depth, location=location)
+    return bpy.context.active_object
+
+
+def add_cube(size, location):
+    bpy.ops.mesh.primitive_cube_add(size=size, location=location)
+    return bpy.context.active_object
+
+
+def apply_scale(obj, scale):
+    obj.scale = scale
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.transform_apply(scale=True)
+
+
+def add_text(body, location, size, extrude, bevel_depth):
+    bpy.ops.object.text_add(location=location)
+    txt = bpy.context.active_object
+    txt.data.body = body
+    txt.data.size = size
+    txt.data.extrude = extrude
+    txt.data.bevel_depth = bevel_depth
+    txt.data.bevel_resolution = 3
+    txt.data.align_x = 'CENTER'
+    txt.data.align_y = 'CENTER'
+    bpy.ops.object.convert(target='MESH')
+    return txt
+
+
+def align_z_euler(direction):
+    """XYZ Euler angles that turn +Z onto direction (as Quaternion.to_euler)."""
+    length = math.sqrt(sum(c * c for c in direction))
+    dx, dy, dz = (c / length for c in direction)
+    # Rotation about axis Z x d by acos(dz), as a matrix
+    s = math.sqrt(dx * dx + dy * dy)
+    if s < 1e-12:
+        return (0.0, 0.0, 0.0) if dz > 0 else (math.pi, 0.0, 0.0)
+    ax, ay = -dy / s, dx / s
+    c, t = dz, 1 - dz
+    r20 = -ay * s
+    r21 = ax * s
+    r22 = c
+    r10 = t * ax * ay
+    r00 = t * ax * ax + c
+    return (math.atan2(r21, r22), math.asin(-r20), math.atan2(r10, r00))
+
+
+def use_numpy_backend():
+    """Point the builder helpers at numpy_backend instead of bpy."""
+    import numpy_backend
+    numpy_backend.OPTIONS["gpu_instances"] = EXPORT["gpu_instances"]
+    numpy_backend.OPTIONS["max_subsurf"] = EXPORT["max_subsurf"]
+    for name in numpy_backend.__all__:
+        globals()[name] = getattr(numpy_backend, name)
+
+
+def use_bmesh_backend():
+    """Point the operator-based helpers at bmesh_backend's data-API versions."""
+    import bmesh_backend
+    for name in bmesh_backend.__all__:
+        globals()[name] = getattr(bmesh_backend, name)
+
+
+def instance_copies(proto, name, transforms):
+    """Replace proto with linked copies, one per (location, rotation, scale).
+
+    The prototype's modifiers are applied first so every copy shares a single
+    mesh. The copies hang off an Empty, which is what the glTF exporter needs
+    to write them as one mesh with EXT_mesh_gpu_instancing transforms.
+    """
+    bpy.context.view_layer.objects.active = proto
+    for mod in list(proto.modifiers):
+        bpy.ops.object.modifier_apply(modifier=mod.name)
+    group = bpy.data.objects.new(name, None)
+    bpy.context.collection.objects.link(group)
+    copies = []
+    for location, rotation, scale in transforms:
+        obj = proto.copy()
+        obj.parent = group
+        obj.location = location
+        obj.rotation_euler = rotation
+        obj.scale = scale
+        bpy.context.collection.objects.link(obj)
+        copies.append(obj)
+    bpy.data.objects.remove(proto)
+    return copies
+
+
+def compression_settings():
+    if EXPORT["compression"] != "draco":
+        return {}
+    return {
+        "export_draco_mesh_compression_enable": True,
+        "export_draco_mesh_compression_level": 6,
+        "export_draco_position_quantization": EXPORT["draco_position_bits"],
+        "export_draco_normal_quantization": EXPORT["draco_normal_bits"],
+        "export_draco_texcoord_quantization": 12,
+    }
+
+
+def meshopt_compress(filepath):
+    # Blender's exporter has no EXT_meshopt_compression support, so the
+    # meshopt profile is a gltfpack pass over the plain export.
+    gltfpack = shutil.which("gltfpack")
+    if gltfpack is None:
+        raise SystemExit("The meshopt profile needs gltfpack on PATH (npm i -g gltfpack)")
+    raw = filepath + ".raw.glb"
+    os.replace(filepath, raw)
+    try:
+        subprocess.run([gltfpack, "-i", raw, "-o", filepath, "-cc", "-kn", "-km"], check=True)
+    finally:
+        os.remove(raw)
+
+
+def update_manifest(name, entry):
+    """Merge one model's entry into manifest.json; safe across parallel workers."""
+    os.makedirs(os.path.dirname(LOCK_PATH), exist_ok=True)
+    with open(LOCK_PATH, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = {}
+        if os.path.exists(MANIFEST_PATH):
+            with open(MANIFEST_PATH, encoding="utf-8") as f:
+                manifest = json.load(f)
+        manifest[name] = entry
+        tmp = MANIFEST_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(manifest.items())), f, indent=2)
+            f.write("\n")
+        os.replace(tmp, MANIFEST_PATH)
+
+
+def scene_meshes():
+    return [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
+
+
+def triangle_count():
+    """Triangles in the evaluated scene, i.e. after every modifier."""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    total = 0
+    for obj in scene_meshes():
+        mesh = obj.evaluated_get(depsgraph).to_mesh()
+        mesh.calc_loop_triangles()
+        total += len(mesh.loop_triangles)
+        obj.evaluated_get(depsgraph).to_mesh_clear()
+    return total
+
+
+def draw_call_stats():
+    """Draw calls and stored triangles with and without GPU instancing."""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    stats = {"before": {"drawCalls": 0, "triangles": 0}, "after": {"drawCalls": 0, "triangles": 0}}
+    shared = set()
+    for obj in scene_meshes():
+        mesh = obj.evaluated_get(depsgraph).to_mesh()
+        mesh.calc_loop_triangles()
+        triangles = len(mesh.loop_triangles)
+        obj.evaluated_get(depsgraph).to_mesh_clear()
+        calls = max(1, len(obj.material_slots))
+        stats["before"]["drawCalls"] += calls
+        stats["before"]["triangles"] += triangles
+        instanced = EXPORT["gpu_instances"] and obj.parent is not None and obj.parent.type == 'EMPTY'
+        key = (obj.parent.name, obj.data.name) if instanced else obj.name
+        if key not in shared:
+            shared.add(key)
+            stats["after"]["drawCalls"] += calls
+            stats["after"]["triangles"] += triangles
+    return stats
+
+
+def write_glb(filepath):
     bpy.ops.export_scene.gltf(
         filepath=filepath,
         export_format='GLB',
         use_selection=False,
         export_apply=True,
+        export_gpu_instances=EXPORT["gpu_instances"],
+        **compression_settings(),
     )
-    size = os.path.getsize(filepath) / 1024
-    print(f"  Exported: {name}.glb ({size:.0f}KB)")
+    if EXPORT["compression"] == "meshopt":
+        meshopt_compress(filepath)
+    return os.path.getsize(filepath)
+
+
+def bake_lighting(filepath, size):
+    """Bake occlusion (and with "full", static lighting) into COLOR_0."""
+    if EXPORT["lighting"] == "none":
+        return size
+    from vertex_lighting import bake_file
+    stats = bake_file(filepath, EXPORT["lighting"])
+    print(f"  Baked {EXPORT['lighting']} lighting: {stats['vertices']} verts, "
+          f"mean occlusion {stats['occlusion']:.3f}")
+    return stats["bytes"][1]
+
+
+def consolidate_materials(filepath, size, report=None):
+    """Merge meshes that share a material into one draw call (and drop duplicate materials)."""
+    if not EXPORT["palette"]:
+        return size
+    from material_palette import consolidate_file
+    stats = consolidate_file(filepath)
+    if report is not None:
+        report.update({k: {"before": v[0], "after": v[1]} for k, v in stats.items()
+                       if k in ("materials", "configurations", "drawCalls")})
+    (m0, m1), (d0, d1) = stats["materials"], stats["drawCalls"]
+    duplicates = f", {m0 - m1} duplicate material(s) dropped" if m1 < m0 else ""
+    print(f"  Merged meshes: {d0} -> {d1} draw calls{duplicates}")
+    return stats["bytes"][1]
+
+
+def optimize_export(filepath, size, report=None):
+    """Quantize and reorder uncompressed exports; Draco and meshopt already quantize."""
+    if EXPORT["compression"] != "none":
+        return size
+    size = consolidate_materials(filepath, size, report)
+    size = bake_lighting(filepath, size)
+    if not EXPORT["quantize"]:
+        return size
+    from glb_optimize import optimize_file
+    stats = optimize_file(filepath)
+    tris_before, tris_after = stats["triangles"]
+    print(f"  Quantized: {size / 1024:.0f}KB -> {stats['bytes'][1] / 1024:.0f}KB, ACMR "
+          f"{stats['misses'][0] / max(1, tris_before):.3f} -> {stats['misses'][1] / max(1, tris_after):.3f}")
+    return stats["bytes"][1]
+
+
+def export_lod(name, level, ratio):
+    # Decimate last, on top of bevel/subsurf, so the ratio is relative to
+    # the full-detail triangle count.
+    decimators = []
+    for obj in scene_meshes():
+        mod = obj.modifiers.new(name="LOD", type='DECIMATE')
+        mod.decimate_type = 'COLLAPSE'
+        mod.ratio = ratio
+        decimators.append((obj, mod))
+    try:
+        filename = f"{name}.lod{level}.glb"
+        triangles = triangle_count()
+        path = os.path.join(OUTPUT_DIR, filename)
+        size = optimize_export(path, write_glb(path))
+    finally:
+        for obj, mod in decimators:
+            obj.modifiers.remove(mod)
+    print(f"  Exported: {filename} ({size / 1024:.0f}KB, {triangles} tris)")
+    return {"file": filename, "ratio": ratio, "triangles": triangles, "bytes": size}
+
+
+def export_glb(name):
+    # Apply all modifiers
+    for obj in scene_meshes():
+        smooth_shade(obj)
+    profile = EXPORT["compression"]
+    triangles = triangle_count()
+    draw_calls = draw_call_stats()
+    path = os.path.join(OUTPUT_DIR, f"{name}.glb")
+    materials = {}
+    size = optimize_export(path, write_glb(path), materials)
+    before, after = draw_calls["before"], draw_calls["after"]
+    if before != after:
+        print(f"  Instancing: {before['drawCalls']} -> {after['drawCalls']} draw calls, "
+              f"{before['triangles']} -> {after['triangles']} stored tris")
+
+    budget = BYTE_BUDGETS[profile].get(name)
+    print(f"  Exported: {name}.glb ({size / 1024:.0f}KB, {triangles} tris, {profile})")
+    if EXPORT["budgets"] and budget is not None and size > budget:
+        raise SystemExit(f"{name}.glb is {size} bytes, over its {profile} budget of {budget}")
+
+    lods = [{"file": f"{name}.glb", "ratio": 1.0, "triangles": triangles, "bytes": size}]
+    if EXPORT["lods"]:
+        for level, ratio in enumerate(EXPORT["lod_ratios"], start=1):
+            lods.append(export_lod(name, level, ratio))
+
+    compression = {"profile": profile, "quantized": profile == "none" and EXPORT["quantize"]}
+    if profile == "draco":
+        compression["positionBits"] = EXPORT["draco_position_bits"]
+        compression["normalBits"] = EXPORT["draco_normal_bits"]
+    update_manifest(name, {
+        "file": f"{name}.glb",
+        "bytes": size,
+        "triangles": triangles,
+        "instancing": draw_calls,
+        # Empty unless the palette pass ran (uncompressed profile)
+        "materials": materials,
+        "compression": compression,
+        "lighting": EXPORT["lighting"],
+        # Decoder path to hand to useGLTF; meshopt is decoded by drei by default
+        "dracoDecoderPath": "/draco/" if profile == "draco" else None,
+        "lods": lods,
+    })
 
 
 # ═══════════════════════════════════════════════════════════
@@ -95,20 +494,18 @@ def make_react():
     mat_ring = pbr_material("ReactRing", 0x61DAFB, metallic=0.5, roughness=0.2, emission_hex=0x61DAFB, emission_strength=0.3)
 
     # Nucleus
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=0.18, location=(0, 0, 0), segments=32, ring_count=24)
-    nucleus = bpy.context.active_object
+    nucleus = add_uv_sphere(radius=0.18, location=(0, 0, 0), segments=32, ring_count=24)
     add_subsurf(nucleus, 2)
     apply_mat(nucleus, mat_core)
 
     # Three orbital rings at different tilts
     for i, angle in enumerate([0, 60, 120]):
-        bpy.ops.mesh.primitive_torus_add(
+        ring = add_torus(
             major_radius=0.6, minor_radius=0.025,
             major_segments=80, minor_segments=16,
             location=(0, 0, 0),
             rotation=(math.radians(angle), math.radians(70), 0)
         )
-        ring = bpy.context.active_object
         apply_mat(ring, mat_ring)
 
         # Small electron on each ring
@@ -117,8 +514,7 @@ def make_react():
         ex = r * math.cos(t) * math.cos(math.radians(angle))
         ey = r * math.cos(t) * math.sin(math.radians(angle))
         ez = r * math.sin(t)
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=0.05, location=(ex, ey, ez), segments=16, ring_count=12)
-        electron = bpy.context.active_object
+        electron = add_uv_sphere(radius=0.05, location=(ex, ey, ez), segments=16, ring_count=12)
         apply_mat(electron, mat_core)
 
     export_glb("react")
@@ -133,25 +529,14 @@ def make_typescript():
     mat_text = pbr_material("TSText", 0xFFFFFF, metallic=0.15, roughness=0.4)
 
     # Rounded square base
-    bpy.ops.mesh.primitive_cube_add(size=1, location=(0, 0, 0))
-    base = bpy.context.active_object
-    base.scale = (0.5, 0.5, 0.1)
-    bpy.ops.object.transform_apply(scale=True)
+    base = add_cube(size=1, location=(0, 0, 0))
+    apply_scale(base, (0.5, 0.5, 0.1))
     add_bevel(base, width=0.08, segments=4)
     add_subsurf(base, 2)
     apply_mat(base, mat_bg)
 
     # "TS" text
-    bpy.ops.object.text_add(location=(0, -0.04, 0.11))
-    txt = bpy.context.active_object
-    txt.data.body = "TS"
-    txt.data.size = 0.35
-    txt.data.extrude = 0.04
-    txt.data.bevel_depth = 0.012
-    txt.data.bevel_resolution = 3
-    txt.data.align_x = 'CENTER'
-    txt.data.align_y = 'CENTER'
-    bpy.ops.object.convert(target='MESH')
+    txt = add_text("TS", location=(0, -0.04, 0.11), size=0.35, extrude=0.04, bevel_depth=0.012)
     apply_mat(txt, mat_text)
 
     export_glb("typescript")
@@ -167,29 +552,18 @@ def make_nodejs():
     mat_edge = pbr_material("NodeEdge", 0x66CC33, metallic=0.5, roughness=0.2, emission_hex=0x66CC33, emission_strength=0.15)
 
     # Hexagonal prism
-    bpy.ops.mesh.primitive_cylinder_add(vertices=6, radius=0.55, depth=0.2, location=(0, 0, 0))
-    hex_base = bpy.context.active_object
+    hex_base = add_cylinder(vertices=6, radius=0.55, depth=0.2, location=(0, 0, 0))
     add_bevel(hex_base, width=0.04, segments=3)
     add_subsurf(hex_base, 1)
     apply_mat(hex_base, mat_bg)
 
     # Thin glowing edge ring
-    bpy.ops.mesh.primitive_cylinder_add(vertices=6, radius=0.57, depth=0.04, location=(0, 0, 0.1))
-    edge = bpy.context.active_object
+    edge = add_cylinder(vertices=6, radius=0.57, depth=0.04, location=(0, 0, 0.1))
     add_bevel(edge, width=0.01, segments=2)
     apply_mat(edge, mat_edge)
 
     # "N" letter
-    bpy.ops.object.text_add(location=(0, -0.04, 0.11))
-    txt = bpy.context.active_object
-    txt.data.body = "N"
-    txt.data.size = 0.4
-    txt.data.extrude = 0.04
-    txt.data.bevel_depth = 0.01
-    txt.data.bevel_resolution = 3
-    txt.data.align_x = 'CENTER'
-    txt.data.align_y = 'CENTER'
-    bpy.ops.object.convert(target='MESH')
+    txt = add_text("N", location=(0, -0.04, 0.11), size=0.4, extrude=0.04, bevel_depth=0.01)
     apply_mat(txt, mat_text)
 
     export_glb("nodejs")
@@ -205,16 +579,14 @@ def make_database():
 
     for i, y in enumerate([-0.22, 0, 0.22]):
         mat = pbr_material(f"DB{i}", colors[i], metallic=0.5, roughness=0.2)
-        bpy.ops.mesh.primitive_cylinder_add(radius=0.4, depth=0.16, location=(0, 0, y))
-        disk = bpy.context.active_object
+        disk = add_cylinder(radius=0.4, depth=0.16, location=(0, 0, y))
         add_bevel(disk, width=0.025, segments=3)
         add_subsurf(disk, 1)
         apply_mat(disk, mat)
 
     # Glowing separator rings
     for y in [-0.11, 0.11]:
-        bpy.ops.mesh.primitive_torus_add(major_radius=0.4, minor_radius=0.01, location=(0, 0, y), major_segments=48, minor_segments=8)
-        ring = bpy.context.active_object
+        ring = add_torus(major_radius=0.4, minor_radius=0.01, location=(0, 0, y), major_segments=48, minor_segments=8)
         apply_mat(ring, mat_glow)
 
     export_glb("database")
@@ -228,16 +600,13 @@ def make_design():
     mat_palette = pbr_material("Palette", 0xF0EDE8, metallic=0.05, roughness=0.6)
 
     # Palette shape (squished sphere)
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=0.5, location=(0, 0, 0), segments=48, ring_count=32)
-    palette = bpy.context.active_object
-    palette.scale = (1, 0.85, 0.15)
-    bpy.ops.object.transform_apply(scale=True)
+    palette = add_uv_sphere(radius=0.5, location=(0, 0, 0), segments=48, ring_count=32)
+    apply_scale(palette, (1, 0.85, 0.15))
     add_subsurf(palette, 1)
     apply_mat(palette, mat_palette)
 
     # Thumb hole
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.09, depth=0.2, location=(-0.25, -0.15, 0))
-    hole = bpy.context.active_object
+    hole = add_cylinder(radius=0.09, depth=0.2, location=(-0.25, -0.15, 0))
     apply_mat(hole, pbr_material("Hole", 0x333333, metallic=0.1, roughness=0.8))
 
     # Color blobs
@@ -251,10 +620,8 @@ def make_design():
     ]
     for color, pos in blob_data:
         mat = pbr_material(f"Blob{color:x}", color, metallic=0.15, roughness=0.35)
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=0.055, location=pos, segments=20, ring_count=12)
-        blob = bpy.context.active_object
-        blob.scale = (1, 1, 0.6)
-        bpy.ops.object.transform_apply(scale=True)
+        blob = add_uv_sphere(radius=0.055, location=pos, segments=20, ring_count=12)
+        apply_scale(blob, (1, 1, 0.6))
         apply_mat(blob, mat)
 
     export_glb("design")
@@ -270,52 +637,49 @@ def make_ai():
     mat_glow = pbr_material("AIGlow", 0x00D2FF, metallic=0.3, roughness=0.2, emission_hex=0x00D2FF, emission_strength=1.5)
 
     # Main chip body
-    bpy.ops.mesh.primitive_cube_add(size=0.65, location=(0, 0, 0))
-    chip = bpy.context.active_object
-    chip.scale = (1, 1, 0.3)
-    bpy.ops.object.transform_apply(scale=True)
+    chip = add_cube(size=0.65, location=(0, 0, 0))
+    apply_scale(chip, (1, 1, 0.3))
     add_bevel(chip, width=0.035, segments=4)
     add_subsurf(chip, 1)
     apply_mat(chip, mat_chip)
 
-    # Pins on each side
+    # Pins on each side: one beveled pin, instanced. The pins along y are
+    # the x pins turned a quarter turn.
+    pin = add_cube(size=0.05, location=(0, 0, 0))
+    apply_scale(pin, (2, 0.6, 0.6))
+    add_bevel(pin, width=0.005, segments=2)
+    apply_mat(pin, mat_pin)
+    pin_transforms = []
     for side in range(4):
         for j in range(4):
             offset = (j - 1.5) * 0.13
             if side == 0:
-                pos, scl = (0.4, offset, 0), (2, 0.6, 0.6)
+                pos, rot = (0.4, offset, 0), 0
             elif side == 1:
-                pos, scl = (-0.4, offset, 0), (2, 0.6, 0.6)
+                pos, rot = (-0.4, offset, 0), 0
             elif side == 2:
-                pos, scl = (offset, 0.4, 0), (0.6, 2, 0.6)
+                pos, rot = (offset, 0.4, 0), math.pi / 2
             else:
-                pos, scl = (offset, -0.4, 0), (0.6, 2, 0.6)
-            bpy.ops.mesh.primitive_cube_add(size=0.05, location=pos)
-            pin = bpy.context.active_object
-            pin.scale = scl
-            bpy.ops.object.transform_apply(scale=True)
-            add_bevel(pin, width=0.005, segments=2)
-            apply_mat(pin, mat_pin)
+                pos, rot = (offset, -0.4, 0), math.pi / 2
+            pin_transforms.append((pos, (0, 0, rot), (1, 1, 1)))
+    instance_copies(pin, "Pins", pin_transforms)
 
     # Glowing core circle
-    bpy.ops.mesh.primitive_torus_add(major_radius=0.1, minor_radius=0.02, location=(0, 0, 0.11), major_segments=32, minor_segments=12)
-    core_ring = bpy.context.active_object
+    core_ring = add_torus(major_radius=0.1, minor_radius=0.02, location=(0, 0, 0.11), major_segments=32, minor_segments=12)
     apply_mat(core_ring, mat_glow)
 
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=0.05, location=(0, 0, 0.11), segments=20, ring_count=12)
-    core = bpy.context.active_object
+    core = add_uv_sphere(radius=0.05, location=(0, 0, 0.11), segments=20, ring_count=12)
     apply_mat(core, mat_glow)
 
     # Circuit trace lines on top
+    trace = add_cube(size=0.01, location=(0, 0, 0))
+    apply_scale(trace, (15, 1, 0.5))
+    apply_mat(trace, mat_glow)
+    trace_transforms = []
     for dx, dy in [(0.15, 0), (-0.15, 0), (0, 0.15), (0, -0.15)]:
-        bpy.ops.mesh.primitive_cube_add(size=0.01, location=(dx/2, dy/2, 0.1))
-        trace = bpy.context.active_object
-        if dx != 0:
-            trace.scale = (15, 1, 0.5)
-        else:
-            trace.scale = (1, 15, 0.5)
-        bpy.ops.object.transform_apply(scale=True)
-        apply_mat(trace, mat_glow)
+        rot = 0 if dx != 0 else math.pi / 2
+        trace_transforms.append(((dx/2, dy/2, 0.1), (0, 0, rot), (1, 1, 1)))
+    instance_copies(trace, "Traces", trace_transforms)
 
     export_glb("ai")
 
@@ -330,28 +694,17 @@ def make_c():
     mat_rim = pbr_material("CRim", 0x7986CB, metallic=0.6, roughness=0.15, emission_hex=0x7986CB, emission_strength=0.15)
 
     # Circle base
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.5, depth=0.15, location=(0, 0, 0), vertices=48)
-    base = bpy.context.active_object
+    base = add_cylinder(radius=0.5, depth=0.15, location=(0, 0, 0), vertices=48)
     add_bevel(base, width=0.025, segments=3)
     add_subsurf(base, 1)
     apply_mat(base, mat_bg)
 
     # Rim ring
-    bpy.ops.mesh.primitive_torus_add(major_radius=0.5, minor_radius=0.018, location=(0, 0, 0.08), major_segments=48, minor_segments=12)
-    rim = bpy.context.active_object
+    rim = add_torus(major_radius=0.5, minor_radius=0.018, location=(0, 0, 0.08), major_segments=48, minor_segments=12)
     apply_mat(rim, mat_rim)
 
     # "C" text
-    bpy.ops.object.text_add(location=(0, -0.05, 0.08))
-    txt = bpy.context.active_object
-    txt.data.body = "C"
-    txt.data.size = 0.45
-    txt.data.extrude = 0.05
-    txt.data.bevel_depth = 0.015
-    txt.data.bevel_resolution = 3
-    txt.data.align_x = 'CENTER'
-    txt.data.align_y = 'CENTER'
-    bpy.ops.object.convert(target='MESH')
+    txt = add_text("C", location=(0, -0.05, 0.08), size=0.45, extrude=0.05, bevel_depth=0.015)
     apply_mat(txt, mat_text)
 
     export_glb("c")
@@ -367,40 +720,30 @@ def make_rust():
     mat_text = pbr_material("RustText", 0x1A1A1A, metallic=0.3, roughness=0.4)
 
     # Main gear body
-    bpy.ops.mesh.primitive_cylinder_add(vertices=48, radius=0.45, depth=0.12, location=(0, 0, 0))
-    gear = bpy.context.active_object
+    gear = add_cylinder(vertices=48, radius=0.45, depth=0.12, location=(0, 0, 0))
     add_bevel(gear, width=0.015, segments=3)
     add_subsurf(gear, 1)
     apply_mat(gear, mat_gear)
 
-    # Gear teeth
+    # Gear teeth: one beveled tooth, instanced around the rim
+    tooth = add_cube(size=0.08, location=(0, 0, 0))
+    apply_scale(tooth, (1.4, 0.5, 1.2))
+    add_bevel(tooth, width=0.008, segments=2)
+    apply_mat(tooth, mat_gear)
+    tooth_transforms = []
     for i in range(16):
         angle = math.radians(i * 22.5)
         x = 0.45 * math.cos(angle)
         y = 0.45 * math.sin(angle)
-        bpy.ops.mesh.primitive_cube_add(size=0.08, location=(x, y, 0), rotation=(0, 0, angle))
-        tooth = bpy.context.active_object
-        tooth.scale = (1.4, 0.5, 1.2)
-        bpy.ops.object.transform_apply(scale=True)
-        add_bevel(tooth, width=0.008, segments=2)
-        apply_mat(tooth, mat_gear)
+        tooth_transforms.append(((x, y, 0), (0, 0, angle), (1, 1, 1)))
+    instance_copies(tooth, "Teeth", tooth_transforms)
 
     # Center hole ring
-    bpy.ops.mesh.primitive_torus_add(major_radius=0.12, minor_radius=0.035, location=(0, 0, 0), major_segments=32, minor_segments=16)
-    hole = bpy.context.active_object
+    hole = add_torus(major_radius=0.12, minor_radius=0.035, location=(0, 0, 0), major_segments=32, minor_segments=16)
     apply_mat(hole, mat_inner)
 
     # "R" letter
-    bpy.ops.object.text_add(location=(0, -0.03, 0.07))
-    txt = bpy.context.active_object
-    txt.data.body = "R"
-    txt.data.size = 0.2
-    txt.data.extrude = 0.03
-    txt.data.bevel_depth = 0.008
-    txt.data.bevel_resolution = 3
-    txt.data.align_x = 'CENTER'
-    txt.data.align_y = 'CENTER'
-    bpy.ops.object.convert(target='MESH')
+    txt = add_text("R", location=(0, -0.03, 0.07), size=0.2, extrude=0.03, bevel_depth=0.008)
     apply_mat(txt, mat_text)
 
     export_glb("rust")
@@ -416,29 +759,25 @@ def make_python():
     mat_eye = pbr_material("PyEye", 0xFFFFFF, metallic=0.1, roughness=0.5)
 
     # Blue top half
-    bpy.ops.mesh.primitive_cube_add(size=0.38, location=(0.1, 0.1, 0.1))
-    top = bpy.context.active_object
+    top = add_cube(size=0.38, location=(0.1, 0.1, 0.1))
     add_bevel(top, width=0.06, segments=4)
     add_subsurf(top, 2)
     apply_mat(top, mat_blue)
 
     # Yellow bottom half
-    bpy.ops.mesh.primitive_cube_add(size=0.38, location=(-0.1, -0.1, -0.1))
-    bottom = bpy.context.active_object
+    bottom = add_cube(size=0.38, location=(-0.1, -0.1, -0.1))
     add_bevel(bottom, width=0.06, segments=4)
     add_subsurf(bottom, 2)
     apply_mat(bottom, mat_yellow)
 
     # Connecting bridge
-    bpy.ops.mesh.primitive_cylinder_add(radius=0.055, depth=0.45, location=(0, 0, 0))
-    bridge = bpy.context.active_object
+    bridge = add_cylinder(radius=0.055, depth=0.45, location=(0, 0, 0))
     add_subsurf(bridge, 1)
     apply_mat(bridge, mat_blue)
 
     # Eyes
     for pos in [(0.02, 0.18, 0.22), (-0.02, -0.18, -0.22)]:
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=0.035, location=pos, segments=16, ring_count=12)
-        eye = bpy.context.active_object
+        eye = add_uv_sphere(radius=0.035, location=pos, segments=16, ring_count=12)
         apply_mat(eye, mat_eye)
 
     export_glb("python")
@@ -449,15 +788,13 @@ def make_python():
 # ═══════════════════════════════════════════════════════════
 def make_networking():
     clear_scene()
-    import mathutils
 
     mat_center = pbr_material("NetCenter", 0x0077B6, metallic=0.6, roughness=0.2, emission_hex=0x00B4D8, emission_strength=0.4)
     mat_node = pbr_material("NetNode", 0x48CAE4, metallic=0.5, roughness=0.25, emission_hex=0x48CAE4, emission_strength=0.2)
     mat_link = pbr_material("NetLink", 0x90E0EF, metallic=0.4, roughness=0.3, emission_hex=0x90E0EF, emission_strength=0.3)
 
     # Central hub
-    bpy.ops.mesh.primitive_uv_sphere_add(radius=0.13, location=(0, 0, 0), segments=24, ring_count=16)
-    center = bpy.context.active_object
+    center = add_uv_sphere(radius=0.13, location=(0, 0, 0), segments=24, ring_count=16)
     add_subsurf(center, 1)
     apply_mat(center, mat_center)
 
@@ -469,41 +806,186 @@ def make_networking():
         (0.28, -0.28, 0.1), (-0.28, 0.28, -0.1),
     ]
 
+    node = add_uv_sphere(radius=0.065, location=(0, 0, 0), segments=20, ring_count=12)
+    add_subsurf(node, 1)
+    apply_mat(node, mat_node)
+
+    # Link rods share a unit-length cylinder stretched along z to each node
+    rod = add_cylinder(radius=0.012, depth=1, location=(0, 0, 0))
+    apply_mat(rod, mat_link)
+
+    node_transforms = []
+    rod_transforms = []
     for pos in node_positions:
-        bpy.ops.mesh.primitive_uv_sphere_add(radius=0.065, location=pos, segments=20, ring_count=12)
-        node = bpy.context.active_object
-        add_subsurf(node, 1)
-        apply_mat(node, mat_node)
+        node_transforms.append((pos, (0, 0, 0), (1, 1, 1)))
 
         # Link rod to center
         dx, dy, dz = pos
         length = math.sqrt(dx*dx + dy*dy + dz*dz)
         mid = (dx/2, dy/2, dz/2)
+        rod_transforms.append((mid, align_z_euler((dx, dy, dz)), (1, 1, length)))
 
-        bpy.ops.mesh.primitive_cylinder_add(radius=0.012, depth=length, location=mid)
-        rod = bpy.context.active_object
-
-        up = mathutils.Vector((0, 0, 1))
-        target = mathutils.Vector((dx, dy, dz)).normalized()
-        rot = up.rotation_difference(target)
-        rod.rotation_euler = rot.to_euler()
-        bpy.context.view_layer.objects.active = rod
-        bpy.ops.object.transform_apply(rotation=True)
-        apply_mat(rod, mat_link)
+    instance_copies(node, "Nodes", node_transforms)
+    instance_copies(rod, "Links", rod_transforms)
 
     export_glb("networking")
 
 
 # ═══════════════════════════════════════════════════════════
-print("=== Generating professional 3D skill models ===")
-make_react()
-make_typescript()
-make_nodejs()
-make_database()
-make_design()
-make_ai()
-make_c()
-make_rust()
-make_python()
-make_networking()
-print("=== All models generated ===")
+BUILDERS = {
+    "react": make_react,
+    "typescript": make_typescript,
+    "nodejs": make_nodejs,
+    "database": make_database,
+    "design": make_design,
+    "ai": make_ai,
+    "c": make_c,
+    "rust": make_rust,
+    "python": make_python,
+    "networking": make_networking,
+}
+
+
+def script_argv():
+    # Blender passes everything after "--" through to the script untouched
+    if bpy is None:
+        return sys.argv[1:]
+    return sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = script_argv()
+    parser = argparse.ArgumentParser(prog="generate-skill-models.py")
+    parser.add_argument("--only", default="", help="comma-separated model names, e.g. react,rust")
+    parser.add_argument("--backend", choices=["blender", "numpy"], default="blender" if bpy else "numpy")
+    parser.add_argument("--construction", choices=["ops", "bmesh"], default="ops",
+                        help="build parts with bpy.ops or with bmesh and the data API (Blender backend only)")
+    parser.add_argument("--compression", choices=sorted(BYTE_BUDGETS), default="none")
+    parser.add_argument("--draco-position-bits", type=int, default=14)
+    parser.add_argument("--draco-normal-bits", type=int, default=10)
+    parser.add_argument("--no-lods", dest="lods", action="store_false", help="skip the decimated LOD chain")
+    parser.add_argument("--no-publish", dest="publish", action="store_false",
+                        help="don't render turntables or publish content-hashed copies")
+    parser.add_argument("--atlas", action="store_true",
+                        help="also repack the skills into atlas.glb (skill_atlas.py); no page loads it yet")
+    parser.add_argument("--no-instancing", dest="gpu_instances", action="store_false",
+                        help="write repeated parts as separate nodes instead of EXT_mesh_gpu_instancing")
+    parser.add_argument("--no-quantize", dest="quantize", action="store_false",
+                        help="keep float attributes and exporter index order in uncompressed exports")
+    parser.add_argument("--no-palette", dest="palette", action="store_false",
+                        help="keep every exported mesh instead of merging the meshes that share a material")
+    parser.add_argument("--bake-lighting", choices=["none", "ao", "full"], default="none",
+                        help="bake occlusion (ao) or occlusion plus static lighting for an unlit material (full) "
+                             "into vertex colors; uncompressed profile only")
+    parser.add_argument("--profile", metavar="REPORT.json",
+                        help="write stage timings, operator counts and peak memory per model (and a .folded file)")
+    parser.add_argument("--max-subsurf", type=int, help="cap every subdivision surface at this many levels")
+    parser.add_argument("--lod-ratios", type=lod_ratios, default=LOD_RATIOS[1:],
+                        help="comma-separated triangle ratios for lod1, lod2, ... (default: %(default)s)")
+    parser.add_argument("--no-budgets", dest="budgets", action="store_false",
+                        help="don't fail exports that are over their byte budget")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR,
+                        help="write the models and their manifest here instead (use with --no-publish)")
+    return parser.parse_args(argv)
+
+
+def lod_ratios(value):
+    ratios = tuple(float(r) for r in value.split(",") if r.strip())
+    if not all(0 < r < 1 for r in ratios):
+        raise argparse.ArgumentTypeError("LOD ratios must lie between 0 and 1")
+    return ratios
+
+
+def select_builders(only):
+    if not only:
+        return list(BUILDERS)
+    names = [n.strip() for n in only.split(",") if n.strip()]
+    unknown = [n for n in names if n not in BUILDERS]
+    if unknown:
+        raise SystemExit(f"Unknown model(s): {', '.join(unknown)} (choose from {', '.join(BUILDERS)})")
+    return names
+
+
+def configure(args):
+    """Fill EXPORT from the parsed flags and swap in the selected backend's helpers."""
+    global OUTPUT_DIR, MANIFEST_PATH
+    OUTPUT_DIR = os.path.abspath(args.output_dir)
+    MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    EXPORT.update(
+        backend=args.backend,
+        construction=args.construction,
+        compression=args.compression,
+        draco_position_bits=args.draco_position_bits,
+        draco_normal_bits=args.draco_normal_bits,
+        lods=args.lods,
+        gpu_instances=args.gpu_instances,
+        quantize=args.quantize,
+        palette=args.palette,
+        lighting=args.bake_lighting,
+        max_subsurf=args.max_subsurf,
+        lod_ratios=args.lod_ratios,
+        budgets=args.budgets,
+    )
+    if args.backend == "numpy":
+        if EXPORT["compression"] != "none" or EXPORT["lods"]:
+            print("  NumPy backend: writing uncompressed models without LODs")
+        EXPORT.update(compression="none", lods=False)
+        use_numpy_backend()
+    elif bpy is None:
+        raise SystemExit("The Blender backend must run inside Blender (blender --background --python ...)")
+    elif args.construction == "bmesh":
+        use_bmesh_backend()
+    if EXPORT["lighting"] != "none" and EXPORT["compression"] != "none":
+        raise SystemExit("--bake-lighting works on the uncompressed profile only (--compression none)")
+
+
+def publish(atlas=False):
+    """Render turntables and publish content-hashed copies, repacking the atlas first if asked."""
+    from model_manifest import publish_models
+    if atlas:
+        from skill_atlas import pack_atlas
+        pack_atlas(OUTPUT_DIR)
+    try:
+        from turntable import render_turntables
+    except ImportError:  # Blender's bundled Python has no Pillow
+        print("  Skipping turntables without Pillow; run scripts/turntable.py")
+    else:
+        render_turntables()
+    publish_models()
+
+
+def main():
+    args = parse_args()
+    names = select_builders(args.only)
+    configure(args)
+    profiler = None
+    if args.profile:
+        from profiling import Profiler
+        profiler = Profiler("generate-skill-models.py")
+        profiler.instrument(globals(), PROFILED_STAGES)
+        if bpy is not None:
+            profiler.count_operators(bpy)
+    print("=== Generating professional 3D skill models ===")
+    batch_start = time.perf_counter()
+    for name in names:
+        start = time.perf_counter()
+        if profiler is None:
+            BUILDERS[name]()
+        else:
+            with profiler.model(name):
+                BUILDERS[name]()
+        print(f"  Built {name} in {time.perf_counter() - start:.2f}s")
+    if profiler is not None:
+        profiler.write(args.profile, backend=args.backend, construction=EXPORT["construction"],
+                       blender=bpy.app.version_string if bpy is not None else None)
+        print(f"  Profile written to {args.profile}")
+    if args.publish:
+        publish(args.atlas)
+    print(f"=== {len(names)} model(s) generated in {time.perf_counter() - batch_start:.2f}s ===")
+
+
+# Blender runs --python scripts as __main__ too; watch-models.py imports this
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,427 @@
+"""
+Quantize and reorder the geometry of exported GLBs in place.
+
+For every triangle primitive the pass:
+  - merges vertices whose attributes are bit-identical and drops the
+    degenerate triangles that leaves behind,
+  - reorders triangles for the post-transform vertex cache (Tipsify, Sander
+    et al. 2007), then sorts the resulting clusters outside-in to cut
+    overdraw,
+  - renumbers vertices in first-use order for fetch locality, and
+  - stores attributes with KHR_mesh_quantization: int16 positions (the
+    dequantization is folded into the node or instance transforms), int8
+    normals/tangents and uint16 texture coordinates and colors.
+
+Draco and meshopt files are skipped, since both already quantize, as are
+files that already use KHR_mesh_quantization. Skinned and morphed meshes
+keep float positions because their node transforms don't apply to them.
+generate-skill-models.py runs this on every uncompressed export.
+Run: python scripts/glb_optimize.py [paths...] [--dry-run]
+"""
+
+import argparse
+import os
+from collections import deque
+
+import numpy as np
+
+from gltf_io import BinWriter, COMPONENT_DTYPES, compact, encode_glb, read_accessor, read_glb
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(ROOT, "public", "models")
+
+EXTENSION = "KHR_mesh_quantization"
+SKIPPED_EXTENSIONS = ("KHR_draco_mesh_compression", "EXT_meshopt_compression", EXTENSION)
+
+BYTE, UNSIGNED_BYTE, SHORT, UNSIGNED_SHORT, UNSIGNED_INT, FLOAT = 5120, 5121, 5122, 5123, 5125, 5126
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+MODE_TRIANGLES = 4
+POSITION_RANGE = 32767
+
+# FIFO size used to report ACMR, and the cache size Tipsify optimizes for
+CACHE_SIZE = 16
+# A cluster may close once its own ACMR is within this factor of the
+# Tipsify result; smaller clusters sort better for overdraw.
+OVERDRAW_THRESHOLD = 1.05
+
+
+def acmr_misses(indices, cache_size=CACHE_SIZE):
+    """Vertex shader invocations for an index buffer with a FIFO cache."""
+    cache = deque()
+    cached = set()
+    misses = 0
+    for v in indices.tolist():
+        if v not in cached:
+            misses += 1
+            cache.append(v)
+            cached.add(v)
+            if len(cache) > cache_size:
+                cached.discard(cache.popleft())
+    return misses
+
+
+def weld(attributes, triangles):
+    """Merge bit-identical vertices and drop triangles that collapse."""
+    rows = np.concatenate([a.reshape(len(a), -1).view(np.uint8) for a in attributes.values()], axis=1)
+    keys = np.ascontiguousarray(rows).view(np.dtype((np.void, rows.shape[1]))).ravel()
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    triangles = inverse.ravel()[triangles]
+    keep = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+    return {k: a[first] for k, a in attributes.items()}, triangles[keep]
+
+
+def tipsify(triangles, vertex_count, cache_size=CACHE_SIZE):
+    """Triangle order for the vertex cache, plus the hard cluster boundaries."""
+    tris = triangles.tolist()
+    adjacency = [[] for _ in range(vertex_count)]
+    for t, tri in enumerate(tris):
+        for v in tri:
+            adjacency[v].append(t)
+    live = [len(a) for a in adjacency]
+    stamp = [0] * vertex_count
+    emitted = [False] * len(tris)
+    dead_end = []
+    order = []
+    boundaries = [0]
+    time = cache_size + 1
+    cursor = 0
+    fan = 0
+    while fan >= 0:
+        candidates = []
+        for t in adjacency[fan]:
+            if emitted[t]:
+                continue
+            emitted[t] = True
+            order.append(t)
+            for v in tris[t]:
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if time - stamp[v] > cache_size:
+                    stamp[v] = time
+                    time += 1
+
+        # Next fan: a vertex still in cache with triangles left, oldest first
+        fan, best = -1, -1
+        for v in candidates:
+            if live[v] > 0:
+                priority = time - stamp[v] if time - stamp[v] + 2 * live[v] <= cache_size else 0
+                if priority > best:
+                    fan, best = v, priority
+        while fan < 0 and dead_end:
+            v = dead_end.pop()
+            if live[v] > 0:
+                fan = v
+        if fan < 0:
+            while cursor < vertex_count and live[cursor] == 0:
+                cursor += 1
+            if cursor < vertex_count:
+                fan = cursor
+                if len(order) > boundaries[-1]:
+                    boundaries.append(len(order))
+    return triangles[order], boundaries
+
+
+def soft_boundaries(triangles, boundaries, threshold):
+    """Split hard clusters wherever the running ACMR drops under threshold."""
+    clusters = []
+    ends = boundaries[1:] + [len(triangles)]
+    for start, end in zip(boundaries, ends):
+        cache = deque()
+        cached = set()
+        misses = 0
+        cluster_start = start
+        for t in range(start, end):
+            for v in triangles[t].tolist():
+                if v not in cached:
+                    misses += 1
+                    cache.append(v)
+                    cached.add(v)
+                    if len(cache) > CACHE_SIZE:
+                        cached.discard(cache.popleft())
+            if misses / (t + 1 - cluster_start) <= threshold and t + 1 < end:
+                clusters.append((cluster_start, t + 1))
+                cluster_start = t + 1
+                cache.clear()
+                cached.clear()
+                misses = 0
+        clusters.append((cluster_start, end))
+    return clusters
+
+
+def sort_clusters(triangles, clusters, positions):
+    """Draw clusters that face away from the mesh centre first (outside-in)."""
+    corners = positions[triangles]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    areas = np.linalg.norm(normals, axis=1)
+    centroids = corners.mean(axis=1)
+    total = areas.sum()
+    centre = (centroids * areas[:, None]).sum(axis=0) / total if total > 0 else centroids.mean(axis=0)
+
+    keys = []
+    for start, end in clusters:
+        area = areas[start:end].sum()
+        normal = normals[start:end].sum(axis=0)
+        length = np.linalg.norm(normal)
+        if area <= 0 or length <= 0:
+            keys.append(0.0)
+            continue
+        centroid = (centroids[start:end] * areas[start:end, None]).sum(axis=0) / area
+        keys.append(float(np.dot(centroid - centre, normal / length)))
+    order = sorted(range(len(clusters)), key=lambda i: -keys[i])
+    return np.concatenate([triangles[clusters[i][0]:clusters[i][1]] for i in order])
+
+
+def fetch_remap(triangles, vertex_count):
+    """Renumber vertices in order of first use."""
+    flat = triangles.ravel()
+    used, first = np.unique(flat, return_index=True)
+    order = used[np.argsort(first)]
+    remap = np.full(vertex_count, -1, dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    return order, remap[triangles]
+
+
+def reorder(attributes, triangles):
+    positions = attributes["POSITION"].astype(np.float64)
+    ordered, boundaries = tipsify(triangles, len(positions))
+    threshold = acmr_misses(ordered.ravel()) / max(1, len(ordered)) * OVERDRAW_THRESHOLD
+    clusters = soft_boundaries(ordered, boundaries, threshold)
+    ordered = sort_clusters(ordered, clusters, positions)
+    order, ordered = fetch_remap(ordered, len(positions))
+    return {k: a[order] for k, a in attributes.items()}, ordered
+
+
+def rotate(q, v):
+    """Rotate vectors v (n, 3) by unit quaternions q (n, 4), xyzw."""
+    u, w = q[:, :3], q[:, 3:]
+    t = 2 * np.cross(u, v)
+    return v + w * t + np.cross(u, t)
+
+
+class Optimizer:
+    def __init__(self, gltf, binary):
+        self.gltf = gltf
+        self.binary = binary
+        self.writer = BinWriter(gltf, binary)
+        self.stats = {"vertices": [0, 0], "triangles": [0, 0], "misses": [0, 0], "maxPositionError": 0.0}
+
+    def add_accessor(self, array, component_type, accessor_type, normalized=False, target=ARRAY_BUFFER, bounds=False):
+        array = np.ascontiguousarray(array, dtype=COMPONENT_DTYPES[component_type])
+        rows = array.reshape(len(array), -1)
+        stride = None
+        data = rows.view(np.uint8)
+        if target == ARRAY_BUFFER:
+            # Vertex attribute elements must start on 4-byte boundaries
+            stride = -(-data.shape[1] // 4) * 4
+            data = np.pad(data, ((0, 0), (0, stride - data.shape[1])))
+        accessor = {
+            "bufferView": self.writer.add_view(data.tobytes(), target=target, stride=stride),
+            "componentType": component_type,
+            "count": len(array),
+            "type": accessor_type,
+        }
+        if normalized:
+            accessor["normalized"] = True
+        if bounds:
+            accessor["min"] = rows.min(axis=0).tolist()
+            accessor["max"] = rows.max(axis=0).tolist()
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+    def eligible(self, primitive):
+        if primitive.get("mode", MODE_TRIANGLES) != MODE_TRIANGLES or "targets" in primitive:
+            return False
+        if primitive.get("extensions"):
+            return False
+        indices = [primitive["indices"]] if "indices" in primitive else []
+        accessors = [self.gltf["accessors"][i] for i in list(primitive["attributes"].values()) + indices]
+        return all("sparse" not in a and "bufferView" in a for a in accessors)
+
+    def read_primitive(self, primitive):
+        attributes = {k: read_accessor(self.gltf, self.binary, i) for k, i in primitive["attributes"].items()}
+        if "indices" in primitive:
+            indices = read_accessor(self.gltf, self.binary, primitive["indices"]).ravel().astype(np.int64)
+        else:
+            indices = np.arange(len(attributes["POSITION"]), dtype=np.int64)
+        return attributes, indices.reshape(-1, 3)
+
+    def write_attribute(self, name, data, normalized):
+        """Quantized accessor for one attribute; anything else is copied as-is."""
+        accessor_type = {1: "SCALAR", 2: "VEC2", 3: "VEC3", 4: "VEC4"}[data.shape[1]]
+        if data.dtype == np.float32 and name != "POSITION":
+            if name in ("NORMAL", "TANGENT"):
+                return self.add_accessor(np.round(np.clip(data, -1, 1) * 127), BYTE, accessor_type, normalized=True)
+            if name.startswith(("TEXCOORD_", "COLOR_")) and data.min() >= 0 and data.max() <= 1:
+                return self.add_accessor(np.round(data * 65535), UNSIGNED_SHORT, accessor_type, normalized=True)
+        component_type = next(k for k, v in COMPONENT_DTYPES.items() if np.dtype(v) == data.dtype)
+        return self.add_accessor(data, component_type, accessor_type, normalized=normalized, bounds=name == "POSITION")
+
+    def optimize_mesh(self, mesh, quantize_positions):
+        results = []
+        for primitive in mesh["primitives"]:
+            attributes, triangles = self.read_primitive(primitive)
+            vertices = len(attributes["POSITION"])
+            self.stats["vertices"][0] += vertices
+            self.stats["triangles"][0] += len(triangles)
+            self.stats["misses"][0] += acmr_misses(triangles.ravel())
+
+            attributes, triangles = weld(attributes, triangles)
+            attributes, triangles = reorder(attributes, triangles)
+            self.stats["vertices"][1] += len(attributes["POSITION"])
+            self.stats["triangles"][1] += len(triangles)
+            self.stats["misses"][1] += acmr_misses(triangles.ravel())
+            results.append((primitive, attributes, triangles))
+
+        dequantize = None
+        if quantize_positions:
+            positions = np.concatenate([a["POSITION"] for _, a, _ in results]).astype(np.float64)
+            lo, hi = positions.min(axis=0), positions.max(axis=0)
+            offset = (lo + hi) / 2
+            scale = float(np.max(hi - lo)) / 2 / POSITION_RANGE or 1.0
+            dequantize = (offset, scale)
+
+        for primitive, attributes, triangles in results:
+            normalized = {k: self.gltf["accessors"][i].get("normalized", False) for k, i in primitive["attributes"].items()}
+            new = {}
+            for name, data in attributes.items():
+                if name == "POSITION" and dequantize is not None:
+                    offset, scale = dequantize
+                    quantized = np.round((data.astype(np.float64) - offset) / scale)
+                    error = np.abs(quantized * scale + offset - data).max()
+                    self.stats["maxPositionError"] = max(self.stats["maxPositionError"], float(error))
+                    new[name] = self.add_accessor(quantized, SHORT, "VEC3", bounds=True)
+                else:
+                    new[name] = self.write_attribute(name, data, normalized[name])
+            primitive["attributes"] = new
+            index_type = UNSIGNED_SHORT if len(attributes["POSITION"]) < 65535 else UNSIGNED_INT
+            primitive["indices"] = self.add_accessor(triangles.ravel(), index_type, "SCALAR",
+                                                     target=ELEMENT_ARRAY_BUFFER)
+        return dequantize
+
+    def animated_nodes(self):
+        return {
+            channel["target"]["node"]
+            for animation in self.gltf.get("animations", [])
+            for channel in animation["channels"]
+            if "node" in channel["target"] and channel["target"]["path"] in ("translation", "rotation", "scale")
+        }
+
+    def foldable(self, node):
+        instancing = node.get("extensions", {}).get("EXT_mesh_gpu_instancing", {})
+        return all(self.gltf["accessors"][i]["componentType"] == FLOAT for i in instancing.get("attributes", {}).values())
+
+    def fold(self, node_index, offset, scale):
+        """Apply the position dequantization (translate by offset, scale) to a mesh node."""
+        nodes = self.gltf["nodes"]
+        node = nodes[node_index]
+        instancing = node.get("extensions", {}).get("EXT_mesh_gpu_instancing")
+        if instancing:
+            attributes = instancing["attributes"]
+            count = self.gltf["accessors"][next(iter(attributes.values()))]["count"]
+            t = read_accessor(self.gltf, self.binary, attributes["TRANSLATION"]).astype(np.float64) \
+                if "TRANSLATION" in attributes else np.zeros((count, 3))
+            r = read_accessor(self.gltf, self.binary, attributes["ROTATION"]).astype(np.float64) \
+                if "ROTATION" in attributes else np.tile([0.0, 0.0, 0.0, 1.0], (count, 1))
+            s = read_accessor(self.gltf, self.binary, attributes["SCALE"]).astype(np.float64) \
+                if "SCALE" in attributes else np.ones((count, 3))
+            attributes["TRANSLATION"] = self.add_accessor(t + rotate(r, s * offset), FLOAT, "VEC3", target=None)
+            attributes["SCALE"] = self.add_accessor(s * scale, FLOAT, "VEC3", target=None)
+            return
+        if "matrix" in node or node.get("children") or node_index in self.animated_nodes():
+            # Give the mesh its own child node so the dequantization doesn't
+            # scale the children or fight the animation
+            child = {"name": node.get("name", "mesh") + ".mesh", "mesh": node.pop("mesh"),
+                     "translation": offset.tolist(), "scale": [scale] * 3}
+            nodes.append(child)
+            node.setdefault("children", []).append(len(nodes) - 1)
+            return
+        t = np.asarray(node.get("translation", (0.0, 0.0, 0.0)))
+        r = np.asarray(node.get("rotation", (0.0, 0.0, 0.0, 1.0)))
+        s = np.asarray(node.get("scale", (1.0, 1.0, 1.0)))
+        node["translation"] = (t + rotate(r[None], (s * offset)[None])[0]).tolist()
+        node["scale"] = (s * scale).tolist()
+
+    def run(self):
+        gltf = self.gltf
+        nodes = gltf.get("nodes", [])
+        users = {}
+        for index, node in enumerate(nodes):
+            if "mesh" in node:
+                users.setdefault(node["mesh"], []).append(index)
+        skinned = {node["mesh"] for node in nodes if "mesh" in node and "skin" in node}
+
+        optimized = 0
+        for mesh_index, mesh in enumerate(gltf.get("meshes", [])):
+            if not all(self.eligible(p) for p in mesh["primitives"]):
+                continue
+            positions_ok = mesh_index not in skinned and all(
+                gltf["accessors"][p["attributes"]["POSITION"]]["componentType"] == FLOAT for p in mesh["primitives"]
+            ) and all(self.foldable(nodes[i]) for i in users.get(mesh_index, []))
+            dequantize = self.optimize_mesh(mesh, positions_ok)
+            if dequantize is not None:
+                for node_index in users.get(mesh_index, []):
+                    self.fold(node_index, *dequantize)
+            optimized += 1
+
+        if optimized:
+            used = gltf.setdefault("extensionsUsed", [])
+            required = gltf.setdefault("extensionsRequired", [])
+            for names in (used, required):
+                if EXTENSION not in names:
+                    names.append(EXTENSION)
+        self.stats["meshes"] = optimized
+        return compact(gltf, bytes(self.writer.data))
+
+
+def optimize_file(path, dry_run=False):
+    before = os.path.getsize(path)
+    gltf, binary = read_glb(path)
+    skipped = [e for e in SKIPPED_EXTENSIONS if e in gltf.get("extensionsUsed", [])]
+    if skipped:
+        return {"bytes": [before, before], "skipped": skipped[0]}
+
+    optimizer = Optimizer(gltf, binary)
+    gltf, binary = optimizer.run()
+    data = encode_glb(gltf, binary)
+    if not dry_run:
+        with open(path, "wb") as f:
+            f.write(data)
+    return dict(optimizer.stats, bytes=[before, len(data)])
+
+
+def print_report(name, stats):
+    before, after = stats["bytes"]
+    if "skipped" in stats:
+        print(f"  {name:<28} {before / 1024:8.0f}KB  skipped ({stats['skipped']})")
+        return
+    tris_before, tris_after = stats["triangles"]
+    acmr_before = stats["misses"][0] / max(1, tris_before)
+    acmr_after = stats["misses"][1] / max(1, tris_after)
+    print(f"  {name:<28} {before / 1024:8.0f}KB -> {after / 1024:6.0f}KB ({after / before - 1:+.0%})  "
+          f"ACMR {acmr_before:.3f} -> {acmr_after:.3f}  "
+          f"verts {stats['vertices'][0]} -> {stats['vertices'][1]}  "
+          f"max pos error {stats['maxPositionError']:.2e}")
+
+
+def main():
+    from model_manifest import is_hashed
+
+    parser = argparse.ArgumentParser(description="Quantize and reorder GLB geometry in place.")
+    parser.add_argument("paths", nargs="*", help="GLB files (default: every generated model under public/models/)")
+    parser.add_argument("--dry-run", action="store_true", help="report without rewriting the files")
+    args = parser.parse_args()
+
+    paths = args.paths
+    if not paths:
+        for dirpath, _, filenames in os.walk(MODELS_DIR):
+            paths += [os.path.join(dirpath, f) for f in filenames if f.endswith(".glb") and not is_hashed(f)]
+    print(f"=== Optimizing {len(paths)} GLB(s) (ACMR with a {CACHE_SIZE}-entry FIFO) ===")
+    for path in sorted(os.path.abspath(p) for p in paths):
+        name = os.path.relpath(path, MODELS_DIR) if path.startswith(MODELS_DIR + os.sep) else path
+        print_report(name, optimize_file(path, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
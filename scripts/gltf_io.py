@@ -0,0 +1,190 @@
+"""
+Minimal GLB reader/writer shared by the asset tools in scripts/.
+Only the JSON and BIN chunks of a single-buffer GLB are handled, which is
+what the Blender exporter and FBX2glTF produce.
+"""
+
+import json
+import struct
+
+GLB_MAGIC = 0x46546C67  # "glTF"
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+COMPONENT_DTYPES = {
+    5120: "<i1",
+    5121: "<u1",
+    5122: "<i2",
+    5123: "<u2",
+    5125: "<u4",
+    5126: "<f4",
+}
+COMPONENT_SIZES = {5120: 1, 5121: 1, 5122: 2, 5123: 2, 5125: 4, 5126: 4}
+# Divisors for normalized integer components
+NORMALIZED_MAX = {5120: 127, 5121: 255, 5122: 32767, 5123: 65535}
+TYPE_SIZES = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+
+
+def read_glb(path):
+    """Return (gltf dict, bin bytes) for a .glb file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, length = struct.unpack_from("<III", data, 0)
+    if magic != GLB_MAGIC:
+        raise ValueError(f"{path}: not a GLB file")
+    if version != 2:
+        raise ValueError(f"{path}: unsupported GLB version {version}")
+
+    gltf = None
+    binary = b""
+    offset = 12
+    while offset < length:
+        chunk_length, chunk_type = struct.unpack_from("<II", data, offset)
+        chunk = data[offset + 8:offset + 8 + chunk_length]
+        if chunk_type == CHUNK_JSON:
+            gltf = json.loads(chunk)
+        elif chunk_type == CHUNK_BIN:
+            binary = chunk
+        offset += 8 + chunk_length
+    if gltf is None:
+        raise ValueError(f"{path}: missing JSON chunk")
+    return gltf, binary
+
+
+def pad4(data, fill):
+    return data + fill * (-len(data) % 4)
+
+
+def encode_glb(gltf, binary):
+    """Serialize to GLB bytes; key order is preserved so output is reproducible."""
+    if binary:
+        gltf.setdefault("buffers", [{}])[0]["byteLength"] = len(binary)
+    json_chunk = pad4(json.dumps(gltf, separators=(",", ":")).encode("utf-8"), b" ")
+    chunks = struct.pack("<II", len(json_chunk), CHUNK_JSON) + json_chunk
+    if binary:
+        bin_chunk = pad4(binary, b"\x00")
+        chunks += struct.pack("<II", len(bin_chunk), CHUNK_BIN) + bin_chunk
+    return struct.pack("<III", GLB_MAGIC, 2, 12 + len(chunks)) + chunks
+
+
+def write_glb(path, gltf, binary):
+    with open(path, "wb") as f:
+        f.write(encode_glb(gltf, binary))
+
+
+def accessor_nbytes(accessor):
+    return accessor["count"] * TYPE_SIZES[accessor["type"]] * COMPONENT_SIZES[accessor["componentType"]]
+
+
+def read_accessor(gltf, binary, index):
+    """Accessor data as a (count, components) NumPy array, raw component type."""
+    import numpy as np
+
+    accessor = gltf["accessors"][index]
+    components = TYPE_SIZES[accessor["type"]]
+    dtype = np.dtype(COMPONENT_DTYPES[accessor["componentType"]])
+    count = accessor["count"]
+    if "bufferView" not in accessor:
+        return np.zeros((count, components), dtype=dtype)
+
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    start = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+    element = components * dtype.itemsize
+    stride = view.get("byteStride", element)
+    if stride == element:
+        flat = np.frombuffer(binary, dtype=dtype, count=count * components, offset=start)
+        return flat.reshape(count, components)
+    rows = np.ndarray(
+        shape=(count, components), dtype=dtype, buffer=binary, offset=start,
+        strides=(stride, dtype.itemsize),
+    )
+    return np.array(rows)
+
+
+def read_floats(gltf, binary, index):
+    """Accessor data as float64, undoing normalized integer storage."""
+    import numpy as np
+
+    data = read_accessor(gltf, binary, index).astype(np.float64)
+    accessor = gltf["accessors"][index]
+    if accessor.get("normalized"):
+        data = np.maximum(data / NORMALIZED_MAX[accessor["componentType"]], -1.0)
+    return data
+
+
+class BinWriter:
+    """Appends buffer views to a BIN chunk, starting each one 4-byte aligned."""
+
+    def __init__(self, gltf, binary=b""):
+        self.views = gltf.setdefault("bufferViews", [])
+        self.data = bytearray(binary)
+
+    def add_view(self, data, target=None, stride=None):
+        self.data.extend(b"\x00" * (-len(self.data) % 4))
+        view = {"buffer": 0, "byteOffset": len(self.data), "byteLength": len(data)}
+        if stride is not None:
+            view["byteStride"] = stride
+        if target is not None:
+            view["target"] = target
+        self.data.extend(data)
+        self.views.append(view)
+        return len(self.views) - 1
+
+
+def compact(gltf, binary):
+    """Drop accessors and buffer views nothing references; repack the BIN chunk."""
+    accessors = gltf.get("accessors", [])
+    refs = []  # (container, key) pairs holding an accessor index
+
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh["primitives"]:
+            refs += [(primitive["attributes"], k) for k in primitive["attributes"]]
+            if "indices" in primitive:
+                refs.append((primitive, "indices"))
+            for target in primitive.get("targets", []):
+                refs += [(target, k) for k in target]
+    for skin in gltf.get("skins", []):
+        if "inverseBindMatrices" in skin:
+            refs.append((skin, "inverseBindMatrices"))
+    for animation in gltf.get("animations", []):
+        for sampler in animation["samplers"]:
+            refs += [(sampler, "input"), (sampler, "output")]
+    for node in gltf.get("nodes", []):
+        instancing = node.get("extensions", {}).get("EXT_mesh_gpu_instancing")
+        if instancing:
+            refs += [(instancing["attributes"], k) for k in instancing["attributes"]]
+
+    accessor_map = {}
+    new_accessors = []
+    for container, key in refs:
+        old = container[key]
+        if old not in accessor_map:
+            accessor_map[old] = len(new_accessors)
+            new_accessors.append(accessors[old])
+        container[key] = accessor_map[old]
+
+    view_refs = [(a, "bufferView") for a in new_accessors if "bufferView" in a]
+    view_refs += [(a["sparse"][part], "bufferView") for a in new_accessors if "sparse" in a
+                  for part in ("indices", "values")]
+    view_refs += [(image, "bufferView") for image in gltf.get("images", []) if "bufferView" in image]
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh["primitives"]:
+            draco = primitive.get("extensions", {}).get("KHR_draco_mesh_compression")
+            if draco:
+                view_refs.append((draco, "bufferView"))
+
+    views = gltf.get("bufferViews", [])
+    gltf["bufferViews"] = []
+    writer = BinWriter(gltf)
+    view_map = {}
+    for container, key in view_refs:
+        old = container[key]
+        if old not in view_map:
+            view = views[old]
+            start = view.get("byteOffset", 0)
+            view_map[old] = writer.add_view(binary[start:start + view["byteLength"]],
+                                            target=view.get("target"), stride=view.get("byteStride"))
+        container[key] = view_map[old]
+
+    gltf["accessors"] = new_accessors
+    return gltf, bytes(writer.data)
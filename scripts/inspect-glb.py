@@ -0,0 +1,212 @@
+"""
+Inspect every GLB under public/models/ and check it against a budget baseline.
+
+For each asset the report lists file, JSON, geometry and texture bytes,
+meshes, primitives, materials, draw calls, vertices and triangles, plus the
+compression extensions in use. Counts come from the glTF JSON alone, so
+Draco and meshopt files are measured without decoding and Blender is not
+needed. GPU-instanced nodes count as one draw call but contribute every
+instance's triangles.
+
+--check compares against scripts/glb-baseline.json and fails when a metric
+grows past its threshold; --update-baseline rewrites that file. It runs as
+part of `npm test`. LODs written by generate-skill-models.py
+({name}.lodN.glb) are held to their full-detail model's budget. Other
+assets missing from the baseline (the skill atlas, a baked hero, new
+models) are listed as unchecked rather than failing the run.
+Run: python scripts/inspect-glb.py [--json report.json] [--check] [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from gltf_io import read_glb
+from model_manifest import is_hashed
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(ROOT, "public", "models")
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "glb-baseline.json")
+
+# Allowed growth over the baseline before --check fails, as a fraction.
+# Draw calls and materials must not grow at all.
+THRESHOLDS = {
+    "bytes": 0.10,
+    "vertices": 0.10,
+    "triangles": 0.10,
+    "drawCalls": 0.0,
+    "materials": 0.0,
+    "textureBytes": 0.10,
+}
+
+LOD_RE = re.compile(r"\.lod\d+\.glb$")
+
+MODE_TRIANGLES = 4
+MODE_TRIANGLE_STRIP = 5
+MODE_TRIANGLE_FAN = 6
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Report and budget-check GLB assets.")
+    parser.add_argument("paths", nargs="*", help="GLB files (default: everything under public/models/)")
+    parser.add_argument("--json", dest="json_path", help="write the report as JSON to this path")
+    parser.add_argument("--check", action="store_true", help="fail if an asset regresses past the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with this report")
+    return parser.parse_args()
+
+
+def find_assets():
+    paths = []
+    for dirpath, _, filenames in os.walk(MODELS_DIR):
+        # Content-hashed copies are byte-identical to their fixed-name source
+        paths.extend(os.path.join(dirpath, f) for f in filenames if f.endswith(".glb") and not is_hashed(f))
+    return sorted(paths)
+
+
+def primitive_triangles(gltf, primitive):
+    mode = primitive.get("mode", MODE_TRIANGLES)
+    if "indices" in primitive:
+        count = gltf["accessors"][primitive["indices"]]["count"]
+    else:
+        count = gltf["accessors"][primitive["attributes"]["POSITION"]]["count"]
+    if mode == MODE_TRIANGLES:
+        return count // 3
+    if mode in (MODE_TRIANGLE_STRIP, MODE_TRIANGLE_FAN):
+        return max(0, count - 2)
+    return 0
+
+
+def node_instances(gltf, node):
+    ext = node.get("extensions", {}).get("EXT_mesh_gpu_instancing")
+    if not ext:
+        return 1
+    attribute = next(iter(ext["attributes"].values()))
+    return gltf["accessors"][attribute]["count"]
+
+
+def inspect(path):
+    gltf, binary = read_glb(path)
+    meshes = gltf.get("meshes", [])
+    accessors = gltf.get("accessors", [])
+    views = gltf.get("bufferViews", [])
+    extensions = gltf.get("extensionsUsed", [])
+
+    mesh_vertices = []
+    mesh_triangles = []
+    for mesh in meshes:
+        mesh_vertices.append(sum(accessors[p["attributes"]["POSITION"]]["count"] for p in mesh["primitives"]))
+        mesh_triangles.append(sum(primitive_triangles(gltf, p) for p in mesh["primitives"]))
+
+    draw_calls = 0
+    vertices = 0
+    triangles = 0
+    for node in gltf.get("nodes", []):
+        if "mesh" not in node:
+            continue
+        mesh = node["mesh"]
+        instances = node_instances(gltf, node)
+        draw_calls += len(meshes[mesh]["primitives"])
+        vertices += mesh_vertices[mesh] * instances
+        triangles += mesh_triangles[mesh] * instances
+
+    image_views = {img["bufferView"] for img in gltf.get("images", []) if "bufferView" in img}
+    texture_bytes = sum(views[i]["byteLength"] for i in image_views)
+    geometry_bytes = sum(v["byteLength"] for i, v in enumerate(views) if i not in image_views)
+
+    return {
+        "bytes": os.path.getsize(path),
+        "jsonBytes": len(json.dumps(gltf, separators=(",", ":"))),
+        "binBytes": len(binary),
+        "geometryBytes": geometry_bytes,
+        "textureBytes": texture_bytes,
+        "meshes": len(meshes),
+        "primitives": sum(len(m["primitives"]) for m in meshes),
+        "nodes": len(gltf.get("nodes", [])),
+        "materials": len(gltf.get("materials", [])),
+        "textures": len(gltf.get("textures", [])),
+        "animations": len(gltf.get("animations", [])),
+        "accessors": len(accessors),
+        "drawCalls": draw_calls,
+        "vertices": vertices,
+        "triangles": triangles,
+        "draco": "KHR_draco_mesh_compression" in extensions,
+        "meshopt": "EXT_meshopt_compression" in extensions,
+        "extensions": sorted(extensions),
+    }
+
+
+def asset_name(path):
+    return os.path.relpath(path, MODELS_DIR).replace(os.sep, "/")
+
+
+def print_table(report):
+    columns = ["bytes", "textureBytes", "meshes", "materials", "drawCalls", "vertices", "triangles"]
+    header = f"{'asset':<28}" + "".join(f"{c:>14}" for c in columns) + "  draco"
+    print(header)
+    print("-" * len(header))
+    for name, stats in report.items():
+        row = f"{name:<28}" + "".join(f"{stats[c]:>14}" for c in columns)
+        print(row + ("  yes" if stats["draco"] else "  no"))
+
+
+def baseline_entry(name, baseline):
+    """(baseline name, entry) an asset is checked against, or (None, None)."""
+    if name in baseline:
+        return name, baseline[name]
+    # A decimated LOD may never cost more than its full-detail model
+    full = LOD_RE.sub(".glb", name)
+    if full != name and full in baseline:
+        return full, baseline[full]
+    return None, None
+
+
+def check(report, baseline):
+    """(failures, assets without a baseline)."""
+    failures = []
+    unchecked = []
+    for name, stats in report.items():
+        base_name, base = baseline_entry(name, baseline)
+        if base is None:
+            unchecked.append(name)
+            continue
+        label = name if base_name == name else f"{name} (against {base_name})"
+        for metric, tolerance in THRESHOLDS.items():
+            limit = base[metric] * (1 + tolerance)
+            if stats[metric] > limit:
+                failures.append(f"{label}: {metric} {stats[metric]} exceeds baseline {base[metric]} (+{tolerance:.0%})")
+    return failures, unchecked
+
+
+def main():
+    args = parse_args()
+    paths = args.paths or find_assets()
+    report = {asset_name(os.path.abspath(p)): inspect(p) for p in paths}
+    print_table(report)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Updated {BASELINE_PATH}")
+    elif args.check:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            baseline = json.load(f)
+        failures, unchecked = check(report, baseline)
+        for name in unchecked:
+            print(f"  {name}: not in baseline, not checked (run with --update-baseline to budget it)")
+        for failure in failures:
+            print(f"FAIL {failure}", file=sys.stderr)
+        if failures:
+            sys.exit(1)
+        print(f"All {len(report) - len(unchecked)} baselined asset(s) within budget")
+
+
+if __name__ == "__main__":
+    main()
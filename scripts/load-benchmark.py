@@ -0,0 +1,305 @@
+"""
+Replay the site's 3D asset waterfall against a throttled local server.
+
+public/ is served from 127.0.0.1 through one shared link with a fixed
+round-trip time and bandwidth. Precompressed .br/.gz siblings
+(precompress.py) are served when the client accepts them, as an edge
+would. A client with at most --connections keep-alive connections (six, a
+browser's per-host HTTP/1.1 limit) then requests each page's assets in the
+order the components ask for them:
+  hero    HeroScene on a desktop: the full sculpture GLB (useGLTF.preload),
+          then the Draco wrapper and WASM once GLTFLoader finds compressed
+          meshes; hero-mobile is the same with the baked low-poly variant,
+          when one is published
+  globe   Globe on a 1080p desktop: the day and relief maps of the tier
+          src/lib/globeTextures.ts picks (KTX2 plus the Basis transcoder
+          when the tier has it) and country-lines.bin, all fetched from
+          mount effects
+  skills  SkillIcon3D: every modelPath in src/data/skills.ts at once
+Model URLs resolve through src/data/model-manifest.json like the site's, so
+the hashed files are what gets measured. Each page starts cold: new
+connections (one RTT to open) and no cache.
+
+For each asset the report gives the time to first byte and to completion
+since the page started, and the bytes on the wire. For each page it gives
+the totals and the time until its last asset arrived. The median of --runs
+is reported.
+Run: python scripts/load-benchmark.py [--network slow-4g|3g|cable|none] [--rtt 150] [--bandwidth 1.6]
+     [--connections 6] [--encoding br,gzip|gzip|identity] [--pages hero,skills] [--runs 3] [--json report.json]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from model_manifest import MANIFEST_PATH, PUBLIC_DIR, ROOT
+
+SKILLS_DATA = os.path.join(ROOT, "src", "data", "skills.ts")
+GLOBE_TEXTURES = os.path.join(ROOT, "src", "data", "globe-textures.json")
+BASIS_TRANSCODER = ("/basis/basis_transcoder.js", "/basis/basis_transcoder.wasm")
+# Screen width in device pixels the globe page is measured at (a 1080p desktop)
+GLOBE_SCREEN_PIXELS = 1920
+
+# (round trip in ms, downlink in Mbit/s)
+NETWORKS = {
+    "slow-4g": (150, 1.6),  # Lighthouse's mobile throttling
+    "3g": (300, 1.6),  # WebPageTest 3G
+    "cable": (28, 5.0),  # WebPageTest Cable
+    "none": (0, 0),
+}
+CHUNK = 16 * 1024
+CONTENT_TYPES = {
+    ".glb": "model/gltf-binary", ".js": "text/javascript", ".wasm": "application/wasm", ".bin": "application/octet-stream",
+    ".jpg": "image/jpeg", ".png": "image/png", ".json": "application/json", ".geojson": "application/geo+json",
+}
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+class Link:
+    """One bottleneck shared by every connection, sending chunks first come, first served."""
+
+    def __init__(self, mbps):
+        self.bytes_per_second = mbps * 1e6 / 8
+        self.free_at = 0.0
+        self.lock = threading.Lock()
+
+    def send(self, nbytes):
+        if not self.bytes_per_second:
+            return
+        with self.lock:
+            now = time.perf_counter()
+            self.free_at = max(now, self.free_at) + nbytes / self.bytes_per_second
+            delay = self.free_at - now
+        time.sleep(delay)
+
+
+def make_handler(link, rtt):
+    class ThrottledHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            # The request travels up and the first response byte back down
+            time.sleep(rtt)
+            path = os.path.normpath(os.path.join(PUBLIC_DIR, unquote(urlsplit(self.path).path).lstrip("/")))
+            if not path.startswith(PUBLIC_DIR + os.sep) or not os.path.isfile(path):
+                self.send_error(404)
+                return
+            encoding = None
+            accepted = [e.strip().split(";")[0] for e in self.headers.get("Accept-Encoding", "").split(",")]
+            for name, suffix in ENCODINGS.items():
+                if name in accepted and os.path.exists(path + suffix):
+                    encoding, path = name, path + suffix
+                    break
+            with open(path, "rb") as f:
+                body = f.read()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPES.get(os.path.splitext(self.path)[1], "application/octet-stream"))
+            self.send_header("Content-Length", str(len(body)))
+            if encoding:
+                self.send_header("Content-Encoding", encoding)
+            self.end_headers()
+            for start in range(0, len(body), CHUNK):
+                chunk = body[start:start + CHUNK]
+                link.send(len(chunk))
+                self.wfile.write(chunk)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ThrottledHandler
+
+
+def load_manifest():
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def model_url(manifest, name):
+    # As src/lib/modelAssets.ts resolves it
+    return manifest.get(name, {}).get("url", f"/models/{name}")
+
+
+def pages(manifest):
+    """{page: [(url, urls it waits for)]} in request order."""
+    def hero(name):
+        url = model_url(manifest, name)
+        draco = manifest.get(name, {}).get("dracoDecoderPath", "/draco/")
+        if not draco:
+            return [(url, ())]
+        return [(url, ()), (f"{draco}draco_wasm_wrapper.js", (url,)), (f"{draco}draco_decoder.wasm", (url,))]
+
+    with open(GLOBE_TEXTURES, encoding="utf-8") as f:
+        globe = json.load(f)
+    # As pickGlobeTier resolves it, ignoring the GPU's texture size limit
+    tier = next((t for t in globe["tiers"] if t["width"] >= GLOBE_SCREEN_PIXELS), globe["tiers"][-1])
+    files = (tier["files"]["day"], tier["files"]["relief"])
+    textures = tuple(globe["base"] + f.get("ktx2", f["fallback"]) for f in files)
+    if any("ktx2" in f for f in files):
+        textures += BASIS_TRANSCODER
+    globe_assets = [(url, ()) for url in textures + ("/data/country-lines.bin",)]
+
+    with open(SKILLS_DATA, encoding="utf-8") as f:
+        skills = re.findall(r"modelPath: modelUrl\('([^']+)'\)", f.read())
+    skill_assets = [(model_url(manifest, name), ()) for name in skills]
+    found = {"hero": hero("hero-sculpture.glb"), "globe": globe_assets, "skills": skill_assets}
+    if "hero-sculpture-baked.glb" in manifest:
+        found["hero-mobile"] = hero("hero-sculpture-baked.glb")
+    return found
+
+
+class Client:
+    """At most `connections` keep-alive connections, each opened with one round trip."""
+
+    def __init__(self, port, connections, rtt, encoding):
+        self.port = port
+        self.rtt = rtt
+        self.encoding = encoding
+        self.pool = ThreadPoolExecutor(max_workers=connections)
+        self.local = threading.local()
+        self.opened = []
+
+    def connection(self):
+        if getattr(self.local, "connection", None) is None:
+            connection = http.client.HTTPConnection("127.0.0.1", self.port)
+            connection.connect()
+            time.sleep(self.rtt)  # the handshake
+            self.local.connection = connection
+            self.opened.append(connection)
+        return self.local.connection
+
+    def fetch(self, url, origin):
+        connection = self.connection()
+        headers = {"Accept-Encoding": self.encoding} if self.encoding else {}
+        start = time.perf_counter()
+        connection.request("GET", url, headers=headers)
+        response = connection.getresponse()
+        first_byte = time.perf_counter()
+        body = response.read()
+        done = time.perf_counter()
+        if response.status != 200:
+            raise SystemExit(f"{url}: HTTP {response.status}")
+        return {
+            "url": url,
+            "encoding": response.getheader("Content-Encoding", "identity"),
+            "bytes": len(body),
+            "startMs": (start - origin) * 1000,
+            "ttfbMs": (first_byte - origin) * 1000,
+            "completeMs": (done - origin) * 1000,
+        }
+
+    def close(self):
+        self.pool.shutdown()
+        for connection in self.opened:
+            connection.close()
+
+
+def load_page(port, assets, connections, rtt, encoding):
+    """Request a page's assets in order, each once the ones it waits for are done."""
+    client = Client(port, connections, rtt, encoding)
+    results = {}
+    pending = list(assets)
+    futures = {}
+    origin = time.perf_counter()
+    try:
+        while pending or futures:
+            for url, after in [a for a in pending if all(u in results for u in a[1])]:
+                pending.remove((url, after))
+                futures[client.pool.submit(client.fetch, url, origin)] = url
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures.pop(future)] = future.result()
+    finally:
+        client.close()
+    return [results[url] for url, _ in assets]
+
+
+def median_run(runs):
+    """Per asset, the median of each timing over the runs."""
+    merged = []
+    for samples in zip(*runs):
+        entry = dict(samples[0])
+        for key in ("startMs", "ttfbMs", "completeMs"):
+            entry[key] = round(statistics.median(s[key] for s in samples), 1)
+        merged.append(entry)
+    return merged
+
+
+def page_summary(assets):
+    return {
+        "requests": len(assets),
+        "bytes": sum(a["bytes"] for a in assets),
+        "firstByteMs": min(a["ttfbMs"] for a in assets),
+        "completeMs": max(a["completeMs"] for a in assets),
+    }
+
+
+def print_page(name, assets, summary):
+    print(f"=== {name}: {summary['requests']} requests, {summary['bytes'] / 1024:.0f}KB, "
+          f"complete at {summary['completeMs']:.0f}ms ===")
+    print(f"  {'asset':<48} {'encoding':<9} {'bytes':>9} {'start':>8} {'TTFB':>8} {'complete':>9}")
+    for a in assets:
+        print(f"  {a['url'].lstrip('/'):<48} {a['encoding']:<9} {a['bytes']:>9} {a['startMs']:>6.0f}ms "
+              f"{a['ttfbMs']:>6.0f}ms {a['completeMs']:>7.0f}ms")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Time the site's 3D asset loads over a throttled local server.")
+    parser.add_argument("--network", choices=sorted(NETWORKS), default="slow-4g", help="RTT and bandwidth preset")
+    parser.add_argument("--rtt", type=float, help="round-trip time in ms (overrides the preset)")
+    parser.add_argument("--bandwidth", type=float, help="downlink in Mbit/s, 0 for unlimited (overrides the preset)")
+    parser.add_argument("--connections", type=int, default=6, help="concurrent connections per page")
+    parser.add_argument("--encoding", default="br,gzip",
+                        help="Accept-Encoding to send; 'identity' ignores the precompressed variants")
+    parser.add_argument("--pages", default="hero,globe,skills", help="comma-separated pages to load")
+    parser.add_argument("--runs", type=int, default=1, help="loads per page; the median is reported")
+    parser.add_argument("--json", dest="json_path", help="write the timings as JSON to this path")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    preset_rtt, preset_mbps = NETWORKS[args.network]
+    rtt = (preset_rtt if args.rtt is None else args.rtt) / 1000
+    mbps = preset_mbps if args.bandwidth is None else args.bandwidth
+    encoding = "" if args.encoding == "identity" else args.encoding.replace(",", ", ")
+    available = pages(load_manifest())
+    selected = [p.strip() for p in args.pages.split(",") if p.strip()]
+    unknown = [p for p in selected if p not in available]
+    if unknown:
+        raise SystemExit(f"Unknown page(s): {', '.join(unknown)} (choose from {', '.join(available)})")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(Link(mbps), rtt))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    link = f"{mbps:g}Mbit/s" if mbps else "unlimited"
+    print(f"=== {args.network}: {rtt * 1000:.0f}ms RTT, {link}, {args.connections} connections, "
+          f"Accept-Encoding: {encoding or 'identity'} ===")
+    report = {"network": {"rttMs": rtt * 1000, "mbps": mbps, "connections": args.connections,
+                          "acceptEncoding": encoding or "identity"}, "pages": {}}
+    try:
+        for name in selected:
+            runs = [load_page(server.server_address[1], available[name], args.connections, rtt, encoding)
+                    for _ in range(max(1, args.runs))]
+            assets = median_run(runs)
+            summary = page_summary(assets)
+            report["pages"][name] = dict(summary, assets=assets)
+            print_page(name, assets, summary)
+    finally:
+        server.shutdown()
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"  Report written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+"""
+Merge the meshes that share a material into one draw call.
+
+Every mesh costs a draw call, whatever its material. The pass:
+  - rounds material factors to PRECISION decimals, so materials that are
+    equal up to float32 noise are equal in the JSON (skill_atlas.py then
+    shares them across skills),
+  - deduplicates materials with the same configuration (alpha mode,
+    sidedness, textures, extensions, vertex colors, emissive or not) whose
+    uniforms match to within UNIFORM_TOLERANCE, an 8-bit step. That only
+    catches copies of one material; materials that differ visibly are
+    never folded, so on the current skill models the material count
+    doesn't change,
+  - merges the triangle primitives that share a material and have the same
+    attributes into one mesh, with the node transforms baked in. Only
+    meshes with a single, static, non-instanced user are merged;
+    GPU-instanced nodes already draw in one call.
+
+The report gives the draw calls before and after, and the materials when
+duplicates were dropped. Files using Draco, meshopt or KHR_mesh_quantization are skipped, so
+run this before vertex_lighting.py and glb_optimize.py;
+generate-skill-models.py runs it on every uncompressed export.
+Run: python scripts/material_palette.py paths... [--dry-run]
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from gltf_io import BinWriter, compact, encode_glb, read_accessor, read_floats, read_glb
+from model_manifest import node_matrix
+
+SKIPPED_EXTENSIONS = ("KHR_draco_mesh_compression", "EXT_meshopt_compression", "KHR_mesh_quantization")
+EMISSIVE_STRENGTH = "KHR_materials_emissive_strength"
+
+FLOAT = 5126
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+MODE_TRIANGLES = 4
+
+PRECISION = 4
+# Largest difference in any color, metallic, roughness or emission value
+# that still counts as the same palette entry; below what an 8-bit frame shows
+UNIFORM_TOLERANCE = 1 / 255
+
+
+def configuration(material, vertex_colors=False):
+    """What three.js keys its shader programs on, as a hashable value."""
+    material = material or {}
+    pbr = material.get("pbrMetallicRoughness", {})
+    textures = sorted(k for k in list(pbr) + list(material) if k.endswith("Texture"))
+    # Emissive strength is a uniform (emissiveIntensity); other extensions add shader code
+    extensions = sorted(k for k in material.get("extensions", {}) if k != EMISSIVE_STRENGTH)
+    return json.dumps([
+        material.get("alphaMode", "OPAQUE"), material.get("doubleSided", False),
+        textures, extensions, vertex_colors,
+    ])
+
+
+def uniforms(material):
+    pbr = material.get("pbrMetallicRoughness", {})
+    strength = material.get("extensions", {}).get(EMISSIVE_STRENGTH, {}).get("emissiveStrength", 1.0)
+    return {
+        "color": np.asarray(pbr.get("baseColorFactor", [1.0] * 4), dtype=np.float64),
+        "metallic": float(pbr.get("metallicFactor", 1.0)),
+        "roughness": float(pbr.get("roughnessFactor", 1.0)),
+        "emission": np.asarray(material.get("emissiveFactor", [0.0] * 3), dtype=np.float64) * strength,
+    }
+
+
+def similar(a, b):
+    return all(np.abs(np.subtract(a[k], b[k])).max() <= UNIFORM_TOLERANCE for k in a)
+
+
+def palette_key(material):
+    # Emissive and non-emissive materials never share an entry, even when
+    # the emission is faint enough to fall inside the tolerance
+    return configuration(material), bool(uniforms(material)["emission"].any())
+
+
+def mergeable(material):
+    # Textured materials and anything carrying extras (baked lighting flags) stay as they are
+    pbr = material.get("pbrMetallicRoughness", {})
+    return "extras" not in material and not any(k.endswith("Texture") for k in list(pbr) + list(material))
+
+
+def rounded(values):
+    return [round(float(v), PRECISION) for v in values]
+
+
+def palette_name(names):
+    prefix = os.path.commonprefix(names)
+    return prefix if len(prefix) >= 2 else names[0]
+
+
+def write_uniforms(material, values):
+    pbr = material.setdefault("pbrMetallicRoughness", {})
+    pbr["baseColorFactor"] = rounded(values["color"])
+    pbr["metallicFactor"] = round(values["metallic"], PRECISION)
+    pbr["roughnessFactor"] = round(values["roughness"], PRECISION)
+    extensions = material.get("extensions", {})
+    extensions.pop(EMISSIVE_STRENGTH, None)
+    material.pop("emissiveFactor", None)
+    peak = float(values["emission"].max())
+    if peak > 1:
+        material["emissiveFactor"] = rounded(values["emission"] / peak)
+        extensions[EMISSIVE_STRENGTH] = {"emissiveStrength": round(peak, PRECISION)}
+    elif peak > 0:
+        material["emissiveFactor"] = rounded(values["emission"])
+    if extensions:
+        material["extensions"] = extensions
+    else:
+        material.pop("extensions", None)
+
+
+def build_palette(materials):
+    """(palette materials, old material index -> palette index)."""
+    palette = []
+    seeds = []  # (palette key, uniforms of the first member, member indices)
+    remap = {}
+    for index, material in enumerate(materials):
+        values = uniforms(material)
+        key = palette_key(material)
+        for p, (seed_key, seed, members) in enumerate(seeds):
+            if seed is not None and seed_key == key and mergeable(material) and similar(seed, values):
+                members.append(index)
+                remap[index] = p
+                break
+        else:
+            remap[index] = len(seeds)
+            seeds.append((key, values if mergeable(material) else None, [index]))
+
+    for _, seed, members in seeds:
+        material = json.loads(json.dumps(materials[members[0]]))
+        if seed is not None:
+            values = [uniforms(materials[i]) for i in members]
+            mean = {k: np.mean([v[k] for v in values], axis=0) for k in values[0]}
+            write_uniforms(material, mean)
+            if len(members) > 1:
+                material["name"] = palette_name([materials[i].get("name", "") for i in members])
+        palette.append(material)
+    return palette, remap
+
+
+def static_nodes(gltf):
+    """Node index -> world matrix for mesh nodes whose geometry can be baked."""
+    nodes = gltf.get("nodes", [])
+    users = {}
+    for node in nodes:
+        if "mesh" in node:
+            users[node["mesh"]] = users.get(node["mesh"], 0) + 1
+    if gltf.get("animations") or gltf.get("skins"):
+        return {}
+    found = {}
+
+    def visit(index, parent):
+        node = nodes[index]
+        world = parent @ node_matrix(node)
+        if "mesh" in node and users[node["mesh"]] == 1 and "EXT_mesh_gpu_instancing" not in node.get("extensions", {}):
+            found[index] = world
+        for child in node.get("children", []):
+            visit(child, world)
+
+    for root in gltf["scenes"][gltf.get("scene", 0)]["nodes"]:
+        visit(root, np.eye(4))
+    return found
+
+
+def primitive_key(gltf, primitive):
+    if primitive.get("mode", MODE_TRIANGLES) != MODE_TRIANGLES or "targets" in primitive or primitive.get("extensions"):
+        return None
+    accessors = gltf["accessors"]
+    attributes = sorted(
+        (name, accessors[i]["type"], accessors[i]["componentType"], accessors[i].get("normalized", False))
+        for name, i in primitive["attributes"].items()
+    )
+    if any(name.startswith(("JOINTS_", "WEIGHTS_")) for name, *_ in attributes):
+        return None
+    return json.dumps([primitive.get("material"), attributes])
+
+
+def baked_attributes(gltf, binary, primitive, world):
+    """Attributes in the merged node's space, plus triangles wound for it."""
+    linear = world[:3, :3]
+    normal_matrix = np.linalg.inv(linear).T
+    mirrored = np.linalg.det(linear) < 0
+    out = {}
+    for name, index in primitive["attributes"].items():
+        if name == "POSITION":
+            out[name] = read_floats(gltf, binary, index) @ linear.T + world[:3, 3]
+        elif name == "NORMAL":
+            normals = read_floats(gltf, binary, index) @ normal_matrix.T
+            out[name] = normals / np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-12)
+        elif name == "TANGENT":
+            tangents = read_floats(gltf, binary, index)
+            xyz = tangents[:, :3] @ linear.T
+            xyz /= np.maximum(np.linalg.norm(xyz, axis=1, keepdims=True), 1e-12)
+            out[name] = np.hstack([xyz, tangents[:, 3:] * (-1 if mirrored else 1)])
+        else:
+            out[name] = read_accessor(gltf, binary, index)
+    count = len(out["POSITION"])
+    if "indices" in primitive:
+        triangles = read_accessor(gltf, binary, primitive["indices"]).reshape(-1, 3).astype(np.int64)
+    else:
+        triangles = np.arange(count).reshape(-1, 3)
+    if mirrored:
+        triangles = triangles[:, ::-1]
+    return out, triangles
+
+
+def add_accessor(gltf, writer, array, template, target=ARRAY_BUFFER):
+    accessor = {key: template[key] for key in ("componentType", "type", "normalized") if key in template}
+    accessor.update(bufferView=writer.add_view(np.ascontiguousarray(array).tobytes(), target=target), count=len(array))
+    gltf["accessors"].append(accessor)
+    return len(gltf["accessors"]) - 1
+
+
+def merge_primitives(gltf, binary):
+    """Merge same-material primitives of static single-user meshes; returns (gltf, binary, merged groups)."""
+    meshes = gltf.get("meshes", [])
+    nodes = gltf.get("nodes", [])
+    groups = {}
+    for node_index, world in static_nodes(gltf).items():
+        for p, primitive in enumerate(meshes[nodes[node_index]["mesh"]]["primitives"]):
+            key = primitive_key(gltf, primitive)
+            if key is not None:
+                groups.setdefault(key, []).append((node_index, p, world))
+    groups = [members for members in groups.values() if len(members) > 1]
+    if not groups:
+        return gltf, binary, 0
+
+    writer = BinWriter(gltf, binary)
+    removed = set()
+    scene = gltf["scenes"][gltf.get("scene", 0)]
+    for members in groups:
+        first = meshes[nodes[members[0][0]]["mesh"]]["primitives"][members[0][1]]
+        parts = [baked_attributes(gltf, binary, meshes[nodes[n]["mesh"]]["primitives"][p], world)
+                 for n, p, world in members]
+        attributes = {}
+        for name, index in first["attributes"].items():
+            template = gltf["accessors"][index]
+            data = np.concatenate([a[name] for a, _ in parts])
+            if name in ("POSITION", "NORMAL", "TANGENT"):
+                data = data.astype("<f4")
+                template = {"componentType": FLOAT, "type": template["type"]}
+            attributes[name] = add_accessor(gltf, writer, data, template)
+            if name == "POSITION":
+                gltf["accessors"][-1].update(min=data.min(axis=0).tolist(), max=data.max(axis=0).tolist())
+        offsets = np.cumsum([0] + [len(a["POSITION"]) for a, _ in parts[:-1]])
+        triangles = np.concatenate([t + o for (_, t), o in zip(parts, offsets)]).ravel()
+        wide = offsets[-1] + len(parts[-1][0]["POSITION"]) >= 65535
+        indices = triangles.astype("<u4" if wide else "<u2")
+        primitive = {"attributes": attributes, "indices": add_accessor(
+            gltf, writer, indices, {"componentType": UNSIGNED_INT if wide else UNSIGNED_SHORT, "type": "SCALAR"},
+            target=ELEMENT_ARRAY_BUFFER)}
+        if "material" in first:
+            primitive["material"] = first["material"]
+        name = gltf["materials"][first["material"]].get("name", "merged") if "material" in first else "merged"
+        meshes.append({"name": name, "primitives": [primitive]})
+        nodes.append({"name": name, "mesh": len(meshes) - 1})
+        scene["nodes"].append(len(nodes) - 1)
+        removed.update((nodes[n]["mesh"], p) for n, p, _ in members)
+
+    for mesh_index, mesh in enumerate(meshes):
+        mesh["primitives"] = [prim for p, prim in enumerate(mesh["primitives"]) if (mesh_index, p) not in removed]
+    prune(gltf)
+    gltf, binary = compact(gltf, bytes(writer.data))
+    return gltf, binary, len(groups)
+
+
+def prune(gltf):
+    """Drop meshes left without primitives, then the nodes left holding nothing."""
+    mesh_map = {}
+    kept = []
+    for index, mesh in enumerate(gltf["meshes"]):
+        if mesh["primitives"]:
+            mesh_map[index] = len(kept)
+            kept.append(mesh)
+    gltf["meshes"] = kept
+    nodes = gltf["nodes"]
+    emptied = set()
+    for index, node in enumerate(nodes):
+        if "mesh" in node:
+            if node["mesh"] in mesh_map:
+                node["mesh"] = mesh_map[node["mesh"]]
+            else:
+                del node["mesh"]
+                emptied.add(index)
+
+    drop = set()
+
+    def visit(index):
+        node = nodes[index]
+        had_children = bool(node.get("children"))
+        children = [c for c in node.get("children", []) if visit(c)]
+        if children:
+            node["children"] = children
+        else:
+            node.pop("children", None)
+        emptied_here = index in emptied or (had_children and not children)
+        if emptied_here and not any(k in node for k in ("mesh", "camera", "skin", "extensions", "children")):
+            drop.add(index)
+            return False
+        return True
+
+    for scene in gltf.get("scenes", []):
+        scene["nodes"] = [n for n in scene["nodes"] if visit(n)]
+    node_map = {}
+    kept_nodes = []
+    for index, node in enumerate(nodes):
+        if index not in drop:
+            node_map[index] = len(kept_nodes)
+            kept_nodes.append(node)
+    for node in kept_nodes:
+        if "children" in node:
+            node["children"] = [node_map[c] for c in node["children"]]
+    for scene in gltf.get("scenes", []):
+        scene["nodes"] = [node_map[n] for n in scene["nodes"]]
+    gltf["nodes"] = kept_nodes
+
+
+def draw_calls(gltf):
+    """Primitives drawn per mesh node; a GPU-instanced node draws each primitive once."""
+    meshes = gltf.get("meshes", [])
+    return sum(len(meshes[node["mesh"]]["primitives"]) for node in gltf.get("nodes", []) if "mesh" in node)
+
+
+def configurations(gltf):
+    """Distinct shader configurations among the primitives drawn."""
+    materials = gltf.get("materials", [])
+    found = set()
+    for node in gltf.get("nodes", []):
+        if "mesh" not in node:
+            continue
+        for primitive in gltf["meshes"][node["mesh"]]["primitives"]:
+            material = materials[primitive["material"]] if "material" in primitive else None
+            found.add(configuration(material, "COLOR_0" in primitive["attributes"]))
+    return len(found)
+
+
+def consolidate(gltf, binary):
+    """Drop duplicate materials and merge the meshes sharing one; returns (gltf, binary, stats)."""
+    materials = gltf.get("materials", [])
+    stats = {
+        "materials": [len(materials), len(materials)],
+        "configurations": [configurations(gltf)] * 2,
+        "drawCalls": [draw_calls(gltf)] * 2,
+        "merged": 0,
+    }
+    if materials:
+        palette, remap = build_palette(materials)
+        for mesh in gltf.get("meshes", []):
+            for primitive in mesh["primitives"]:
+                if "material" in primitive:
+                    primitive["material"] = remap[primitive["material"]]
+        gltf["materials"] = palette
+        used = set(gltf.get("extensionsUsed", []))
+        if not any(EMISSIVE_STRENGTH in m.get("extensions", {}) for m in palette):
+            used.discard(EMISSIVE_STRENGTH)
+        if used:
+            gltf["extensionsUsed"] = sorted(used)
+        else:
+            gltf.pop("extensionsUsed", None)
+    gltf, binary, stats["merged"] = merge_primitives(gltf, binary)
+    stats["materials"][1] = len(gltf.get("materials", []))
+    stats["configurations"][1] = configurations(gltf)
+    stats["drawCalls"][1] = draw_calls(gltf)
+    return gltf, binary, stats
+
+
+def consolidate_file(path, dry_run=False):
+    before = os.path.getsize(path)
+    gltf, binary = read_glb(path)
+    skipped = [e for e in SKIPPED_EXTENSIONS if e in gltf.get("extensionsUsed", [])]
+    if skipped:
+        return {"bytes": [before, before], "skipped": skipped[0]}
+
+    gltf, binary, stats = consolidate(gltf, binary)
+    data = encode_glb(gltf, binary)
+    if not dry_run:
+        with open(path, "wb") as f:
+            f.write(data)
+    return dict(stats, bytes=[before, len(data)])
+
+
+def print_report(name, stats):
+    before, after = stats["bytes"]
+    if "skipped" in stats:
+        print(f"  {name:<28} {before / 1024:8.0f}KB  skipped ({stats['skipped']})")
+        return
+    (m0, m1), (d0, d1) = stats["materials"], stats["drawCalls"]
+    duplicates = f", {m0 - m1} duplicate material(s) dropped" if m1 < m0 else ""
+    print(f"  {name:<28} {before / 1024:8.0f}KB -> {after / 1024:6.0f}KB  draw calls {d0} -> {d1}{duplicates}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge meshes that share a material, in place.")
+    parser.add_argument("paths", nargs="+", help="uncompressed, unquantized GLB files")
+    parser.add_argument("--dry-run", action="store_true", help="report without rewriting the files")
+    args = parser.parse_args()
+
+    print("=== Merging meshes that share a material ===")
+    for path in args.paths:
+        print_report(path, consolidate_file(path, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
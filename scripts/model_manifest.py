@@ -0,0 +1,246 @@
+"""
+Publish generated GLBs under content-hashed filenames with a manifest.
+
+Every model the generators write to a fixed name (hero-sculpture.glb,
+skills/react.glb, LODs, the atlas) is copied to {stem}.{hash}.glb next to
+it, so the hashed copies can be served with immutable cache headers. Hashed
+copies that no longer match a model are removed. Only the fixed-name models
+and the manifest are committed; `--restore` (npm's predev/prebuild) recreates
+the gitignored hashed copies from them. src/data/model-manifest.json
+maps each fixed name to its hashed URL, byte size, SHA-256, bounding sphere
+and a suggested load priority; HeroScene and src/data/skills.ts resolve
+model URLs through it. The baked hero is only published when
+hero-sculpture.json says it has fewer triangles than the full mesh;
+HeroScene loads it on mobile whenever it is in the manifest.
+
+The generators are deterministic, so an unchanged model keeps its hash.
+Publishing needs NumPy for the bounding spheres; --restore only needs the
+standard library, so `npm run dev`/`build` work without it.
+Run: python scripts/model_manifest.py [--restore]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+
+try:
+    import numpy as np
+except ImportError:  # --restore doesn't read geometry
+    np = None
+
+from gltf_io import read_floats, read_glb
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PUBLIC_DIR = os.path.join(ROOT, "public")
+MODELS_DIR = os.path.join(PUBLIC_DIR, "models")
+MANIFEST_PATH = os.path.join(ROOT, "src", "data", "model-manifest.json")
+
+GENERATED = [
+    "hero-sculpture.glb", "hero-sculpture-baked.glb", "skills/",
+    "robot-expressive/", "robot-expressive/clips/",
+]
+BAKED_HERO = "hero-sculpture-baked.glb"
+HERO_STATS_PATH = os.path.join(MODELS_DIR, "hero-sculpture.json")
+HASH_LENGTH = 12
+HASHED_RE = re.compile(r"\.[0-9a-f]{%d}\.glb$" % HASH_LENGTH)
+
+
+def is_hashed(filename):
+    return HASHED_RE.search(filename) is not None
+
+
+def baked_hero_lighter():
+    """Whether the last hero build gave the baked variant fewer triangles than the full mesh."""
+    if not os.path.exists(HERO_STATS_PATH):
+        return False
+    with open(HERO_STATS_PATH, encoding="utf-8") as f:
+        variants = json.load(f).get("variants", {})
+    baked, full = variants.get("baked"), variants.get("full")
+    return baked is not None and full is not None and baked["triangles"] < full["triangles"]
+
+
+def generated_models():
+    """Fixed-name model paths relative to public/models/."""
+    names = []
+    for entry in GENERATED:
+        if entry == BAKED_HERO and not baked_hero_lighter():
+            # A stale file from an earlier --bake, or a bake that saves no vertex work
+            continue
+        if entry.endswith("/"):
+            directory = os.path.join(MODELS_DIR, entry)
+            if os.path.isdir(directory):
+                names += [entry + f for f in sorted(os.listdir(directory))
+                          if f.endswith(".glb") and not is_hashed(f)]
+        elif os.path.exists(os.path.join(MODELS_DIR, entry)):
+            names.append(entry)
+    return names
+
+
+def priority(name):
+    """Suggested fetch priority: hero above the fold, small LODs before full detail."""
+    if name.startswith("hero-sculpture"):
+        return "high"
+    if name.endswith("atlas.glb") or ".lod" in name:
+        return "auto"
+    return "low"
+
+
+def quaternion_matrix(q):
+    x, y, z, w = q
+    return np.array([
+        [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+        [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+        [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+    ])
+
+
+def trs_matrix(translation=(0, 0, 0), rotation=(0, 0, 0, 1), scale=(1, 1, 1)):
+    m = np.eye(4)
+    m[:3, :3] = quaternion_matrix(rotation) * np.asarray(scale)
+    m[:3, 3] = translation
+    return m
+
+
+def node_matrix(node):
+    if "matrix" in node:
+        return np.asarray(node["matrix"], dtype=np.float64).reshape(4, 4).T
+    return trs_matrix(node.get("translation", (0, 0, 0)), node.get("rotation", (0, 0, 0, 1)),
+                      node.get("scale", (1, 1, 1)))
+
+
+def instance_matrices(gltf, binary, node):
+    ext = node.get("extensions", {}).get("EXT_mesh_gpu_instancing")
+    if not ext:
+        return [np.eye(4)]
+    attributes = ext["attributes"]
+    count = gltf["accessors"][next(iter(attributes.values()))]["count"]
+    t = read_floats(gltf, binary, attributes["TRANSLATION"]) if "TRANSLATION" in attributes else np.zeros((count, 3))
+    r = read_floats(gltf, binary, attributes["ROTATION"]) if "ROTATION" in attributes else np.tile([0, 0, 0, 1], (count, 1))
+    s = read_floats(gltf, binary, attributes["SCALE"]) if "SCALE" in attributes else np.ones((count, 3))
+    return [trs_matrix(t[i], r[i], s[i]) for i in range(count)]
+
+
+def placements(gltf, binary):
+    """(mesh index, world matrix) for every placed mesh in the default scene."""
+    nodes = gltf.get("nodes", [])
+    found = []
+
+    def visit(index, parent):
+        node = nodes[index]
+        world = parent @ node_matrix(node)
+        if "mesh" in node:
+            found.extend((node["mesh"], world @ m) for m in instance_matrices(gltf, binary, node))
+        for child in node.get("children", []):
+            visit(child, world)
+
+    for root in gltf["scenes"][gltf.get("scene", 0)]["nodes"]:
+        visit(root, np.eye(4))
+    return found
+
+
+def world_corners(gltf, binary):
+    """Corners of every mesh's POSITION bounds in world space."""
+    corners = []
+    nodes = gltf.get("nodes", [])
+
+    def visit(index, parent):
+        node = nodes[index]
+        world = parent @ node_matrix(node)
+        if "mesh" in node:
+            for primitive in gltf["meshes"][node["mesh"]]["primitives"]:
+                accessor = gltf["accessors"][primitive["attributes"]["POSITION"]]
+                lo, hi = np.asarray(accessor["min"]), np.asarray(accessor["max"])
+                box = np.array([[x, y, z, 1] for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])])
+                for instance in instance_matrices(gltf, binary, node):
+                    corners.append((box @ (world @ instance).T)[:, :3])
+        for child in node.get("children", []):
+            visit(child, world)
+
+    for root in gltf["scenes"][gltf.get("scene", 0)]["nodes"]:
+        visit(root, np.eye(4))
+    return np.concatenate(corners) if corners else np.zeros((1, 3))
+
+
+def bounding_sphere(gltf, binary):
+    corners = world_corners(gltf, binary)
+    center = (corners.min(axis=0) + corners.max(axis=0)) / 2
+    radius = float(np.linalg.norm(corners - center, axis=1).max())
+    return {"center": [round(float(c), 6) + 0.0 for c in center], "radius": round(radius, 6)}
+
+
+def publish_models():
+    if np is None:
+        raise SystemExit("Publishing models needs NumPy (pip install numpy)")
+    manifest = {}
+    for name in generated_models():
+        path = os.path.join(MODELS_DIR, name)
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        stem = name[:-len(".glb")]
+        hashed = f"{stem}.{digest[:HASH_LENGTH]}.glb"
+        hashed_path = os.path.join(MODELS_DIR, hashed)
+        if not os.path.exists(hashed_path):
+            shutil.copyfile(path, hashed_path)
+
+        gltf, binary = read_glb(path)
+        manifest[name] = {
+            "url": f"/models/{hashed}",
+            "bytes": len(data),
+            "sha256": digest,
+            "boundingSphere": bounding_sphere(gltf, binary),
+            "priority": priority(name),
+            "dracoDecoderPath": "/draco/" if "KHR_draco_mesh_compression" in gltf.get("extensionsUsed", []) else None,
+        }
+
+    # Drop hashed copies that no longer back a manifest entry
+    published = {entry["url"] for entry in manifest.values()}
+    for directory in {os.path.dirname(os.path.join(MODELS_DIR, name)) for name in manifest}:
+        for f in os.listdir(directory):
+            path = os.path.join(directory, f)
+            if is_hashed(f) and "/" + os.path.relpath(path, PUBLIC_DIR).replace(os.sep, "/") not in published:
+                os.remove(path)
+
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"  Published {len(manifest)} model(s) to {os.path.relpath(MANIFEST_PATH, ROOT)}")
+    return manifest
+
+
+def restore_hashed():
+    """Recreate the hashed copies the committed manifest points at."""
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        manifest = json.load(f)
+    restored = 0
+    for name, entry in sorted(manifest.items()):
+        path = os.path.join(MODELS_DIR, name)
+        hashed_path = os.path.join(PUBLIC_DIR, entry["url"].lstrip("/"))
+        if os.path.exists(hashed_path):
+            continue
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if digest != entry["sha256"]:
+            raise SystemExit(f"models/{name} changed since {os.path.relpath(MANIFEST_PATH, ROOT)} was written; "
+                             "run python scripts/model_manifest.py")
+        shutil.copyfile(path, hashed_path)
+        restored += 1
+    print(f"  Restored {restored} hashed model(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish content-hashed copies of the generated models.")
+    parser.add_argument("--restore", action="store_true",
+                        help="only recreate the hashed copies listed in the committed manifest")
+    args = parser.parse_args()
+    if args.restore:
+        restore_hashed()
+    else:
+        publish_models()
+
+
+if __name__ == "__main__":
+    main()
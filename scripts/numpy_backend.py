@@ -0,0 +1,499 @@
+"""
+Blender-free geometry backend for generate-skill-models.py.
+
+Implements the same helper surface the builders use (add_uv_sphere,
+add_cube, add_subsurf, apply_mat, instance_copies, write_glb, ...) with
+vectorized NumPy and writes glTF directly through gltf_io. Modifiers are
+evaluated at export like Blender does:
+
+  * subsurf on spheres, tori and round cylinders raises their tessellation
+    by 2**levels; on cubes and cylinders without a bevel it rounds the
+    edges, which is what Catmull-Clark does to those cages
+  * bevel rounds box edges and cylinder rims with an arc of `segments`
+
+So the shapes match the Blender output closely but not vertex for vertex.
+Text badges need Blender's font outlines and raise BackendUnsupported.
+Coordinates are Blender's Z-up and are converted to glTF's Y-up on export.
+"""
+
+import math
+
+import numpy as np
+
+from gltf_io import encode_glb
+
+__all__ = [
+    "clear_scene", "pbr_material", "apply_mat", "smooth_shade", "add_subsurf", "add_bevel",
+    "add_uv_sphere", "add_torus", "add_cylinder", "add_cube", "apply_scale", "add_text",
+    "instance_copies", "scene_meshes", "triangle_count", "draw_call_stats", "write_glb",
+]
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+FLOAT = 5126
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+
+# Set by generate-skill-models.py when it switches to this backend
+OPTIONS = {"gpu_instances": True, "max_subsurf": None}
+
+SCENE = []
+
+
+class BackendUnsupported(RuntimeError):
+    pass
+
+
+class Material:
+    def __init__(self, name, color, metallic, roughness, emission, emission_strength):
+        self.name = name
+        self.color = color
+        self.metallic = metallic
+        self.roughness = roughness
+        self.emission = emission
+        self.emission_strength = emission_strength
+
+
+class MeshObject:
+    """A primitive plus the modifiers and transform Blender would hold."""
+
+    def __init__(self, name, kind, params, location, rotation=(0, 0, 0)):
+        self.name = name
+        self.kind = kind
+        self.params = params
+        self.location = tuple(location)
+        self.rotation = tuple(rotation)
+        self.baked_scale = np.ones(3)
+        self.subsurf = 0
+        self.bevel = None
+        self.material = None
+        self._geometry = None
+
+    def geometry(self):
+        if self._geometry is None:
+            positions, triangles = build_shape(self)
+            positions = positions * self.baked_scale
+            positions, triangles = weld(positions, triangles)
+            self._geometry = (positions, triangles, smooth_normals(positions, triangles))
+        return self._geometry
+
+
+class InstanceGroup:
+    def __init__(self, name, proto, transforms):
+        self.name = name
+        self.proto = proto
+        self.transforms = transforms
+
+
+def hex_rgb(value):
+    return (((value >> 16) & 0xFF) / 255.0, ((value >> 8) & 0xFF) / 255.0, (value & 0xFF) / 255.0)
+
+
+# ── Builder helpers (same signatures as the Blender ones) ──────────────────
+
+def clear_scene():
+    SCENE.clear()
+
+
+def pbr_material(name, hex_color, metallic=0.4, roughness=0.3, emission_hex=None, emission_strength=0.0):
+    emission = hex_rgb(emission_hex) if emission_hex and emission_strength > 0 else None
+    return Material(name, hex_rgb(hex_color), metallic, roughness, emission, emission_strength)
+
+
+def apply_mat(obj, mat):
+    obj.material = mat
+
+
+def smooth_shade(obj):
+    # Normals are always smooth in this backend
+    pass
+
+
+def add_subsurf(obj, levels=2):
+    if OPTIONS["max_subsurf"] is not None:
+        levels = min(levels, OPTIONS["max_subsurf"])
+    obj.subsurf = levels
+
+
+def add_bevel(obj, width=0.02, segments=3):
+    obj.bevel = (width, segments)
+
+
+def _add(kind, params, location, rotation=(0, 0, 0)):
+    obj = MeshObject(f"{kind}.{len(SCENE):03d}", kind, params, location, rotation)
+    SCENE.append(obj)
+    return obj
+
+
+def add_uv_sphere(radius, location, segments=32, ring_count=16):
+    return _add("sphere", {"radius": radius, "segments": segments, "rings": ring_count}, location)
+
+
+def add_torus(major_radius, minor_radius, location, major_segments=48, minor_segments=12, rotation=(0, 0, 0)):
+    params = {"major": major_radius, "minor": minor_radius, "segments": major_segments, "sides": minor_segments}
+    return _add("torus", params, location, rotation)
+
+
+def add_cylinder(radius, depth, location, vertices=32):
+    return _add("cylinder", {"radius": radius, "depth": depth, "vertices": vertices}, location)
+
+
+def add_cube(size, location):
+    return _add("cube", {"size": size}, location)
+
+
+def apply_scale(obj, scale):
+    obj.baked_scale = obj.baked_scale * np.asarray(scale, dtype=np.float64)
+
+
+def add_text(body, location, size, extrude, bevel_depth):
+    raise BackendUnsupported(f"text badge {body!r} needs Blender's font outlines; build this model with Blender")
+
+
+def instance_copies(proto, name, transforms):
+    SCENE.remove(proto)
+    group = InstanceGroup(name, proto, [tuple(t) for t in transforms])
+    SCENE.append(group)
+    return group
+
+
+def scene_meshes():
+    return [obj for obj in SCENE if isinstance(obj, MeshObject)]
+
+
+def triangle_count():
+    total = 0
+    for item in SCENE:
+        if isinstance(item, InstanceGroup):
+            total += len(item.proto.geometry()[1]) * len(item.transforms)
+        else:
+            total += len(item.geometry()[1])
+    return total
+
+
+def draw_call_stats():
+    stats = {"before": {"drawCalls": 0, "triangles": 0}, "after": {"drawCalls": 0, "triangles": 0}}
+    for item in SCENE:
+        if isinstance(item, InstanceGroup):
+            triangles = len(item.proto.geometry()[1])
+            copies = len(item.transforms)
+            stats["before"]["drawCalls"] += copies
+            stats["before"]["triangles"] += triangles * copies
+            after_calls = 1 if OPTIONS["gpu_instances"] else copies
+            stats["after"]["drawCalls"] += after_calls
+            stats["after"]["triangles"] += triangles * after_calls
+        else:
+            triangles = len(item.geometry()[1])
+            for key in ("before", "after"):
+                stats[key]["drawCalls"] += 1
+                stats[key]["triangles"] += triangles
+    return stats
+
+
+# ── Geometry ───────────────────────────────────────────────────────────────
+
+def revolve(profile, segments, closed=False):
+    """Sweep a (radius, z) profile around Z.
+
+    Profile points with radius 0 become single pole vertices. A closed
+    profile (the torus cross-section) wraps back to its first point.
+    """
+    profile = np.asarray(profile, dtype=np.float64)
+    angles = np.arange(segments) * (2 * math.pi / segments)
+    cos, sin = np.cos(angles), np.sin(angles)
+    positions = []
+    rings = []
+    for rho, z in profile:
+        start = sum(len(r) for r in rings)
+        if rho == 0:
+            positions.append([[0.0, 0.0, z]])
+            rings.append([start])
+        else:
+            positions.append(np.stack([rho * cos, rho * sin, np.full(segments, z)], axis=1))
+            rings.append(list(range(start, start + segments)))
+    positions = np.concatenate(positions)
+
+    triangles = []
+    pairs = list(zip(rings, rings[1:]))
+    if closed:
+        pairs.append((rings[-1], rings[0]))
+    for a, b in pairs:
+        for j in range(segments):
+            k = (j + 1) % segments
+            if len(a) == 1:
+                triangles.append((a[0], b[k], b[j]))
+            elif len(b) == 1:
+                triangles.append((a[j], a[k], b[0]))
+            else:
+                triangles.append((a[j], b[k], b[j]))
+                triangles.append((a[j], a[k], b[k]))
+    return positions, np.asarray(triangles, dtype=np.int64)
+
+
+def rounded_profile(radius, half_height, round_radius, arc_steps):
+    """Cylinder cross-section from the bottom center to the top center."""
+    r = min(round_radius, radius, half_height)
+    if r <= 0:
+        return [(0, -half_height), (radius, -half_height), (radius, half_height), (0, half_height)]
+    profile = [(0, -half_height)]
+    for t in np.linspace(-math.pi / 2, 0, arc_steps + 1):
+        profile.append((radius - r + r * math.cos(t), -half_height + r + r * math.sin(t)))
+    for t in np.linspace(0, math.pi / 2, arc_steps + 1):
+        profile.append((radius - r + r * math.cos(t), half_height - r + r * math.sin(t)))
+    profile.append((0, half_height))
+    return profile
+
+
+def rounded_box(half, round_radius, arc_steps):
+    """Box with edges rounded by round_radius, built face by face."""
+    half = np.asarray(half, dtype=np.float64)
+    r = min(round_radius, *half)
+
+    def axis(h):
+        if r <= 0:
+            return np.array([-h, h])
+        band = np.linspace(h - r, h, arc_steps + 1)
+        return np.concatenate([-band[::-1], band])
+
+    coords = [axis(h) for h in half]
+    positions = []
+    triangles = []
+    for normal_axis in range(3):
+        u_axis, v_axis = [a for a in range(3) if a != normal_axis]
+        us, vs = coords[u_axis], coords[v_axis]
+        for sign in (-1.0, 1.0):
+            uu, vv = np.meshgrid(us, vs, indexing="ij")
+            face = np.zeros(uu.shape + (3,))
+            face[..., u_axis] = uu
+            face[..., v_axis] = vv
+            face[..., normal_axis] = sign * half[normal_axis]
+            base = sum(len(p) for p in positions)
+            positions.append(face.reshape(-1, 3))
+            nu, nv = uu.shape
+            idx = base + np.arange(nu * nv).reshape(nu, nv)
+            a, b, c, d = idx[:-1, :-1], idx[1:, :-1], idx[1:, 1:], idx[:-1, 1:]
+            quads = np.stack([a, b, c, a, c, d], axis=-1).reshape(-1, 3)
+            # Keep counter-clockwise winding seen from outside
+            flip = (sign < 0) != ((v_axis - u_axis) % 3 == 2)
+            triangles.append(quads[:, ::-1] if flip else quads)
+    positions = np.concatenate(positions)
+    if r > 0:
+        # Push every point out from the shrunken box by r: flat faces stay
+        # flat, the edge bands become quarter circles.
+        inner = np.clip(positions, -(half - r), half - r)
+        offset = positions - inner
+        length = np.linalg.norm(offset, axis=1, keepdims=True)
+        positions = inner + offset / np.maximum(length, 1e-12) * r
+    return positions, np.concatenate(triangles)
+
+
+def build_shape(obj):
+    p = obj.params
+    levels = obj.subsurf
+    width, segments = obj.bevel if obj.bevel else (0.0, 0)
+    if obj.kind == "sphere":
+        rings = p["rings"] * 2 ** levels
+        theta = np.linspace(math.pi, 0, rings + 1)
+        profile = np.stack([p["radius"] * np.sin(theta), p["radius"] * np.cos(theta)], axis=1)
+        profile[0, 0] = profile[-1, 0] = 0
+        return revolve(profile, p["segments"] * 2 ** levels)
+    if obj.kind == "torus":
+        sides = p["sides"] * 2 ** levels
+        v = np.arange(sides) * (2 * math.pi / sides)
+        profile = np.stack([p["major"] + p["minor"] * np.cos(v), p["minor"] * np.sin(v)], axis=1)
+        return revolve(profile, p["segments"] * 2 ** levels, closed=True)
+    if obj.kind == "cylinder":
+        half = p["depth"] / 2
+        round_radius = width if width else (0.3 * min(p["radius"], half) if levels else 0.0)
+        steps = max(segments, 2) + 2 * levels
+        vertices = p["vertices"]
+        if levels and vertices >= 12:
+            vertices *= 2 ** levels
+        return revolve(rounded_profile(p["radius"], half, round_radius, steps), vertices)
+    if obj.kind == "cube":
+        half = np.full(3, p["size"] / 2) * obj.baked_scale
+        round_radius = width if width else (0.3 * half.min() if levels else 0.0)
+        positions, triangles = rounded_box(half, round_radius, max(segments, 2) + 2 * levels)
+        # Scale is already in the half extents
+        return positions / obj.baked_scale, triangles
+    raise BackendUnsupported(obj.kind)
+
+
+def weld(positions, triangles, precision=1e-6):
+    """Merge coincident vertices so normals are smoothed across seams."""
+    keys = np.round(positions / precision).astype(np.int64)
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    triangles = inverse[triangles]
+    # Drop triangles collapsed by welding (pole fans, zero-width bands)
+    keep = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+    return positions[first], triangles[keep]
+
+
+def smooth_normals(positions, triangles):
+    a, b, c = (positions[triangles[:, i]] for i in range(3))
+    face = np.cross(b - a, c - a)  # area weighted
+    normals = np.zeros_like(positions)
+    for i in range(3):
+        np.add.at(normals, triangles[:, i], face)
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    return normals / np.maximum(length, 1e-12)
+
+
+# ── glTF export ────────────────────────────────────────────────────────────
+
+def to_yup(v):
+    """Blender Z-up to glTF Y-up, as the Blender exporter does."""
+    v = np.asarray(v, dtype=np.float64)
+    return np.stack([v[..., 0], v[..., 2], -v[..., 1]], axis=-1)
+
+
+def euler_quaternion(rotation):
+    """Blender XYZ Euler to a glTF (x, y, z, w) quaternion in Y-up space."""
+    hx, hy, hz = (a / 2 for a in rotation)
+    cx, sx = math.cos(hx), math.sin(hx)
+    cy, sy = math.cos(hy), math.sin(hy)
+    cz, sz = math.cos(hz), math.sin(hz)
+    w = cz * cy * cx + sz * sy * sx
+    x = cz * cy * sx - sz * sy * cx
+    y = cz * sy * cx + sz * cy * sx
+    z = sz * cy * cx - cz * sy * sx
+    return [x, z, -y, w]
+
+
+def trs(location, rotation, scale):
+    node = {}
+    if any(location):
+        node["translation"] = to_yup(location).tolist()
+    if any(rotation):
+        node["rotation"] = euler_quaternion(rotation)
+    if tuple(scale) != (1, 1, 1):
+        node["scale"] = [scale[0], scale[2], scale[1]]
+    return node
+
+
+class GltfWriter:
+    def __init__(self):
+        self.gltf = {
+            "asset": {"generator": "portfolio numpy_backend", "version": "2.0"},
+            "scene": 0,
+            "scenes": [{"nodes": []}],
+            "nodes": [],
+            "meshes": [],
+            "materials": [],
+            "accessors": [],
+            "bufferViews": [],
+            "buffers": [{"byteLength": 0}],
+        }
+        self.binary = bytearray()
+        self.materials = {}
+        self.extensions = set()
+
+    def view(self, payload, target=None):
+        self.binary.extend(b"\x00" * (-len(self.binary) % 4))
+        view = {"buffer": 0, "byteOffset": len(self.binary), "byteLength": len(payload)}
+        if target is not None:
+            view["target"] = target
+        self.binary.extend(payload)
+        self.gltf["bufferViews"].append(view)
+        return len(self.gltf["bufferViews"]) - 1
+
+    def accessor(self, array, component_type, kind, target=None, bounds=False):
+        accessor = {
+            "bufferView": self.view(array.tobytes(), target),
+            "componentType": component_type,
+            "count": len(array),
+            "type": kind,
+        }
+        if bounds:
+            accessor["min"] = array.min(axis=0).tolist()
+            accessor["max"] = array.max(axis=0).tolist()
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+    def material(self, mat):
+        if mat is None:
+            return None
+        if id(mat) not in self.materials:
+            entry = {
+                "name": mat.name,
+                "pbrMetallicRoughness": {
+                    "baseColorFactor": list(mat.color) + [1.0],
+                    "metallicFactor": mat.metallic,
+                    "roughnessFactor": mat.roughness,
+                },
+            }
+            if mat.emission:
+                factor = [c * mat.emission_strength for c in mat.emission]
+                if max(factor) > 1:
+                    entry["emissiveFactor"] = list(mat.emission)
+                    entry["extensions"] = {"KHR_materials_emissive_strength": {"emissiveStrength": mat.emission_strength}}
+                    self.extensions.add("KHR_materials_emissive_strength")
+                else:
+                    entry["emissiveFactor"] = factor
+            self.gltf["materials"].append(entry)
+            self.materials[id(mat)] = len(self.gltf["materials"]) - 1
+        return self.materials[id(mat)]
+
+    def mesh(self, obj):
+        positions, triangles, normals = obj.geometry()
+        index_type = (np.uint16, UNSIGNED_SHORT) if len(positions) < 65536 else (np.uint32, UNSIGNED_INT)
+        primitive = {
+            "attributes": {
+                "POSITION": self.accessor(to_yup(positions).astype(np.float32), FLOAT, "VEC3", ARRAY_BUFFER, bounds=True),
+                "NORMAL": self.accessor(to_yup(normals).astype(np.float32), FLOAT, "VEC3", ARRAY_BUFFER),
+            },
+            "indices": self.accessor(
+                triangles.reshape(-1).astype(index_type[0]), index_type[1], "SCALAR", ELEMENT_ARRAY_BUFFER),
+        }
+        material = self.material(obj.material)
+        if material is not None:
+            primitive["material"] = material
+        self.gltf["meshes"].append({"name": obj.name, "primitives": [primitive]})
+        return len(self.gltf["meshes"]) - 1
+
+    def node(self, node):
+        self.gltf["nodes"].append(node)
+        return len(self.gltf["nodes"]) - 1
+
+    def add(self, item):
+        if isinstance(item, MeshObject):
+            node = {"name": item.name, "mesh": self.mesh(item)}
+            node.update(trs(item.location, item.rotation, (1, 1, 1)))
+            return self.node(node)
+
+        mesh = self.mesh(item.proto)
+        if OPTIONS["gpu_instances"]:
+            translations = to_yup([t[0] for t in item.transforms]).astype(np.float32)
+            rotations = np.asarray([euler_quaternion(t[1]) for t in item.transforms], dtype=np.float32)
+            scales = np.asarray([[s[0], s[2], s[1]] for _, _, s in item.transforms], dtype=np.float32)
+            self.extensions.add("EXT_mesh_gpu_instancing")
+            return self.node({
+                "name": item.name,
+                "mesh": mesh,
+                "extensions": {"EXT_mesh_gpu_instancing": {"attributes": {
+                    "TRANSLATION": self.accessor(translations, FLOAT, "VEC3"),
+                    "ROTATION": self.accessor(rotations, FLOAT, "VEC4"),
+                    "SCALE": self.accessor(scales, FLOAT, "VEC3"),
+                }}},
+            })
+        children = []
+        for i, (location, rotation, scale) in enumerate(item.transforms):
+            node = {"name": f"{item.name}.{i:03d}", "mesh": mesh}
+            node.update(trs(location, rotation, scale))
+            children.append(self.node(node))
+        return self.node({"name": item.name, "children": children})
+
+    def encode(self):
+        for item in SCENE:
+            self.gltf["scenes"][0]["nodes"].append(self.add(item))
+        if self.extensions:
+            self.gltf["extensionsUsed"] = sorted(self.extensions)
+        return encode_glb(self.gltf, bytes(self.binary))
+
+
+def write_glb(filepath):
+    data = GltfWriter().encode()
+    with open(filepath, "wb") as f:
+        f.write(data)
+    return len(data)
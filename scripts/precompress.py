@@ -0,0 +1,197 @@
+"""
+Write precompressed .br and .gz siblings for the static assets under public/.
+
+Every file with a COMPRESSIBLE extension and at least MIN_BYTES gets a
+Brotli (quality 11, 16MB window) and a gzip (level 9) variant next to it,
+e.g. data/world-110m.geojson.br, so they can be served without compressing
+per request. npm's prebuild runs this with --json .cache/precompressed.json,
+and next.config.ts turns that report into a rewrite to the variant (plus
+Content-Encoding, Content-Type and Vary headers) for each asset that has
+one. A
+variant is only kept when it is at most MAX_RATIO of the original; Draco
+and quantized GLBs often don't compress further.
+
+Variants carry their original's mtime. One whose original changed, went
+away or no longer compresses well enough is rewritten or removed, so run
+this after the generators (build-models.py does for public/models/).
+Brotli needs the brotli (or brotlicffi) package from
+scripts/requirements.txt; without it only gzip variants are written, with
+a warning. gzip output has no timestamp, so it is reproducible.
+Run: python scripts/precompress.py [paths or dirs...] [--force] [--json report.json]
+"""
+
+import argparse
+import gzip
+import json
+import os
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PUBLIC_DIR = os.path.join(ROOT, "public")
+
+COMPRESSIBLE = {".glb", ".gltf", ".bin", ".geojson", ".json", ".js", ".mjs", ".wasm", ".svg", ".css", ".txt", ".xml"}
+MIN_BYTES = 1024
+# A variant has to save at least 5% to be worth a Content-Encoding
+MAX_RATIO = 0.95
+BROTLI_WINDOW = 24
+
+
+def brotli_compress(data):
+    return brotli.compress(data, quality=11, lgwin=BROTLI_WINDOW)
+
+
+def gzip_compress(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def encoders():
+    found = {}
+    if brotli is not None:
+        found[".br"] = brotli_compress
+    found[".gz"] = gzip_compress
+    return found
+
+
+def find_assets(paths):
+    found = []
+    for path in paths:
+        if os.path.isfile(path):
+            found.append(path)
+            continue
+        for dirpath, _, filenames in os.walk(path):
+            found.extend(os.path.join(dirpath, f) for f in filenames)
+    return sorted(found)
+
+
+def is_variant(path):
+    return path.endswith((".br", ".gz"))
+
+
+def compressible(path):
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE and os.path.getsize(path) >= MIN_BYTES
+
+
+def fresh(variant, mtime):
+    return os.path.exists(variant) and os.stat(variant).st_mtime_ns == mtime
+
+
+def write_variant(path, data, original):
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    stat = os.stat(original)
+    os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(tmp, path)
+
+
+def compress_asset(path, codecs, force=False):
+    """{suffix: variant bytes or None when skipped} for one asset, writing the variants kept."""
+    size = os.path.getsize(path)
+    mtime = os.stat(path).st_mtime_ns
+    data = None
+    result = {}
+    for suffix, encode in codecs.items():
+        variant = path + suffix
+        if not force and fresh(variant, mtime):
+            result[suffix] = os.path.getsize(variant)
+            continue
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        packed = encode(data)
+        if len(packed) <= size * MAX_RATIO:
+            write_variant(variant, packed, path)
+            result[suffix] = len(packed)
+        else:
+            if os.path.exists(variant):
+                os.remove(variant)
+            result[suffix] = None
+    return result
+
+
+def remove_orphans(files, codecs):
+    """Delete variants whose original is gone or no longer compressible.
+
+    A variant from a codec that isn't installed here is kept while it still
+    matches its original, so a gzip-only run doesn't drop Brotli output.
+    """
+    removed = []
+    originals = set(files)
+    for path in files:
+        if not is_variant(path):
+            continue
+        original, suffix = os.path.splitext(path)
+        if original in originals and compressible(original):
+            if suffix in codecs or fresh(path, os.stat(original).st_mtime_ns):
+                continue
+        os.remove(path)
+        removed.append(path)
+    return removed
+
+
+def precompress(paths=(PUBLIC_DIR,), force=False):
+    codecs = encoders()
+    files = find_assets(paths)
+    removed = remove_orphans(files, codecs)
+    report = {}
+    for path in files:
+        if is_variant(path) or path in removed or not compressible(path):
+            continue
+        report[os.path.relpath(path, PUBLIC_DIR)] = {"bytes": os.path.getsize(path),
+                                                     **compress_asset(path, codecs, force)}
+    return report, removed
+
+
+def print_report(report, removed):
+    print(f"  {'asset':<56} {'bytes':>10} {'gzip':>14} {'brotli':>14}")
+    totals = {"bytes": 0, ".gz": 0, ".br": 0}
+    for name, entry in sorted(report.items()):
+        cells = []
+        for suffix in (".gz", ".br"):
+            size = entry.get(suffix)
+            if suffix not in entry:
+                cells.append(f"{'-':>14}")
+            elif size is None:
+                cells.append(f"{'skipped':>14}")
+            else:
+                cells.append(f"{size:>8} {size / entry['bytes']:5.0%}")
+            # What a client accepting the encoding actually downloads
+            totals[suffix] += entry["bytes"] if size is None else size
+        totals["bytes"] += entry["bytes"]
+        print(f"  {name:<56} {entry['bytes']:>10} {cells[0]} {cells[1]}")
+    total = totals["bytes"] or 1
+    print(f"  {'total':<56} {totals['bytes']:>10} {totals['.gz']:>8} {totals['.gz'] / total:5.0%} "
+          + (f"{totals['.br']:>8} {totals['.br'] / total:5.0%}" if brotli is not None else f"{'-':>14}"))
+    for path in removed:
+        print(f"  Removed stale {os.path.relpath(path, PUBLIC_DIR)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write .br/.gz siblings for compressible assets under public/.")
+    parser.add_argument("paths", nargs="*", default=[PUBLIC_DIR], help="files or directories (default: public/)")
+    parser.add_argument("--force", action="store_true", help="recompress even when a variant is up to date")
+    parser.add_argument("--json", dest="json_path", help="write the size report as JSON to this path")
+    args = parser.parse_args()
+
+    codecs = ", ".join(("brotli", "gzip") if brotli is not None else ("gzip",))
+    print(f"=== Precompressing assets ({codecs}) ===")
+    if brotli is None:
+        print("  brotli not installed (pip install brotli); writing gzip variants only")
+    report, removed = precompress(args.paths, args.force)
+    print_report(report, removed)
+    if args.json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_path)), exist_ok=True)
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
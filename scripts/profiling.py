@@ -0,0 +1,288 @@
+"""
+Stage timing, operator counts and peak memory for the model generators.
+
+A Profiler times named stages as nested spans. Generators wrap their
+helpers with instrument() and run each builder under model(); with
+count_operators() every bpy.ops call is counted against the model and the
+stage it ran in. Peak resident memory is sampled after each model.
+
+write() saves two files:
+  - report.json: per-model totals, per-stage seconds and calls, operator
+    counts, peak memory, plus a traceEvents list that chrome://tracing,
+    Perfetto and speedscope open as a flame chart.
+  - report.folded: collapsed stacks with self time in microseconds, the
+    input format of flamegraph.pl and speedscope.
+
+The CLI prints a report, and with --baseline flags every model or stage
+that got slower by more than --threshold.
+Run: python scripts/profiling.py report.json [--baseline old.json] [--threshold 0.2]
+"""
+
+import argparse
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_VERSION = 1
+# Stages shorter than this are left out of the flame chart (still counted)
+MIN_TRACE_SECONDS = 50e-6
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def process_age():
+    """Seconds since this process started, or None where /proc is missing.
+
+    Called first thing in a Blender script this is Blender's startup time.
+    """
+    try:
+        with open("/proc/self/stat", encoding="utf-8") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime", encoding="utf-8") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return None
+    return max(0.0, uptime - start_ticks / os.sysconf("SC_CLK_TCK"))
+
+
+class Profiler:
+    def __init__(self, generator):
+        self.generator = generator
+        self.startup = process_age()
+        self.origin = time.perf_counter()
+        self.stack = []
+        self.events = []
+        self.folded = {}
+        self.models = {}
+        self.operator_target = None
+
+    @contextmanager
+    def stage(self, name):
+        # Each frame: [name, start, seconds spent in child stages]
+        frame = [name, time.perf_counter(), 0.0]
+        self.stack.append(frame)
+        try:
+            yield
+        finally:
+            self.stack.pop()
+            seconds = time.perf_counter() - frame[1]
+            if self.stack:
+                self.stack[-1][2] += seconds
+            self.record(frame, seconds)
+
+    def record(self, frame, seconds):
+        path = [f[0] for f in self.stack] + [frame[0]]
+        key = ";".join(path)
+        self.folded[key] = self.folded.get(key, 0) + max(0.0, seconds - frame[2])
+        if seconds >= MIN_TRACE_SECONDS:
+            self.events.append({
+                "name": frame[0], "cat": "stage", "ph": "X", "pid": 0, "tid": 0,
+                "ts": round((frame[1] - self.origin) * 1e6, 1), "dur": round(seconds * 1e6, 1),
+            })
+        if len(path) < 2:
+            return
+        # Per-model stage totals; a stage nested in itself counts once
+        stages = self.models.setdefault(path[0], new_model())["stages"]
+        entry = stages.setdefault(frame[0], {"seconds": 0.0, "calls": 0})
+        entry["calls"] += 1
+        if frame[0] not in path[1:-1]:
+            entry["seconds"] += seconds
+
+    @contextmanager
+    def model(self, name):
+        before = peak_rss_kb()
+        start = time.perf_counter()
+        with self.stage(name):
+            yield
+        entry = self.models.setdefault(name, new_model())
+        entry["seconds"] = time.perf_counter() - start
+        entry["peakRssKB"] = peak_rss_kb()
+        if before is not None:
+            entry["rssGrowthKB"] = entry["peakRssKB"] - before
+
+    def wrap(self, fn, name):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            with self.stage(name):
+                return fn(*args, **kwargs)
+        return timed
+
+    def instrument(self, namespace, stages):
+        """Replace namespace[helper] with a timed wrapper for each helper -> stage name."""
+        for helper, name in stages.items():
+            namespace[helper] = self.wrap(namespace[helper], name)
+
+    def count_operators(self, bpy):
+        """Count every bpy.ops call from here on, per model and stage."""
+        self.operator_target = bpy
+        bpy.ops = OperatorCounter(bpy.ops, self)
+
+    def count(self, op):
+        if not self.stack:
+            return
+        model = self.models.setdefault(self.stack[0][0], new_model())
+        model["operators"][op] = model["operators"].get(op, 0) + 1
+        stage = self.stack[-1][0]
+        if len(self.stack) > 1:
+            model["stages"].setdefault(stage, {"seconds": 0.0, "calls": 0})
+            counts = model["stages"][stage].setdefault("operators", {})
+            counts[op] = counts.get(op, 0) + 1
+
+    def report(self, **info):
+        for entry in self.models.values():
+            for stage in entry["stages"].values():
+                stage["seconds"] = round(stage["seconds"], 6)
+            entry["seconds"] = round(entry["seconds"], 6)
+        return {
+            "version": REPORT_VERSION,
+            "generator": self.generator,
+            **info,
+            "startupSeconds": None if self.startup is None else round(self.startup, 3),
+            "totalSeconds": round(time.perf_counter() - self.origin, 6),
+            "peakRssKB": peak_rss_kb(),
+            "models": self.models,
+            "traceEvents": self.events,
+            "folded": {k: round(v * 1e6) for k, v in self.folded.items()},
+        }
+
+    def write(self, path, **info):
+        if self.operator_target is not None:
+            self.operator_target.ops = self.operator_target.ops.target
+            self.operator_target = None
+        write_report(path, self.report(**info))
+
+
+class OperatorCounter:
+    """Stands in for bpy.ops (and its submodules), counting calls by op id."""
+
+    def __init__(self, target, profiler, prefix=""):
+        self.target = target
+        self.profiler = profiler
+        self.prefix = prefix
+
+    def __getattr__(self, name):
+        attr = getattr(self.target, name)
+        if not self.prefix:
+            return OperatorCounter(attr, self.profiler, name)
+        op = f"{self.prefix}.{name}"
+
+        def call(*args, **kwargs):
+            self.profiler.count(op)
+            return attr(*args, **kwargs)
+        return call
+
+
+def new_model():
+    return {"seconds": 0.0, "stages": {}, "operators": {}, "peakRssKB": None}
+
+
+def write_report(path, report):
+    """report.json plus report.folded next to it."""
+    folded = report.pop("folded")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+        f.write("\n")
+    with open(os.path.splitext(path)[0] + ".folded", "w", encoding="utf-8") as f:
+        for stack, micros in sorted(folded.items()):
+            if micros:
+                f.write(f"{stack} {micros}\n")
+
+
+def merge_reports(reports, **info):
+    """One report from several worker reports, one trace process per worker."""
+    merged = {"version": REPORT_VERSION, **info, "workers": {}, "models": {}, "traceEvents": [], "folded": {}}
+    for pid, (worker, report, folded) in enumerate(reports, start=1):
+        merged["workers"][worker] = {
+            k: report.get(k) for k in ("startupSeconds", "totalSeconds", "peakRssKB", "backend", "construction", "blender")
+        }
+        merged["models"].update(report["models"])
+        merged["traceEvents"].append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": worker}})
+        offset = (report.get("startupSeconds") or 0.0) * 1e6
+        if offset:
+            merged["traceEvents"].append({"name": "startup", "cat": "stage", "ph": "X", "pid": pid, "tid": 0,
+                                          "ts": 0, "dur": round(offset, 1)})
+        for event in report["traceEvents"]:
+            merged["traceEvents"].append(dict(event, pid=pid, ts=event["ts"] + offset))
+        merged["folded"][f"{worker};startup"] = round(offset)
+        merged["folded"].update(folded)
+    return merged
+
+
+def read_report(path):
+    """(report, folded stacks) as written by write_report."""
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    folded = {}
+    folded_path = os.path.splitext(path)[0] + ".folded"
+    if os.path.exists(folded_path):
+        with open(folded_path, encoding="utf-8") as f:
+            for line in f:
+                stack, _, micros = line.rstrip("\n").rpartition(" ")
+                folded[stack] = int(micros)
+    return report, folded
+
+
+def change(now, before):
+    if not before:
+        return ""
+    return f"{now / before - 1:+7.0%}"
+
+
+def print_report(report, baseline=None, threshold=0.2):
+    base_models = (baseline or {}).get("models", {})
+    regressions = []
+    for name, model in sorted(report["models"].items()):
+        base = base_models.get(name, {})
+        ops = sum(model["operators"].values())
+        memory = f"{model['peakRssKB'] / 1024:6.0f}MB peak" if model.get("peakRssKB") else ""
+        print(f"  {name:<12} {model['seconds']:7.2f}s {change(model['seconds'], base.get('seconds'))}  "
+              f"{ops:5d} ops  {memory}")
+        if base.get("seconds") and model["seconds"] > base["seconds"] * (1 + threshold) + 0.01:
+            regressions.append(name)
+        stages = sorted(model["stages"].items(), key=lambda item: -item[1]["seconds"])
+        for stage, entry in stages:
+            before = base.get("stages", {}).get(stage, {}).get("seconds")
+            print(f"    {stage:<16} {entry['seconds']:7.3f}s {change(entry['seconds'], before)}  "
+                  f"x{entry['calls']:<5d} {sum(entry.get('operators', {}).values()):5d} ops")
+            # Ignore jitter in stages that take a few milliseconds
+            if before and entry["seconds"] > before * (1 + threshold) + 0.01:
+                regressions.append(f"{name}/{stage}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a generator profile and compare it with a baseline.")
+    parser.add_argument("report", help="report.json written with --profile")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    report, _ = read_report(args.report)
+    baseline = read_report(args.baseline)[0] if args.baseline else None
+    startup = report.get("startupSeconds")
+    print(f"=== {report.get('generator', 'profile')}: {report.get('totalSeconds', 0):.2f}s"
+          + (f", startup {startup:.2f}s" if startup is not None else "") + " ===")
+    for worker, stats in sorted(report.get("workers", {}).items()):
+        if stats.get("startupSeconds") is not None:
+            print(f"  {worker:<12} startup {stats['startupSeconds']:.2f}s")
+    regressions = print_report(report, baseline, args.threshold)
+    if regressions:
+        raise SystemExit(f"Slower than the baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+
+
+if __name__ == "__main__":
+    main()
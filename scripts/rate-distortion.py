@@ -0,0 +1,346 @@
+"""
+Sweep compression and detail settings per model and measure what they cost visually.
+
+Each model is built once at full quality (float attributes, no palette,
+subdivision as authored, no Draco) as the reference, and once per setting
+of every swept axis, each a single change from the reference:
+  - draco     Draco position/normal quantization bits
+  - decimate  collapse-decimation ratio, as the LOD chain applies it
+  - subsurf   maximum subdivision levels
+  - quantize  KHR_mesh_quantization and reordering (glb_optimize.py)
+  - palette   merging meshes that share a material (material_palette.py)
+Every build is rendered on the CPU with turntable.py's rasterizer from VIEWS
+fixed angles around the spin axis, framed like the reference, and compared
+with the reference render: SSIM on luma (11px Gaussian window, Wang et al.
+2004) and PSNR on RGB, over black and at 8 bits. Both only count pixels
+covered in either render (SSIM the windows centred on them), so the empty
+background can't pad the scores. The worst view counts. The
+report is a size-vs-quality curve per model and axis, plus the smallest
+setting that still meets --min-ssim and --min-psnr.
+
+gltf_io can't decode Draco, so a Draco setting is scored on the reference
+with the quantization the encoder applies (positions on a grid over each
+primitive's bounds, normals octahedral) and sized by the real export.
+Draco, decimation and the hero sculpture need Blender; the NumPy backend
+sweeps subsurf, quantize and palette. Builds go to a temporary directory,
+so public/ is never touched.
+Run: python scripts/rate-distortion.py [--only hero,react] [--axes draco,subsurf] [--min-ssim 0.98] [--min-psnr 35]
+     [--views 6] [--size 128] [--backend blender|numpy] [--jobs 4] [--json report.json] [--blender /path/to/blender]
+"""
+
+import argparse
+import copy
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from gltf_io import BinWriter, compact, read_floats, read_glb
+from skill_atlas import SKILLS_DIR, skill_files
+from turntable import Turntable, render_frame
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SKILL_SCRIPT = os.path.join(SCRIPTS_DIR, "generate-skill-models.py")
+HERO_SCRIPT = os.path.join(SCRIPTS_DIR, "generate-hero-sculpture.py")
+
+HERO = "hero"
+HERO_SUBDIV_LEVELS = 2  # as authored in generate-hero-sculpture.py
+FLOAT = 5126
+
+# (position, normal) bits, coarsest first
+DRACO_BITS = ((8, 6), (10, 7), (11, 8), (12, 8), (14, 10))
+DECIMATE_RATIOS = (0.12, 0.25, 0.4, 0.6, 0.8)
+SUBSURF_LEVELS = (0, 1)
+
+# Build options of the full-quality reference; every setting overrides some
+REFERENCE = {"compression": "none", "quantize": False, "palette": False, "lods": False}
+AXES = {
+    "draco": [(f"{p}/{n} bits", {"compression": "draco", "draco_bits": (p, n)}) for p, n in DRACO_BITS],
+    "decimate": [(f"ratio {r}", {"lods": True, "lod_ratios": (r,)}) for r in DECIMATE_RATIOS],
+    "subsurf": [(f"max {n}", {"max_subsurf": n}) for n in SUBSURF_LEVELS],
+    "quantize": [("on", {"quantize": True})],
+    "palette": [("on", {"palette": True})],
+}
+HERO_AXES = {"draco", "subsurf"}
+BLENDER_AXES = {"draco", "decimate"}
+
+SSIM_SIGMA = 1.5
+SSIM_RADIUS = 5
+# Reported for identical renders, where PSNR is infinite
+PSNR_CAP = 100.0
+LUMA = np.array([0.2126, 0.7152, 0.0722])
+
+
+def skill_argv(options):
+    argv = ["--no-publish", "--no-budgets", "--compression", options["compression"]]
+    if not options["quantize"]:
+        argv.append("--no-quantize")
+    if not options["palette"]:
+        argv.append("--no-palette")
+    if options["lods"]:
+        argv += ["--lod-ratios", ",".join(str(r) for r in options["lod_ratios"])]
+    else:
+        argv.append("--no-lods")
+    if "max_subsurf" in options:
+        argv += ["--max-subsurf", str(options["max_subsurf"])]
+    if "draco_bits" in options:
+        position, normal = options["draco_bits"]
+        argv += ["--draco-position-bits", str(position), "--draco-normal-bits", str(normal)]
+    return argv
+
+
+def hero_argv(options):
+    argv = ["--no-publish"]
+    if options["compression"] != "draco":
+        argv.append("--no-draco")
+    if "max_subsurf" in options:
+        argv += ["--subdiv-levels", str(min(HERO_SUBDIV_LEVELS, options["max_subsurf"]))]
+    if "draco_bits" in options:
+        position, normal = options["draco_bits"]
+        argv += ["--draco-position-bits", str(position), "--draco-normal-bits", str(normal)]
+    return argv
+
+
+def build(args, name, options, output_dir):
+    """Path of the GLB one setting produces, or None when the generator failed."""
+    blender = [args.blender, "--background", "--python-exit-code", "1", "--python"]
+    if name == HERO:
+        cmd = blender + [HERO_SCRIPT, "--", "--output-dir", output_dir] + hero_argv(options)
+        path = os.path.join(output_dir, "hero-sculpture.glb")
+    else:
+        argv = ["--only", name, "--output-dir", output_dir] + skill_argv(options)
+        if args.backend == "numpy":
+            cmd = [sys.executable, SKILL_SCRIPT, "--backend", "numpy"] + argv
+        else:
+            cmd = blender + [SKILL_SCRIPT, "--"] + argv
+        # A one-ratio LOD chain writes the decimated model as lod1
+        path = os.path.join(output_dir, f"{name}.lod1.glb" if options["lods"] else f"{name}.glb")
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0 or not os.path.exists(path):
+        sys.stderr.write(proc.stdout + proc.stderr)
+        return None
+    return path
+
+
+def quantize_positions(positions, bits):
+    lo = positions.min(axis=0)
+    extent = float((positions.max(axis=0) - lo).max()) or 1.0
+    steps = (1 << bits) - 1
+    return lo + np.floor((positions - lo) / extent * steps + 0.5) * (extent / steps)
+
+
+def fold_octahedron(s, t):
+    return (1 - np.abs(t)) * np.where(s >= 0, 1.0, -1.0), (1 - np.abs(s)) * np.where(t >= 0, 1.0, -1.0)
+
+
+def quantize_normals(normals, bits):
+    n = normals / np.maximum(np.abs(normals).sum(axis=1, keepdims=True), 1e-12)
+    s, t = n[:, 0], n[:, 1]
+    lower = n[:, 2] < 0
+    folded = fold_octahedron(s, t)
+    s, t = np.where(lower, folded[0], s), np.where(lower, folded[1], t)
+    # An odd number of levels keeps 0 exact
+    steps = (1 << bits) - 2
+    s, t = (np.round((np.stack([s, t]) + 1) / 2 * steps) / steps * 2 - 1)
+    z = 1 - np.abs(s) - np.abs(t)
+    unfolded = fold_octahedron(s, t)
+    s, t = np.where(z < 0, unfolded[0], s), np.where(z < 0, unfolded[1], t)
+    n = np.stack([s, t, z], axis=1)
+    return n / np.linalg.norm(n, axis=1, keepdims=True)
+
+
+def draco_decoded(gltf, binary, position_bits, normal_bits):
+    """The reference as a Draco decoder would hand it back at these bit depths."""
+    gltf = copy.deepcopy(gltf)
+    writer = BinWriter(gltf, binary)
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh["primitives"]:
+            attributes = primitive["attributes"]
+            for name, quantize, bits in (("POSITION", quantize_positions, position_bits),
+                                         ("NORMAL", quantize_normals, normal_bits)):
+                if name not in attributes:
+                    continue
+                data = quantize(read_floats(gltf, binary, attributes[name]), bits).astype(np.float32)
+                accessor = {"bufferView": writer.add_view(data.tobytes()), "componentType": FLOAT,
+                            "count": len(data), "type": "VEC3"}
+                if name == "POSITION":
+                    accessor.update(min=data.min(axis=0).tolist(), max=data.max(axis=0).tolist())
+                gltf["accessors"].append(accessor)
+                attributes[name] = len(gltf["accessors"]) - 1
+    return compact(gltf, bytes(writer.data))
+
+
+def render_views(turntable, views, size, framing):
+    """Views around the spin axis as (RGB over black, 8-bit sRGB as floats; coverage mask)."""
+    turntable.center_y, turntable.distance = framing
+    frames = []
+    for k in range(views):
+        frame = render_frame(turntable, 2 * math.pi * k / views, size)
+        frames.append((np.round(frame[..., :3] * frame[..., 3:] * 255) / 255, frame[..., 3] > 0))
+    return frames
+
+
+def gaussian_blur(image):
+    x = np.arange(-SSIM_RADIUS, SSIM_RADIUS + 1)
+    kernel = np.exp(-x ** 2 / (2 * SSIM_SIGMA ** 2))
+    kernel /= kernel.sum()
+    for axis in (0, 1):
+        image = np.lib.stride_tricks.sliding_window_view(image, len(kernel), axis=axis) @ kernel
+    return image
+
+
+def ssim(a, b, mask):
+    """Mean SSIM of two images in [0, 1], over the windows centred on mask that fit inside them."""
+    c1, c2 = 0.01 ** 2, 0.03 ** 2
+    mu_a, mu_b = gaussian_blur(a), gaussian_blur(b)
+    var_a = gaussian_blur(a * a) - mu_a ** 2
+    var_b = gaussian_blur(b * b) - mu_b ** 2
+    covariance = gaussian_blur(a * b) - mu_a * mu_b
+    s = ((2 * mu_a * mu_b + c1) * (2 * covariance + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    centers = mask[SSIM_RADIUS:mask.shape[0] - SSIM_RADIUS, SSIM_RADIUS:mask.shape[1] - SSIM_RADIUS]
+    return float(s[centers].mean()) if centers.any() else 1.0
+
+
+def psnr(a, b, mask):
+    if not mask.any():
+        return PSNR_CAP
+    mse = float(np.mean((a[mask] - b[mask]) ** 2))
+    return PSNR_CAP if mse == 0 else min(PSNR_CAP, 10 * math.log10(1 / mse))
+
+
+def compare(reference, views):
+    """Worst-view (SSIM, PSNR) of a variant against the reference renders."""
+    scores = []
+    for (r, r_mask), (v, v_mask) in zip(reference, views):
+        mask = r_mask | v_mask
+        scores.append((ssim(r @ LUMA, v @ LUMA, mask), psnr(r, v, mask)))
+    return min(s for s, _ in scores), min(p for _, p in scores)
+
+
+def sweep_axes(name, axes, backend):
+    """Axes this model can be swept on with this backend."""
+    usable = [a for a in axes if name != HERO or a in HERO_AXES]
+    if backend == "numpy" and name != HERO:
+        usable = [a for a in usable if a not in BLENDER_AXES]
+    return usable
+
+
+def plan(args, names, axes, workdir):
+    """(model, axis, label, options, output dir) per build; the reference has axis None."""
+    tasks = []
+    for name in names:
+        tasks.append((name, None, "reference", REFERENCE, os.path.join(workdir, name, "reference")))
+        for axis in sweep_axes(name, axes, args.backend):
+            for index, (label, overrides) in enumerate(AXES[axis]):
+                tasks.append((name, axis, label, dict(REFERENCE, **overrides),
+                              os.path.join(workdir, name, f"{axis}-{index}")))
+    return tasks
+
+
+def score_model(args, name, builds):
+    """Size-vs-quality curve per axis for one model, from its finished builds."""
+    reference_path = builds[(None, "reference")][1]
+    gltf, binary = read_glb(reference_path)
+    reference = Turntable(gltf, binary)
+    framing = (reference.center_y, reference.distance)
+    reference_views = render_views(reference, args.views, args.size, framing)
+    result = {"reference": {"bytes": os.path.getsize(reference_path)}, "axes": {}}
+    for (axis, label), (options, path) in builds.items():
+        if axis is None:
+            continue
+        curve = result["axes"].setdefault(axis, {"curve": []})["curve"]
+        if path is None:
+            curve.append({"setting": label, "failed": True})
+            continue
+        if "draco_bits" in options:
+            scene = draco_decoded(gltf, binary, *options["draco_bits"])
+        else:
+            scene = read_glb(path)
+        views = render_views(Turntable(*scene), args.views, args.size, framing)
+        score, noise = compare(reference_views, views)
+        curve.append({
+            "setting": label,
+            "bytes": os.path.getsize(path),
+            "ssim": round(score, 5),
+            "psnr": round(noise, 2),
+            "passes": score >= args.min_ssim and noise >= args.min_psnr,
+        })
+    for entry in result["axes"].values():
+        entry["curve"].sort(key=lambda e: e.get("bytes", math.inf))
+        passing = [e for e in entry["curve"] if e.get("passes")]
+        entry["smallest"] = passing[0]["setting"] if passing else None
+    return result
+
+
+def print_model(name, result):
+    reference = result["reference"]["bytes"]
+    print(f"=== {name}: reference {reference / 1024:.0f}KB ===")
+    for axis, entry in result["axes"].items():
+        for point in entry["curve"]:
+            if point.get("failed"):
+                print(f"  {axis:<9} {point['setting']:<12} build failed")
+                continue
+            verdict = "ok" if point["passes"] else "FAIL"
+            print(f"  {axis:<9} {point['setting']:<12} {point['bytes'] / 1024:7.0f}KB {point['bytes'] / reference:5.0%}"
+                  f"  SSIM {point['ssim']:.4f}  PSNR {point['psnr']:5.1f}dB  {verdict}")
+        print(f"  {axis:<9} smallest passing: {entry['smallest'] or 'none'}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Size-vs-quality sweep of compression and detail settings.")
+    parser.add_argument("--only", default="", help="comma-separated models, e.g. hero,react (default: all)")
+    parser.add_argument("--axes", default=",".join(AXES), help=f"comma-separated axes out of {', '.join(AXES)}")
+    parser.add_argument("--min-ssim", type=float, default=0.98, help="worst-view SSIM a setting must reach")
+    parser.add_argument("--min-psnr", type=float, default=35.0, help="worst-view PSNR in dB a setting must reach")
+    parser.add_argument("--views", type=int, default=6, help="camera angles per model")
+    parser.add_argument("--size", type=int, default=128, help="render size in pixels")
+    parser.add_argument("--backend", choices=["blender", "numpy"], default="blender",
+                        help="geometry backend for the skill models")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1, help="parallel generator runs")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("--json", dest="json_path", help="write the curves as JSON to this path")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    available = skill_files(SKILLS_DIR) + ([HERO] if args.backend == "blender" else [])
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or available
+    axes = [a.strip() for a in args.axes.split(",") if a.strip()]
+    unknown = [n for n in names if n not in available] + [a for a in axes if a not in AXES]
+    if unknown:
+        raise SystemExit(f"Unknown model(s) or axes: {', '.join(unknown)}")
+
+    workdir = tempfile.mkdtemp(prefix="rate-distortion-")
+    try:
+        tasks = plan(args, names, axes, workdir)
+        print(f"=== Sweeping {len(names)} model(s) over {', '.join(axes)}: {len(tasks)} builds ===")
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            paths = list(pool.map(lambda task: build(args, task[0], task[3], task[4]), tasks))
+        report = {"minSsim": args.min_ssim, "minPsnr": args.min_psnr, "views": args.views, "size": args.size,
+                  "backend": args.backend, "models": {}}
+        for name in names:
+            builds = {(axis, label): (options, path)
+                      for (model, axis, label, options, _), path in zip(tasks, paths) if model == name}
+            if builds[(None, "reference")][1] is None:
+                print(f"=== {name}: reference build failed, skipped ===")
+                continue
+            report["models"][name] = score_model(args, name, builds)
+            print_model(name, report["models"][name])
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"  Report written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
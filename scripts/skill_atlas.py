@@ -0,0 +1,178 @@
+"""
+Pack the per-skill GLBs into one atlas GLB with a named root node per slug.
+
+The skills grid can then fetch and parse a single file and pick each
+model's subtree by name, instead of making ten useGLTF requests. Materials
+with identical parameters are shared across skills. The per-model files
+stay in place for the detail pages. atlas.json maps each slug to its node.
+Run: python scripts/skill_atlas.py [--skills-dir public/models/skills]
+"""
+
+import argparse
+import json
+import os
+
+from gltf_io import encode_glb, read_glb
+from material_palette import configurations
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SKILLS_DIR = os.path.join(ROOT, "public", "models", "skills")
+ATLAS_NAME = "atlas.glb"
+INDEX_NAME = "atlas.json"
+
+
+def skill_files(skills_dir):
+    """Full-detail per-skill GLBs: {slug}.glb, skipping LODs and the atlas."""
+    names = []
+    for filename in sorted(os.listdir(skills_dir)):
+        stem, ext = os.path.splitext(filename)
+        if ext == ".glb" and "." not in stem and filename != ATLAS_NAME:
+            names.append(stem)
+    return names
+
+
+def material_key(material):
+    return json.dumps({k: v for k, v in material.items() if k != "name"}, sort_keys=True)
+
+
+class AtlasBuilder:
+    def __init__(self):
+        self.gltf = {
+            "asset": {"generator": "portfolio skill_atlas", "version": "2.0"},
+            "scene": 0,
+            "scenes": [{"nodes": []}],
+            "nodes": [],
+            "meshes": [],
+            "materials": [],
+            "accessors": [],
+            "bufferViews": [],
+            "buffers": [{"byteLength": 0}],
+        }
+        self.binary = bytearray()
+        self.material_index = {}
+        self.source_materials = 0
+        self.extensions_used = set()
+        self.extensions_required = set()
+
+    def add(self, slug, gltf, binary):
+        if gltf.get("images") or gltf.get("textures"):
+            raise SystemExit(f"{slug}: textured models are not supported by the atlas packer")
+        if "EXT_meshopt_compression" in gltf.get("extensionsUsed", []):
+            raise SystemExit(f"{slug}: meshopt-compressed models cannot be repacked; build with another profile")
+        out = self.gltf
+
+        self.binary.extend(b"\x00" * (-len(self.binary) % 8))
+        byte_base = len(self.binary)
+        self.binary.extend(binary)
+
+        view_base = len(out["bufferViews"])
+        for view in gltf.get("bufferViews", []):
+            view = dict(view, buffer=0, byteOffset=view.get("byteOffset", 0) + byte_base)
+            out["bufferViews"].append(view)
+
+        accessor_base = len(out["accessors"])
+        for accessor in gltf.get("accessors", []):
+            if "sparse" in accessor:
+                raise SystemExit(f"{slug}: sparse accessors are not supported by the atlas packer")
+            accessor = dict(accessor)
+            if "bufferView" in accessor:
+                accessor["bufferView"] += view_base
+            out["accessors"].append(accessor)
+
+        materials = []
+        for material in gltf.get("materials", []):
+            self.source_materials += 1
+            key = material_key(material)
+            if key not in self.material_index:
+                self.material_index[key] = len(out["materials"])
+                out["materials"].append(material)
+            materials.append(self.material_index[key])
+
+        mesh_base = len(out["meshes"])
+        for mesh in gltf.get("meshes", []):
+            primitives = []
+            for primitive in mesh["primitives"]:
+                primitive = json.loads(json.dumps(primitive))
+                primitive["attributes"] = {k: v + accessor_base for k, v in primitive["attributes"].items()}
+                if "indices" in primitive:
+                    primitive["indices"] += accessor_base
+                if "material" in primitive:
+                    primitive["material"] = materials[primitive["material"]]
+                for target in primitive.get("targets", []):
+                    for k in target:
+                        target[k] += accessor_base
+                draco = primitive.get("extensions", {}).get("KHR_draco_mesh_compression")
+                if draco:
+                    draco["bufferView"] += view_base
+                primitives.append(primitive)
+            out["meshes"].append(dict(mesh, primitives=primitives))
+
+        node_base = len(out["nodes"])
+        for node in gltf.get("nodes", []):
+            node = json.loads(json.dumps(node))
+            if "mesh" in node:
+                node["mesh"] += mesh_base
+            if "children" in node:
+                node["children"] = [c + node_base for c in node["children"]]
+            instancing = node.get("extensions", {}).get("EXT_mesh_gpu_instancing")
+            if instancing:
+                instancing["attributes"] = {k: v + accessor_base for k, v in instancing["attributes"].items()}
+            out["nodes"].append(node)
+
+        scene = gltf["scenes"][gltf.get("scene", 0)]
+        out["nodes"].append({"name": slug, "children": [n + node_base for n in scene["nodes"]]})
+        root = len(out["nodes"]) - 1
+        out["scenes"][0]["nodes"].append(root)
+
+        self.extensions_used.update(gltf.get("extensionsUsed", []))
+        self.extensions_required.update(gltf.get("extensionsRequired", []))
+        return root
+
+    def encode(self):
+        if self.extensions_used:
+            self.gltf["extensionsUsed"] = sorted(self.extensions_used)
+        if self.extensions_required:
+            self.gltf["extensionsRequired"] = sorted(self.extensions_required)
+        return encode_glb(self.gltf, bytes(self.binary))
+
+
+def pack_atlas(skills_dir=SKILLS_DIR):
+    builder = AtlasBuilder()
+    skills = {}
+    source_bytes = 0
+    for slug in skill_files(skills_dir):
+        path = os.path.join(skills_dir, f"{slug}.glb")
+        source_bytes += os.path.getsize(path)
+        gltf, binary = read_glb(path)
+        skills[slug] = {"node": slug, "nodeIndex": builder.add(slug, gltf, binary)}
+
+    data = builder.encode()
+    with open(os.path.join(skills_dir, ATLAS_NAME), "wb") as f:
+        f.write(data)
+    index = {
+        "file": ATLAS_NAME,
+        "bytes": len(data),
+        "dracoDecoderPath": "/draco/" if "KHR_draco_mesh_compression" in builder.extensions_used else None,
+        "materials": {"before": builder.source_materials, "after": len(builder.gltf["materials"])},
+        # Shader programs three.js compiles for the whole grid
+        "configurations": configurations(builder.gltf),
+        "skills": skills,
+    }
+    with open(os.path.join(skills_dir, INDEX_NAME), "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2)
+        f.write("\n")
+    print(f"  Packed {len(skills)} skills into {ATLAS_NAME} ({len(data) / 1024:.0f}KB from "
+          f"{source_bytes / 1024:.0f}KB, materials {builder.source_materials} -> {len(builder.gltf['materials'])}, "
+          f"{index['configurations']} configuration(s))")
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack per-skill GLBs into a single atlas GLB.")
+    parser.add_argument("--skills-dir", default=SKILLS_DIR)
+    args = parser.parse_args()
+    pack_atlas(args.skills_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Render turntable sprite sheets of the skill models on the CPU.
+
+Each full-detail skill GLB is rasterized in NumPy, without Blender or a GPU,
+at FRAMES angles around +Y (the axis SkillIcon3D spins), with the scenes'
+field of view and light rig. Most badges lie flat, so the camera looks down
+on them from ELEVATION degrees above the horizon. Frames are supersampled,
+laid out left to right in one strip and saved as a lossy WebP with alpha
+under public/sprites/skills/. src/data/skill-turntables.json holds the metadata
+SkillTurntable needs to play a strip with a CSS steps() animation, so a
+card can spin its model without a WebGL context.
+
+Shading is Lambert plus a Blinn-Phong highlight from the PBR factors;
+close to the live icons, not a match. Strips whose source GLB and render
+settings are unchanged are not re-rendered.
+Run: python scripts/turntable.py [--only react,rust] [--frames 24] [--size 80] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+
+import numpy as np
+from PIL import Image
+
+from gltf_io import read_accessor, read_floats, read_glb
+from model_manifest import placements
+from skill_atlas import SKILLS_DIR, skill_files
+from vertex_lighting import AMBIENT, LIGHTS, unit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPRITES_DIR = os.path.join(ROOT, "public", "sprites", "skills")
+METADATA_PATH = os.path.join(ROOT, "src", "data", "skill-turntables.json")
+
+UNLIT = "KHR_materials_unlit"
+EMISSIVE_STRENGTH = "KHR_materials_emissive_strength"
+MODE_TRIANGLES = 4
+
+FOV = 50  # degrees, as in SceneWrapper
+ELEVATION = 30  # degrees
+MARGIN = 1.05
+SUPERSAMPLE = 3
+WEBP_QUALITY = 80
+# One turn at SkillIcon3D's hover speed: 0.03 rad per frame at 60fps
+DURATION = 2 * math.pi / (0.03 * 60)
+
+
+class Turntable:
+    """Triangle soup of one model with per-triangle material factors."""
+
+    def __init__(self, gltf, binary):
+        materials = gltf.get("materials", [])
+        corners, normals, colors, factors = [], [], [], []
+        for mesh_index, matrix in placements(gltf, binary):
+            for primitive in gltf["meshes"][mesh_index]["primitives"]:
+                if primitive.get("mode", MODE_TRIANGLES) != MODE_TRIANGLES:
+                    continue
+                attributes = primitive["attributes"]
+                positions = read_floats(gltf, binary, attributes["POSITION"])
+                if "indices" in primitive:
+                    triangles = read_accessor(gltf, binary, primitive["indices"]).reshape(-1, 3).astype(np.int64)
+                else:
+                    triangles = np.arange(len(positions)).reshape(-1, 3)
+                world = positions @ matrix[:3, :3].T + matrix[:3, 3]
+                if "NORMAL" in attributes:
+                    n = unit(read_floats(gltf, binary, attributes["NORMAL"]) @ np.linalg.inv(matrix[:3, :3]))
+                else:
+                    face = np.cross(world[triangles[:, 1]] - world[triangles[:, 0]],
+                                    world[triangles[:, 2]] - world[triangles[:, 0]])
+                    n = np.zeros_like(world)
+                    for k in range(3):
+                        np.add.at(n, triangles[:, k], face)
+                    n = unit(n)
+
+                material = materials[primitive["material"]] if "material" in primitive else {}
+                pbr = material.get("pbrMetallicRoughness", {})
+                color = np.tile(pbr.get("baseColorFactor", [1.0] * 4)[:3], (len(positions), 1))
+                if "COLOR_0" in attributes:
+                    color = color * read_floats(gltf, binary, attributes["COLOR_0"])[:, :3]
+                strength = material.get("extensions", {}).get(EMISSIVE_STRENGTH, {}).get("emissiveStrength", 1.0)
+                emission = np.asarray(material.get("emissiveFactor", [0.0] * 3)) * strength
+                unlit = UNLIT in material.get("extensions", {})
+                # metallic, roughness, emission rgb, unlit
+                factor = [pbr.get("metallicFactor", 1.0), pbr.get("roughnessFactor", 1.0), *emission, float(unlit)]
+
+                corners.append(world[triangles])
+                normals.append(n[triangles])
+                colors.append(color[triangles])
+                factors.append(np.tile(factor, (len(triangles), 1)))
+        self.corners = np.concatenate(corners)
+        self.normals = np.concatenate(normals)
+        self.colors = np.concatenate(colors)
+        self.factors = np.concatenate(factors)
+
+        # Spin about the vertical axis through the origin, like the live icon,
+        # and frame the sphere swept by the model
+        points = self.corners.reshape(-1, 3)
+        self.center_y = (points[:, 1].min() + points[:, 1].max()) / 2
+        radius = np.linalg.norm(points - [0.0, self.center_y, 0.0], axis=1).max()
+        self.distance = radius * MARGIN / math.sin(math.radians(FOV) / 2)
+
+    def render(self, angle, size):
+        """RGBA frame, premultiplied linear color, at size x size pixels."""
+        c, s = math.cos(angle), math.sin(angle)
+        rotation = np.array([[c, 0.0, s], [0.0, 1.0, 0.0], [-s, 0.0, c]])
+        e = math.radians(ELEVATION)
+        camera = np.array([0.0, self.center_y + self.distance * math.sin(e), self.distance * math.cos(e)])
+        forward = unit((np.array([0.0, self.center_y, 0.0]) - camera)[None])[0]
+        right = unit(np.cross(forward, [0.0, 1.0, 0.0])[None])[0]
+        up = np.cross(right, forward)
+        corners = self.corners @ rotation.T
+        view = corners - camera
+        depth = view @ forward
+        focal = size / 2 / math.tan(math.radians(FOV) / 2)
+        xy = np.stack([(view @ right) / depth * focal + size / 2 - 0.5,
+                       -(view @ up) / depth * focal + size / 2 - 0.5], axis=-1)
+
+        tri, pixels, weights = rasterize(xy, depth, size)
+        image = np.zeros((size * size, 4))
+        if not len(tri):
+            return image.reshape(size, size, 4)
+
+        def interpolate(values):
+            return np.einsum("pk,pkc->pc", weights, values[tri])
+
+        point = interpolate(corners)
+        to_eye = unit(camera - point)
+        normal = unit(interpolate(self.normals @ rotation.T))
+        # Double-sided: light the side facing the camera
+        normal *= np.where((normal * to_eye).sum(axis=1) < 0, -1.0, 1.0)[:, None]
+        base = interpolate(self.colors)
+        metallic, roughness, emission, unlit = (
+            self.factors[tri, 0:1], self.factors[tri, 1:2], self.factors[tri, 2:5], self.factors[tri, 5] > 0)
+
+        diffuse = base * (1 - metallic)
+        f0 = 0.04 * (1 - metallic) + base * metallic
+        alpha = np.maximum(roughness, 0.05) ** 2
+        exponent = np.minimum(2 / alpha ** 2 - 2, 4096)
+        # Ambient on both lobes stands in for the missing environment map
+        color = AMBIENT * (diffuse + f0)
+        for position, intensity in LIGHTS:
+            light = unit(np.asarray(position, dtype=np.float64)[None])[0]
+            ndl = np.maximum(normal @ light, 0)[:, None]
+            ndh = np.maximum((normal * unit(to_eye + light)).sum(axis=1), 0)[:, None]
+            specular = f0 * (exponent + 8) / (8 * math.pi) * ndh ** exponent
+            color += intensity * ndl * (diffuse + specular)
+        color += emission
+        color[unlit] = base[unlit]
+
+        image[pixels, :3] = color
+        image[pixels, 3] = 1.0
+        return image.reshape(size, size, 4)
+
+
+def rasterize(xy, depth, size):
+    """Nearest triangle per pixel center: (triangle, pixel, barycentrics)."""
+    front = (depth > 1e-6).all(axis=1)
+    index = np.flatnonzero(front)
+    xy, depth = xy[front], depth[front]
+    lo = np.clip(np.ceil(xy.min(axis=1)), 0, size).astype(np.int64)
+    hi = np.clip(np.floor(xy.max(axis=1)), -1, size - 1).astype(np.int64)
+    extent = np.maximum(hi - lo + 1, 0)
+    counts = extent[:, 0] * extent[:, 1]
+    tri = np.repeat(np.arange(len(xy)), counts)
+    local = np.arange(len(tri)) - np.repeat(np.cumsum(counts) - counts, counts)
+    px = lo[tri, 0] + local % np.maximum(extent[tri, 0], 1)
+    py = lo[tri, 1] + local // np.maximum(extent[tri, 0], 1)
+
+    a, b, c = xy[tri, 0], xy[tri, 1], xy[tri, 2]
+    den = (b[:, 1] - c[:, 1]) * (a[:, 0] - c[:, 0]) + (c[:, 0] - b[:, 0]) * (a[:, 1] - c[:, 1])
+    ok = np.abs(den) > 1e-12
+    den = np.where(ok, den, 1.0)
+    dx, dy = px - c[:, 0], py - c[:, 1]
+    l1 = ((b[:, 1] - c[:, 1]) * dx + (c[:, 0] - b[:, 0]) * dy) / den
+    l2 = ((c[:, 1] - a[:, 1]) * dx + (a[:, 0] - c[:, 0]) * dy) / den
+    screen = np.stack([l1, l2, 1 - l1 - l2], axis=1)
+    inside = ok & (screen >= -1e-9).all(axis=1)
+    tri, screen, pixel = tri[inside], screen[inside], (py * size + px)[inside]
+
+    # Perspective-correct weights and depth
+    w = screen / depth[tri]
+    weights = w / w.sum(axis=1, keepdims=True)
+    z = (weights * depth[tri]).sum(axis=1)
+    # Farthest first, so the nearest surface is written last
+    order = np.argsort(-z, kind="stable")
+    winner = np.full(size * size, -1)
+    winner[pixel[order]] = order
+    pixels = np.flatnonzero(winner >= 0)
+    chosen = winner[pixels]
+    return index[tri[chosen]], pixels, weights[chosen]
+
+
+def to_srgb(linear):
+    linear = np.clip(linear, 0, 1)
+    return np.where(linear <= 0.0031308, linear * 12.92, 1.055 * linear ** (1 / 2.4) - 0.055)
+
+
+def render_frame(turntable, angle, size):
+    """Supersampled frame as straight-alpha sRGB floats, size x size x 4."""
+    frame = turntable.render(angle, size * SUPERSAMPLE)
+    frame = frame.reshape(size, SUPERSAMPLE, size, SUPERSAMPLE, 4).mean(axis=(1, 3))
+    alpha = frame[..., 3:]
+    rgb = to_srgb(frame[..., :3] / np.maximum(alpha, 1e-9))
+    return np.concatenate([rgb, alpha], axis=-1)
+
+
+def render_strip(turntable, frames, size):
+    """Frames left to right as an 8-bit RGBA image."""
+    strip = [render_frame(turntable, 2 * math.pi * k / frames, size) for k in range(frames)]
+    pixels = np.round(np.concatenate(strip, axis=1) * 255).astype(np.uint8)
+    return Image.fromarray(pixels, "RGBA")
+
+
+def load_metadata():
+    if not os.path.exists(METADATA_PATH):
+        return {}
+    with open(METADATA_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def render_turntables(only=None, frames=24, size=80, force=False):
+    os.makedirs(SPRITES_DIR, exist_ok=True)
+    metadata = load_metadata()
+    slugs = skill_files(SKILLS_DIR)
+    for slug in only or slugs:
+        source = os.path.join(SKILLS_DIR, f"{slug}.glb")
+        settings = f"{file_digest(source)} {frames} {size} {SUPERSAMPLE} {ELEVATION} {WEBP_QUALITY}"
+        key = hashlib.sha256(settings.encode()).hexdigest()[:16]
+        path = os.path.join(SPRITES_DIR, f"{slug}.webp")
+        entry = metadata.get(slug)
+        if not force and entry is not None and entry.get("key") == key and os.path.exists(path):
+            print(f"  {slug:<12} cached")
+            continue
+        strip = render_strip(Turntable(*read_glb(source)), frames, size)
+        strip.save(path, "WEBP", quality=WEBP_QUALITY, method=6)
+        metadata[slug] = {
+            # The query string changes with the content, so caches never serve a stale strip
+            "url": f"/sprites/skills/{slug}.webp?v={file_digest(path)[:12]}",
+            "bytes": os.path.getsize(path),
+            "frames": frames,
+            "frameWidth": size,
+            "frameHeight": size,
+            "duration": round(DURATION, 2),
+            "key": key,
+        }
+        print(f"  {slug:<12} {frames} frames, {strip.width}x{strip.height}, {metadata[slug]['bytes'] / 1024:.1f}KB")
+    metadata = {slug: metadata[slug] for slug in sorted(metadata) if slug in slugs}
+    with open(METADATA_PATH, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+        f.write("\n")
+    return metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render turntable sprite strips of the skill models.")
+    parser.add_argument("--only", default="", help="comma-separated skill names, e.g. react,rust")
+    parser.add_argument("--frames", type=int, default=24, help="frames per turn")
+    parser.add_argument("--size", type=int, default=80, help="frame width and height in pixels")
+    parser.add_argument("--force", action="store_true", help="re-render even when nothing changed")
+    args = parser.parse_args()
+
+    only = [n.strip() for n in args.only.split(",") if n.strip()]
+    unknown = [n for n in only if n not in skill_files(SKILLS_DIR)]
+    if unknown:
+        raise SystemExit(f"Unknown skill model(s): {', '.join(unknown)}")
+    print(f"=== Rendering {args.frames}-frame turntables at {args.size}px ===")
+    metadata = render_turntables(only, args.frames, args.size, args.force)
+    total = sum(entry["bytes"] for entry in metadata.values())
+    print(f"=== {len(metadata)} strip(s), {total / 1024:.0f}KB total, metadata in {os.path.relpath(METADATA_PATH, ROOT)} ===")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Bake ambient occlusion and static lighting into COLOR_0 vertex colors.
+
+Visibility comes from orthographic depth maps of the whole scene, one per
+direction: a vertex sees a direction when nothing in that depth map lies
+between it and the far side. Occlusion is the cosine-weighted share of
+DIRECTIONS directions, spread evenly over the sphere, that a vertex sees;
+the static LIGHTS reuse the same test for their shadows. A mesh placed
+several times (linked copies, GPU instances) gets the average over its
+placements.
+
+Two modes:
+  - ao: COLOR_0 holds the occlusion term. glTF multiplies COLOR_0 into the
+    base color, so the PBR material still works as is; the material is
+    flagged with extras.bakedLighting = "ao" and SkillIcon3D swaps in a
+    Lambert material lit by the scene lights.
+  - full: COLOR_0 holds the shaded color, base color times the baked
+    irradiance plus emission, and the material becomes KHR_materials_unlit
+    with a white base color (MeshBasicMaterial in three.js). Normals and
+    tangents are dropped.
+
+Files using Draco, meshopt or KHR_mesh_quantization are skipped, so run this
+before glb_optimize.py. generate-skill-models.py runs it with --bake-lighting.
+Run: python scripts/vertex_lighting.py paths... [--mode ao|full] [--dry-run]
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from gltf_io import BinWriter, compact, encode_glb, read_accessor, read_floats, read_glb
+from model_manifest import placements
+
+UNLIT = "KHR_materials_unlit"
+EMISSIVE_STRENGTH = "KHR_materials_emissive_strength"
+SKIPPED_EXTENSIONS = ("KHR_draco_mesh_compression", "EXT_meshopt_compression", "KHR_mesh_quantization")
+MODES = ("ao", "full")
+
+FLOAT = 5126
+ARRAY_BUFFER = 34962
+MODE_TRIANGLES = 4
+
+DIRECTIONS = 64
+RESOLUTION = 256
+# Offsets against self-shadowing, in depth map texels
+NORMAL_OFFSET = 1.0
+DEPTH_BIAS = 1.5
+
+# Light rig of the 3D scenes (see HeroScene): ambient intensity, then
+# directional lights as (position, intensity), pointing at the origin
+AMBIENT = 0.4
+LIGHTS = [((5, 5, 5), 0.6), ((-3, -2, -4), 0.2)]
+
+
+def sphere_directions(count):
+    """Unit vectors spread evenly over the sphere (Fibonacci lattice)."""
+    i = np.arange(count) + 0.5
+    z = 1 - 2 * i / count
+    r = np.sqrt(1 - z * z)
+    phi = np.pi * (3 - np.sqrt(5)) * i
+    return np.stack([r * np.cos(phi), r * np.sin(phi), z], axis=1)
+
+
+class DepthMap:
+    """Orthographic depth map of triangles seen from far out along direction."""
+
+    def __init__(self, triangles, direction, center, radius, resolution=RESOLUTION):
+        d = np.asarray(direction, dtype=np.float64)
+        d /= np.linalg.norm(d)
+        up = np.array([0.0, 1.0, 0.0]) if abs(d[1]) < 0.9 else np.array([1.0, 0.0, 0.0])
+        u = np.cross(up, d)
+        u /= np.linalg.norm(u)
+        self.direction = d
+        self.basis = np.stack([u, np.cross(d, u), d])
+        self.origin = self.basis[:2] @ center - radius
+        self.texel = 2 * radius / resolution
+        self.resolution = resolution
+        self.depth = np.full(resolution * resolution, -np.inf)
+        self.rasterize(triangles)
+
+    def project(self, points):
+        """Pixel coordinates (centers on integers) and depth towards the viewer."""
+        q = points @ self.basis.T
+        return (q[..., :2] - self.origin) / self.texel - 0.5, q[..., 2]
+
+    def rasterize(self, triangles):
+        xy, z = self.project(triangles)
+        res = self.resolution
+        lo = np.clip(np.ceil(xy.min(axis=1)), 0, res).astype(np.int64)
+        hi = np.clip(np.floor(xy.max(axis=1)), -1, res - 1).astype(np.int64)
+        size = np.maximum(hi - lo + 1, 0)
+        counts = size[:, 0] * size[:, 1]
+        tri = np.repeat(np.arange(len(triangles)), counts)
+        if not len(tri):
+            return
+        local = np.arange(len(tri)) - np.repeat(np.cumsum(counts) - counts, counts)
+        px = lo[tri, 0] + local % size[tri, 0]
+        py = lo[tri, 1] + local // size[tri, 0]
+
+        a, b, c = xy[tri, 0], xy[tri, 1], xy[tri, 2]
+        den = (b[:, 1] - c[:, 1]) * (a[:, 0] - c[:, 0]) + (c[:, 0] - b[:, 0]) * (a[:, 1] - c[:, 1])
+        ok = np.abs(den) > 1e-12
+        den = np.where(ok, den, 1.0)
+        dx, dy = px - c[:, 0], py - c[:, 1]
+        l1 = ((b[:, 1] - c[:, 1]) * dx + (c[:, 0] - b[:, 0]) * dy) / den
+        l2 = ((c[:, 1] - a[:, 1]) * dx + (a[:, 0] - c[:, 0]) * dy) / den
+        l3 = 1 - l1 - l2
+        inside = ok & (l1 >= -1e-9) & (l2 >= -1e-9) & (l3 >= -1e-9)
+        depth = (l1 * z[tri, 0] + l2 * z[tri, 1] + l3 * z[tri, 2])[inside]
+        pixels = (py * res + px)[inside]
+        # Writes in ascending depth order, so each pixel keeps its nearest surface
+        order = np.argsort(depth, kind="stable")
+        self.depth[pixels[order]] = depth[order]
+
+    def visible(self, points, normals):
+        xy, z = self.project(points + normals * (NORMAL_OFFSET * self.texel))
+        pixel = np.clip(np.rint(xy), 0, self.resolution - 1).astype(np.int64)
+        occluder = self.depth[pixel[:, 1] * self.resolution + pixel[:, 0]]
+        return z >= occluder - DEPTH_BIAS * self.texel
+
+
+def vertex_normals(positions, triangles):
+    corners = positions[triangles]
+    face = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    normals = np.zeros_like(positions)
+    for k in range(3):
+        np.add.at(normals, triangles[:, k], face)
+    return normals
+
+
+def unit(vectors):
+    length = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(length > 0, length, 1)
+
+
+def read_geometry(gltf, binary, primitive):
+    positions = read_floats(gltf, binary, primitive["attributes"]["POSITION"])
+    if "indices" in primitive:
+        triangles = read_accessor(gltf, binary, primitive["indices"]).reshape(-1, 3).astype(np.int64)
+    else:
+        triangles = np.arange(len(positions)).reshape(-1, 3)
+    if "NORMAL" in primitive["attributes"]:
+        normals = read_floats(gltf, binary, primitive["attributes"]["NORMAL"])
+    else:
+        normals = vertex_normals(positions, triangles)
+    return positions, unit(normals), triangles
+
+
+def flag_material(material, mode):
+    material.setdefault("extras", {})["bakedLighting"] = mode
+    if mode != "full":
+        return
+    # The color is in COLOR_0 now; the PBR values are only a fallback for
+    # viewers without KHR_materials_unlit
+    pbr = material.setdefault("pbrMetallicRoughness", {})
+    alpha = pbr.get("baseColorFactor", [1.0, 1.0, 1.0, 1.0])[3]
+    pbr.update(baseColorFactor=[1.0, 1.0, 1.0, alpha], metallicFactor=0.0, roughnessFactor=0.9)
+    material.pop("emissiveFactor", None)
+    extensions = material.setdefault("extensions", {})
+    extensions.pop(EMISSIVE_STRENGTH, None)
+    extensions[UNLIT] = {}
+
+
+def shaded_color(material, occlusion, irradiance):
+    material = material or {}
+    base = np.asarray(material.get("pbrMetallicRoughness", {}).get("baseColorFactor", [1.0] * 4)[:3])
+    strength = material.get("extensions", {}).get(EMISSIVE_STRENGTH, {}).get("emissiveStrength", 1.0)
+    emission = np.asarray(material.get("emissiveFactor", [0.0] * 3)) * strength
+    return base * (AMBIENT * occlusion + irradiance)[:, None] + emission
+
+
+def bake(gltf, binary, mode):
+    meshes = gltf.get("meshes", [])
+    placed = placements(gltf, binary)
+    geometry = {}
+    for mesh_index in sorted({m for m, _ in placed}):
+        for p, primitive in enumerate(meshes[mesh_index]["primitives"]):
+            if primitive.get("mode", MODE_TRIANGLES) == MODE_TRIANGLES:
+                geometry[mesh_index, p] = read_geometry(gltf, binary, primitive)
+    if not geometry:
+        return gltf, binary, {"primitives": 0, "vertices": 0, "occlusion": 1.0}
+
+    world = []
+    for mesh_index, matrix in placed:
+        for (m, _), (positions, _, triangles) in geometry.items():
+            if m == mesh_index:
+                world.append((positions @ matrix[:3, :3].T + matrix[:3, 3])[triangles])
+    triangles = np.concatenate(world)
+    corners = triangles.reshape(-1, 3)
+    center = (corners.min(axis=0) + corners.max(axis=0)) / 2
+    radius = np.linalg.norm(corners - center, axis=1).max() * 1.01 + 1e-6
+
+    directions = sphere_directions(DIRECTIONS)
+    occluders = [DepthMap(triangles, d, center, radius) for d in directions]
+    lights = [(DepthMap(triangles, p, center, radius), intensity) for p, intensity in LIGHTS]
+
+    writer = BinWriter(gltf, binary)
+    materials = gltf.setdefault("materials", [])
+    flagged = {}
+    vertices = 0
+    occlusion_sum = 0.0
+    for (mesh_index, p), (positions, normals, _) in geometry.items():
+        occlusion = np.zeros(len(positions))
+        irradiance = np.zeros(len(positions))
+        matrices = [matrix for m, matrix in placed if m == mesh_index]
+        for matrix in matrices:
+            points = positions @ matrix[:3, :3].T + matrix[:3, 3]
+            world_normals = unit(normals @ np.linalg.inv(matrix[:3, :3]))
+            weights = np.maximum(world_normals @ directions.T, 0)
+            seen = np.stack([o.visible(points, world_normals) for o in occluders], axis=1)
+            occlusion += (weights * seen).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+            for depth_map, intensity in lights:
+                facing = np.maximum(world_normals @ depth_map.direction, 0)
+                irradiance += intensity * facing * depth_map.visible(points, world_normals)
+        occlusion /= len(matrices)
+        irradiance /= len(matrices)
+
+        primitive = meshes[mesh_index]["primitives"][p]
+        material = materials[primitive["material"]] if "material" in primitive else None
+        if mode == "ao":
+            color = np.repeat(occlusion[:, None], 3, axis=1)
+        else:
+            color = shaded_color(material, occlusion, irradiance)
+        view = writer.add_view(np.clip(color, 0, 1).astype("<f4").tobytes(), target=ARRAY_BUFFER)
+        gltf["accessors"].append({"bufferView": view, "componentType": FLOAT, "count": len(color), "type": "VEC3"})
+        primitive["attributes"]["COLOR_0"] = len(gltf["accessors"]) - 1
+        if mode == "full":
+            # Unlit shading never reads them
+            primitive["attributes"].pop("NORMAL", None)
+            primitive["attributes"].pop("TANGENT", None)
+
+        key = primitive.get("material")
+        if key not in flagged:
+            if key is None:
+                materials.append({"name": "BakedLighting"})
+                flagged[None] = len(materials) - 1
+            else:
+                flagged[key] = key
+            flag_material(materials[flagged[key]], mode)
+        primitive["material"] = flagged[key]
+        vertices += len(positions)
+        occlusion_sum += occlusion.sum()
+
+    used = set(gltf.get("extensionsUsed", []))
+    if mode == "full":
+        used.add(UNLIT)
+    if not any(EMISSIVE_STRENGTH in m.get("extensions", {}) for m in materials):
+        used.discard(EMISSIVE_STRENGTH)
+    if used:
+        gltf["extensionsUsed"] = sorted(used)
+    gltf, binary = compact(gltf, bytes(writer.data))
+    stats = {"primitives": len(geometry), "vertices": vertices, "occlusion": float(occlusion_sum / max(1, vertices))}
+    return gltf, binary, stats
+
+
+def bake_file(path, mode, dry_run=False):
+    before = os.path.getsize(path)
+    gltf, binary = read_glb(path)
+    skipped = [e for e in SKIPPED_EXTENSIONS if e in gltf.get("extensionsUsed", [])]
+    if skipped:
+        return {"bytes": [before, before], "skipped": skipped[0]}
+
+    gltf, binary, stats = bake(gltf, binary, mode)
+    data = encode_glb(gltf, binary)
+    if not dry_run:
+        with open(path, "wb") as f:
+            f.write(data)
+    return dict(stats, bytes=[before, len(data)])
+
+
+def print_report(name, stats):
+    before, after = stats["bytes"]
+    if "skipped" in stats:
+        print(f"  {name:<28} {before / 1024:8.0f}KB  skipped ({stats['skipped']})")
+        return
+    print(f"  {name:<28} {before / 1024:8.0f}KB -> {after / 1024:6.0f}KB  "
+          f"{stats['primitives']} primitive(s), {stats['vertices']} verts, mean occlusion {stats['occlusion']:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake occlusion and static lighting into COLOR_0 in place.")
+    parser.add_argument("paths", nargs="+", help="uncompressed, unquantized GLB files")
+    parser.add_argument("--mode", choices=MODES, default="full",
+                        help="ao: occlusion only, lit by Lambert; full: shaded colors for an unlit material")
+    parser.add_argument("--dry-run", action="store_true", help="report without rewriting the files")
+    args = parser.parse_args()
+
+    print(f"=== Baking {args.mode} vertex lighting ({DIRECTIONS} directions, {RESOLUTION}px depth maps) ===")
+    for path in args.paths:
+        print_report(path, bake_file(path, args.mode, args.dry_run))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Keep one Blender session warm and rebuild skill models as their sources change.
+
+Loads generate-skill-models.py as a module, builds the selected models once,
+then polls scripts/ for edits:
+  - an edit inside a make_* builder rebuilds that model only
+  - an edit anywhere else in the generator, or in a module the export path
+    imports (BUILD_MODULES), rebuilds every watched model
+  - an edit to the atlas, turntable or manifest code only republishes
+Changed sources are reloaded before the rebuild, so edits take effect
+without restarting Blender. clear_scene() purges orphan datablocks, so
+memory stays flat however long the session runs; each round prints the
+session's datablock count and resident memory. Rebuild times are the
+model's own build time, next to the Blender startup a cold run would add.
+
+Flags other than --interval go to generate-skill-models.py.
+Run: blender --background --python scripts/watch-models.py -- [--only react,rust] [--interval 0.5] [--construction bmesh]
+     python scripts/watch-models.py --backend numpy [--only react]
+"""
+
+import argparse
+import ast
+import importlib.util
+import os
+import sys
+import time
+import traceback
+
+try:
+    import bpy
+except ImportError:  # plain Python: only the NumPy backend is available
+    bpy = None
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+
+from profiling import process_age  # noqa: E402
+
+GENERATOR = os.path.join(SCRIPTS_DIR, "generate-skill-models.py")
+# Imported by the generator while building and exporting; an edit rebuilds everything
+BUILD_MODULES = ("bmesh_backend", "numpy_backend", "glb_optimize", "gltf_io", "material_palette", "vertex_lighting")
+# Only used once the models are written
+PUBLISH_MODULES = ("skill_atlas", "turntable", "model_manifest")
+
+
+def read_source(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def module_path(name):
+    return os.path.join(SCRIPTS_DIR, f"{name}.py")
+
+
+def parse_args():
+    # Blender passes everything after "--" through to the script untouched
+    if bpy is None:
+        argv = sys.argv[1:]
+    else:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(prog="watch-models.py",
+                                     epilog="Other flags are passed to generate-skill-models.py.")
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between checks of scripts/")
+    return parser.parse_known_args(argv)
+
+
+def generator_sections(source):
+    """(everything outside the builders, {model: make_* source})."""
+    tree = ast.parse(source)
+    shared = []
+    builders = {}
+    for node in tree.body:
+        segment = ast.get_source_segment(source, node)
+        if isinstance(node, ast.FunctionDef) and node.name.startswith("make_"):
+            builders[node.name[len("make_"):]] = segment
+        else:
+            shared.append(segment)
+    return "\n".join(shared), builders
+
+
+def affected_models(before, after, names):
+    """Models whose builder, or the code every builder shares, changed."""
+    shared_before, builders_before = generator_sections(before)
+    shared_after, builders_after = generator_sections(after)
+    if shared_before != shared_after:
+        return list(names)
+    return [n for n in names if builders_before.get(n) != builders_after.get(n)]
+
+
+def load_generator(argv):
+    """A fresh copy of generate-skill-models.py, configured from argv."""
+    spec = importlib.util.spec_from_file_location("generate_skill_models", GENERATOR)
+    generator = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(generator)
+    args = generator.parse_args(argv)
+    generator.configure(args)
+    return generator, args
+
+
+def forget_modules(names):
+    # The generator imports its helpers lazily, so the next build re-imports them
+    for name in names:
+        sys.modules.pop(name, None)
+
+
+def resident_kb():
+    try:
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def session_stats():
+    parts = []
+    if bpy is not None:
+        collections = (bpy.data.objects, bpy.data.meshes, bpy.data.materials, bpy.data.curves,
+                       bpy.data.fonts, bpy.data.node_groups, bpy.data.images)
+        parts.append(f"{sum(len(c) for c in collections)} datablocks")
+    rss = resident_kb()
+    if rss is not None:
+        parts.append(f"{rss / 1024:.0f}MB resident")
+    return ", ".join(parts)
+
+
+def build(generator, names, startup):
+    built = []
+    for name in names:
+        start = time.perf_counter()
+        try:
+            generator.BUILDERS[name]()
+        except (Exception, SystemExit):  # over-budget exports raise SystemExit
+            traceback.print_exc()
+            print(f"  FAILED {name} after {time.perf_counter() - start:.2f}s")
+            continue
+        built.append(name)
+        cold = f" (a cold run adds {startup:.2f}s of startup)" if startup else ""
+        print(f"  Built {name} in {time.perf_counter() - start:.2f}s{cold}")
+    return built
+
+
+def publish(generator, args):
+    if not args.publish:
+        return
+    try:
+        generator.publish()
+    except (Exception, SystemExit):
+        traceback.print_exc()
+        print("  FAILED to publish")
+
+
+def snapshot():
+    paths = [GENERATOR] + [module_path(m) for m in BUILD_MODULES + PUBLISH_MODULES]
+    return {p: os.stat(p).st_mtime_ns if os.path.exists(p) else None for p in paths}
+
+
+def main():
+    startup = process_age()
+    options, argv = parse_args()
+    generator, args = load_generator(argv)
+    source = read_source(GENERATOR)
+    modules = {m: read_source(module_path(m)) for m in BUILD_MODULES + PUBLISH_MODULES}
+    names = generator.select_builders(args.only)
+
+    print(f"=== Warm session ready after {startup or 0:.2f}s; building {len(names)} model(s) ===")
+    if build(generator, names, startup):
+        publish(generator, args)
+    print(f"  Session: {session_stats()}")
+    print(f"=== Watching {SCRIPTS_DIR} (Ctrl+C to stop) ===")
+
+    mtimes = snapshot()
+    while True:
+        time.sleep(options.interval)
+        now = snapshot()
+        if now == mtimes:
+            continue
+        mtimes = now
+        edited = {m for m in modules if os.path.exists(module_path(m)) and read_source(module_path(m)) != modules[m]}
+        new_source = read_source(GENERATOR)
+        if not edited and new_source == source:
+            continue
+        try:
+            forget_modules(BUILD_MODULES + PUBLISH_MODULES)
+            fresh, fresh_args = load_generator(argv)
+            fresh_names = fresh.select_builders(fresh_args.only)
+            rebuild = affected_models(source, new_source, fresh_names)
+        except (Exception, SystemExit):
+            # Keep the last good copy; the next save is compared against it
+            traceback.print_exc()
+            print("  Not rebuilding until generate-skill-models.py loads again")
+            continue
+        changed = sorted(f"{m}.py" for m in edited)
+        if new_source != source:
+            changed.insert(0, "generate-skill-models.py")
+        generator, args, source = fresh, fresh_args, new_source
+        for m in edited:
+            modules[m] = read_source(module_path(m))
+        if edited & set(BUILD_MODULES):
+            rebuild = fresh_names
+        print(f"=== {', '.join(changed)} changed; rebuilding {', '.join(rebuild) or 'nothing'} ===")
+        if rebuild:
+            build(generator, rebuild, startup)
+        if rebuild or edited & set(PUBLISH_MODULES):
+            publish(generator, args)
+        print(f"  Session: {session_stats()}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("=== Stopped watching ===")
@@ -1,11 +1,17 @@
 'use client';
 
-import { useRef, useEffect, useState, useCallback } from 'react';
+import { Suspense, useRef, useEffect, useState, useCallback } from 'react';
 import { useFrame } from '@react-three/fiber';
 import { useGLTF, useAnimations } from '@react-three/drei';
 import * as THREE from 'three';
+import { modelUrl } from '@/lib/modelAssets';
 
-const MODEL_PATH = '/models/robot-expressive.glb';
+// Compressed by scripts/compress-animations.py --split: the model carries
+// only Idle, every other clip is its own small file bound to the skeleton
+// by joint name.
+const MODEL_PATH = modelUrl('robot-expressive/robot.glb');
+const CYCLE_CLIPS = ['Wave', 'ThumbsUp', 'Dance', 'Yes'];
+const CLIP_PATHS = CYCLE_CLIPS.map((name) => modelUrl(`robot-expressive/clips/${name}.glb`));
 
 // Preload the model
 useGLTF.preload(MODEL_PATH);
@@ -16,10 +22,20 @@ useGLTF.preload(MODEL_PATH);
  * Sitting, Standing, ThumbsUp, Walking, WalkJump, Wave, Yes
  */
 
+// Loads the cycled clips after the model is on screen
+function ExtraClips({ onLoad }: { onLoad: (clips: THREE.AnimationClip[]) => void }) {
+  const gltfs = useGLTF(CLIP_PATHS);
+  useEffect(() => {
+    onLoad(gltfs.flatMap((gltf) => gltf.animations));
+  }, [gltfs, onLoad]);
+  return null;
+}
+
 export function AnimatedCharacter() {
   const groupRef = useRef<THREE.Group>(null);
   const { scene, animations } = useGLTF(MODEL_PATH);
   const { actions, mixer } = useAnimations(animations, groupRef);
+  const [extraClips, setExtraClips] = useState<THREE.AnimationClip[]>([]);
   const [currentAction, setCurrentAction] = useState('Idle');
   const bobOffset = useRef(0);
 
@@ -31,12 +47,21 @@ export function AnimatedCharacter() {
     }
   }, [actions]);
 
+  const getAction = useCallback(
+    (name: string) => {
+      if (actions[name]) return actions[name];
+      const clip = extraClips.find((c) => c.name === name);
+      return clip && groupRef.current ? mixer.clipAction(clip, groupRef.current) : null;
+    },
+    [actions, extraClips, mixer]
+  );
+
   const playAction = useCallback(
     (name: string) => {
-      if (!actions[name] || name === currentAction) return;
+      const next = getAction(name);
+      if (!next || name === currentAction) return;
 
-      const prev = actions[currentAction];
-      const next = actions[name];
+      const prev = getAction(currentAction);
 
       if (prev) prev.fadeOut(0.4);
       if (next) {
@@ -59,18 +84,17 @@ export function AnimatedCharacter() {
       }
       setCurrentAction(name);
     },
-    [actions, currentAction, mixer]
+    [actions, currentAction, getAction, mixer]
   );
 
   // Cycle through fun animations periodically
   useEffect(() => {
-    const animations = ['Wave', 'ThumbsUp', 'Dance', 'Yes'];
     let idx = 0;
 
     const interval = setInterval(() => {
       if (currentAction === 'Idle') {
-        playAction(animations[idx]);
-        idx = (idx + 1) % animations.length;
+        playAction(CYCLE_CLIPS[idx]);
+        idx = (idx + 1) % CYCLE_CLIPS.length;
       }
     }, 5000);
 
@@ -88,6 +112,9 @@ export function AnimatedCharacter() {
   return (
     <group ref={groupRef} position={[0, -1.2, 0]} scale={0.9}>
       <primitive object={scene} />
+      <Suspense fallback={null}>
+        <ExtraClips onLoad={setExtraClips} />
+      </Suspense>
     </group>
   );
 }
@@ -1,8 +1,15 @@
 'use client';
 
 import { useRef, useEffect, useState, useMemo } from 'react';
-import { useFrame } from '@react-three/fiber';
+import { useFrame, useThree } from '@react-three/fiber';
 import * as THREE from 'three';
+import { KTX2Loader } from 'three/examples/jsm/loaders/KTX2Loader.js';
+import {
+  BASIS_TRANSCODER_PATH,
+  globeTextureUrl,
+  pickGlobeTier,
+  type GlobeTextureFile,
+} from '@/lib/globeTextures';
 
 const GLOBE_RADIUS = 1.8;
 
@@ -42,22 +49,70 @@ const ARCS: [number, number][] = [
   [9, 10], // Mexico City → São Paulo
 ];
 
-function useTexture(url: string) {
-  const [texture, setTexture] = useState<THREE.Texture | null>(null);
+interface GlobeTextures {
+  day: THREE.Texture;
+  relief: THREE.Texture;
+}
+
+/** Day map and packed relief map for this device's tier, as KTX2 when the tier has it */
+function useGlobeTextures() {
+  const gl = useThree((state) => state.gl);
+  const [textures, setTextures] = useState<GlobeTextures | null>(null);
+
   useEffect(() => {
-    const loader = new THREE.TextureLoader();
-    loader.load(url, (tex) => {
-      tex.colorSpace = THREE.SRGBColorSpace;
-      setTexture(tex);
-    });
+    const tier = pickGlobeTier(gl.capabilities.maxTextureSize, window.screen.width * window.devicePixelRatio);
+    const { day, relief } = tier.files;
+    const ktx2Loader = day.ktx2 || relief.ktx2
+      ? new KTX2Loader().setTranscoderPath(BASIS_TRANSCODER_PATH).detectSupport(gl)
+      : null;
+    const imageLoader = new THREE.TextureLoader();
+    // A missing transcoder or unsupported file falls back to the JPEG/PNG tier
+    const load = (file: GlobeTextureFile): Promise<THREE.Texture> => {
+      const fallback = () => imageLoader.loadAsync(globeTextureUrl(file, false));
+      return ktx2Loader && file.ktx2
+        ? ktx2Loader.loadAsync(globeTextureUrl(file, true)).catch(fallback)
+        : fallback();
+    };
+
+    let cancelled = false;
+    let loaded: GlobeTextures | null = null;
+    Promise.all([load(day), load(relief)])
+      .then(([dayMap, reliefMap]) => {
+        // KTX2 files carry their own color space; the fallbacks need it set
+        if (!(dayMap instanceof THREE.CompressedTexture)) dayMap.colorSpace = THREE.SRGBColorSpace;
+        reliefMap.colorSpace = THREE.NoColorSpace;
+        loaded = { day: dayMap, relief: reliefMap };
+        if (cancelled) {
+          dayMap.dispose();
+          reliefMap.dispose();
+        } else {
+          setTextures(loaded);
+        }
+      })
+      .catch(() => {})
+      .finally(() => ktx2Loader?.dispose());
+
     return () => {
-      texture?.dispose();
+      cancelled = true;
+      loaded?.day.dispose();
+      loaded?.relief.dispose();
     };
-    // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [url]);
-  return texture;
+  }, [gl]);
+
+  return textures;
+}
+
+// The relief map packs topology into R and the water mask into G. bumpMap
+// already samples R; point the specular lookup at G.
+function unpackRelief(shader: THREE.WebGLProgramParametersWithUniforms) {
+  shader.fragmentShader = shader.fragmentShader.replace(
+    '#include <specularmap_fragment>',
+    THREE.ShaderChunk.specularmap_fragment.replace('texelSpecular.r', 'texelSpecular.g')
+  );
 }
 
+const reliefProgramKey = () => 'globe-relief';
+
 function latLngToVec3(lat: number, lng: number, radius: number): THREE.Vector3 {
   const phi = (90 - lat) * (Math.PI / 180);
   const theta = (lng + 180) * (Math.PI / 180);
@@ -68,61 +123,36 @@ function latLngToVec3(lat: number, lng: number, radius: number): THREE.Vector3 {
   );
 }
 
-function coordsToPoints(coords: number[][], radius: number): THREE.Vector3[] {
-  return coords.map(([lng, lat]) => latLngToVec3(lat, lng, radius));
-}
-
-interface GeoJSONGeometry {
-  type: string;
-  coordinates: number[][][] | number[][][][];
+interface CountryLines {
+  array: Int16Array | Float32Array;
+  normalized: boolean;
 }
 
-interface GeoJSONFeature {
-  type: string;
-  geometry: GeoJSONGeometry;
-}
-
-interface GeoJSONData {
-  type: string;
-  features: GeoJSONFeature[];
+const COUNTRY_LINES_MAGIC = 0x314e4c43; // "CLN1"
+
+/** Wrap the buffer written by scripts/generate-country-lines.py without copying */
+function parseCountryLines(buf: ArrayBuffer): CountryLines | null {
+  const header = new DataView(buf, 0, 16);
+  if (header.getUint32(0, true) !== COUNTRY_LINES_MAGIC) return null;
+  const count = header.getUint32(4, true);
+  const quantized = (header.getUint32(8, true) & 1) === 1;
+  return quantized
+    ? { array: new Int16Array(buf, 16, count * 3), normalized: true }
+    : { array: new Float32Array(buf, 16, count * 3), normalized: false };
 }
 
+/** Country border segments on the unit sphere, ready for a BufferAttribute */
 function useCountryLines() {
-  const [geojson, setGeojson] = useState<GeoJSONData | null>(null);
+  const [lines, setLines] = useState<CountryLines | null>(null);
 
   useEffect(() => {
-    fetch('/data/world-110m.geojson')
-      .then((r) => r.json())
-      .then(setGeojson)
+    fetch('/data/country-lines.bin')
+      .then((r) => r.arrayBuffer())
+      .then((buf) => setLines(parseCountryLines(buf)))
       .catch(() => {});
   }, []);
 
-  return useMemo(() => {
-    if (!geojson) return null;
-
-    const positions: number[] = [];
-
-    for (const feature of geojson.features) {
-      const { type, coordinates } = feature.geometry;
-
-      const rings: number[][][] =
-        type === 'Polygon'
-          ? (coordinates as number[][][])
-          : type === 'MultiPolygon'
-            ? (coordinates as number[][][][]).flat()
-            : [];
-
-      for (const ring of rings) {
-        const pts = coordsToPoints(ring, GLOBE_RADIUS + 0.002);
-        for (let i = 0; i < pts.length - 1; i++) {
-          positions.push(pts[i].x, pts[i].y, pts[i].z);
-          positions.push(pts[i + 1].x, pts[i + 1].y, pts[i + 1].z);
-        }
-      }
-    }
-
-    return new Float32Array(positions);
-  }, [geojson]);
+  return lines;
 }
 
 /** Build a curved arc between two points on the globe */
@@ -256,11 +286,9 @@ function PulseRing({ position }: { position: THREE.Vector3 }) {
 export function Globe() {
   const groupRef = useRef<THREE.Group>(null);
   const atmosphereRef = useRef<THREE.Mesh>(null);
-  const countryPositions = useCountryLines();
+  const countryLines = useCountryLines();
 
-  const dayMap = useTexture('/textures/earth-day.jpg');
-  const bumpMap = useTexture('/textures/earth-topology.png');
-  const specMap = useTexture('/textures/earth-water.png');
+  const textures = useGlobeTextures();
 
   // Pre-compute city positions and arc data
   const cityPositions = useMemo(
@@ -300,12 +328,14 @@ export function Globe() {
       {/* Textured earth sphere */}
       <mesh>
         <sphereGeometry args={[GLOBE_RADIUS, 64, 64]} />
-        {dayMap ? (
+        {textures ? (
           <meshPhongMaterial
-            map={dayMap}
-            bumpMap={bumpMap ?? undefined}
+            map={textures.day}
+            bumpMap={textures.relief}
             bumpScale={0.03}
-            specularMap={specMap ?? undefined}
+            specularMap={textures.relief}
+            onBeforeCompile={unpackRelief}
+            customProgramCacheKey={reliefProgramKey}
             specular={new THREE.Color(0x333333)}
             shininess={15}
           />
@@ -326,12 +356,12 @@ export function Globe() {
       </mesh>
 
       {/* Country border outlines */}
-      {countryPositions && (
-        <lineSegments>
+      {countryLines && (
+        <lineSegments scale={GLOBE_RADIUS + 0.002}>
           <bufferGeometry>
             <bufferAttribute
               attach="attributes-position"
-              args={[countryPositions, 3]}
+              args={[countryLines.array, 3, countryLines.normalized]}
             />
           </bufferGeometry>
           <lineBasicMaterial color="#ffffff" transparent opacity={0.15} />
@@ -4,13 +4,31 @@ import { useRef } from 'react';
 import { useFrame } from '@react-three/fiber';
 import { useGLTF } from '@react-three/drei';
 import * as THREE from 'three';
+import { getModelAsset, modelUrl } from '@/lib/modelAssets';
+
+const FULL_HERO = 'hero-sculpture.glb';
+// The low-poly variant with a baked normal map has the same silhouette at a
+// fraction of the vertex cost, which matters on phones; desktops keep the
+// full mesh. scripts/model_manifest.py only publishes it from `--bake`
+// builds where it has fewer triangles than the full mesh.
+const BAKED_HERO = 'hero-sculpture-baked.glb';
+const HAS_BAKED_HERO = getModelAsset(BAKED_HERO) !== undefined;
+// useIsMobile() is false until its effect runs; checking the same query up
+// front keeps phones from fetching the full mesh first
+const STARTS_MOBILE = typeof window !== 'undefined' && window.matchMedia('(max-width: 768px)').matches;
+
+function heroModel(lowPoly: boolean) {
+  const name = lowPoly && HAS_BAKED_HERO ? BAKED_HERO : FULL_HERO;
+  return { url: modelUrl(name), draco: getModelAsset(name)?.dracoDecoderPath ?? '/draco/' };
+}
 
 interface HeroSceneProps {
   isMobile?: boolean;
 }
 
 function Sculpture({ isMobile }: { isMobile?: boolean }) {
-  const { scene } = useGLTF('/models/hero-sculpture.glb', '/draco/');
+  const hero = heroModel(Boolean(isMobile) || STARTS_MOBILE);
+  const { scene } = useGLTF(hero.url, hero.draco);
   const groupRef = useRef<THREE.Group>(null);
 
   const baseScale = isMobile ? 1.8 : 2.4;
@@ -57,4 +75,5 @@ export function HeroScene({ isMobile }: HeroSceneProps) {
   );
 }
 
-useGLTF.preload('/models/hero-sculpture.glb', '/draco/');
+const initialHero = heroModel(STARTS_MOBILE);
+useGLTF.preload(initialHero.url, initialHero.draco);
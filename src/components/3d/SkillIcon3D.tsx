@@ -12,11 +12,40 @@ interface SkillIcon3DProps {
   isHovered?: boolean;
 }
 
+/**
+ * Models built with --bake-lighting ao carry occlusion in their vertex
+ * colors; a Lambert material lit by the scene is enough for them. Fully
+ * baked models load as unlit materials and need nothing here.
+ */
+function withBakedShading(root: THREE.Object3D) {
+  const lambert = new Map<THREE.Material, THREE.Material>();
+  root.traverse((obj) => {
+    if (!(obj instanceof THREE.Mesh)) return;
+    const source = obj.material as THREE.MeshStandardMaterial;
+    if (source.userData?.bakedLighting !== 'ao') return;
+    if (!lambert.has(source)) {
+      lambert.set(
+        source,
+        new THREE.MeshLambertMaterial({
+          name: source.name,
+          color: source.color,
+          emissive: source.emissive,
+          emissiveIntensity: source.emissiveIntensity,
+          vertexColors: true,
+          side: source.side,
+        })
+      );
+    }
+    obj.material = lambert.get(source);
+  });
+  return root;
+}
+
 function SkillModel({ modelPath, isHovered }: { modelPath: string; isHovered?: boolean }) {
   const groupRef = useRef<THREE.Group>(null);
   const scaleRef = useRef(1);
   const { scene } = useGLTF(modelPath);
-  const clonedScene = useMemo(() => scene.clone(true), [scene]);
+  const clonedScene = useMemo(() => withBakedShading(scene.clone(true)), [scene]);
 
   useFrame(() => {
     if (!groupRef.current) return;
@@ -7,6 +7,8 @@ import { motion, useInView } from 'framer-motion';
 import { cn } from '@/lib/utils';
 import { staggerItem } from '@/lib/animations';
 import { useTilt } from '@/hooks/useTilt';
+import { useReducedMotion } from '@/hooks/useReducedMotion';
+import { SkillTurntable } from '@/components/SkillTurntable';
 import type { Skill } from '@/data/types';
 
 const iconMap: Record<string, string> = {
@@ -26,6 +28,7 @@ interface SkillCardProps {
 export function SkillCard({ skill, className }: SkillCardProps) {
   const emoji = iconMap[skill.icon] ?? skill.icon;
   const [isHovered, setIsHovered] = useState(false);
+  const prefersReducedMotion = useReducedMotion();
   const barRef = useRef<HTMLDivElement>(null);
   const isInView = useInView(barRef, { once: true, amount: 0.5 });
   const { ref, onMouseMove, onMouseLeave } = useTilt<HTMLDivElement>({
@@ -55,7 +58,15 @@ export function SkillCard({ skill, className }: SkillCardProps) {
         )}
       >
         <div className="flex items-center gap-3">
-          {skill.logoPath ? (
+          {skill.turntable && !prefersReducedMotion ? (
+            // Spins the pre-rendered model on hover, no WebGL context per card
+            <SkillTurntable
+              turntable={skill.turntable}
+              size={40}
+              playing={isHovered}
+              className="h-10 w-10 flex-shrink-0"
+            />
+          ) : skill.logoPath ? (
             <div
               className={cn(
                 'h-10 w-10 flex-shrink-0 transition-transform duration-200',
@@ -0,0 +1,34 @@
+'use client';
+
+import { cn } from '@/lib/utils';
+import type { Turntable } from '@/lib/turntables';
+
+interface SkillTurntableProps {
+  turntable: Turntable;
+  size: number;
+  playing?: boolean;
+  className?: string;
+}
+
+/**
+ * Pre-rendered turntable of a skill model (scripts/turntable.py), stepped
+ * through with a CSS animation so cards don't need a WebGL context each.
+ */
+export function SkillTurntable({ turntable, size, playing = true, className }: SkillTurntableProps) {
+  const { url, frames, duration } = turntable;
+  return (
+    <div
+      aria-hidden="true"
+      className={cn('bg-no-repeat', className)}
+      style={{
+        width: size,
+        height: size,
+        backgroundImage: `url(${url})`,
+        backgroundSize: `${frames * size}px ${size}px`,
+        // jump-none holds the first and last frame for a full step each
+        animation: `turntable ${duration}s steps(${frames}, jump-none) infinite`,
+        animationPlayState: playing ? 'running' : 'paused',
+      }}
+    />
+  );
+}
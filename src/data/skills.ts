@@ -1,4 +1,6 @@
 import { Skill } from './types';
+import { modelUrl } from '@/lib/modelAssets';
+import { getTurntable } from '@/lib/turntables';
 
 export const skills: Skill[] = [
   {
@@ -9,7 +11,8 @@ export const skills: Skill[] = [
     proficiency: 90,
     icon: 'react',
     logoPath: '/logos/skills/react.svg',
-    modelPath: '/models/skills/react.glb',
+    modelPath: modelUrl('skills/react.glb'),
+    turntable: getTurntable('react'),
     description:
       'Building fast, interactive UIs with React and production-grade apps with Next.js.',
     longDescription:
@@ -89,7 +92,8 @@ export const skills: Skill[] = [
     proficiency: 85,
     icon: 'typescript',
     logoPath: '/logos/skills/typescript.svg',
-    modelPath: '/models/skills/typescript.glb',
+    modelPath: modelUrl('skills/typescript.glb'),
+    turntable: getTurntable('typescript'),
     description:
       'Writing type-safe code that catches bugs at compile time, not in production.',
     longDescription:
@@ -169,7 +173,8 @@ export const skills: Skill[] = [
     proficiency: 85,
     icon: 'nodejs',
     logoPath: '/logos/skills/nodejs.svg',
-    modelPath: '/models/skills/nodejs.glb',
+    modelPath: modelUrl('skills/nodejs.glb'),
+    turntable: getTurntable('nodejs'),
     description:
       'Designing APIs and backend systems that are fast, reliable, and easy to maintain.',
     longDescription:
@@ -249,7 +254,8 @@ export const skills: Skill[] = [
     proficiency: 80,
     icon: 'database',
     logoPath: '/logos/skills/database.svg',
-    modelPath: '/models/skills/database.glb',
+    modelPath: modelUrl('skills/database.glb'),
+    turntable: getTurntable('database'),
     description:
       'Modeling data that scales well and writing queries that stay fast as tables grow.',
     longDescription:
@@ -328,7 +334,8 @@ export const skills: Skill[] = [
     proficiency: 75,
     icon: 'design',
     logoPath: '/logos/skills/design.svg',
-    modelPath: '/models/skills/design.glb',
+    modelPath: modelUrl('skills/design.glb'),
+    turntable: getTurntable('design'),
     description:
       'Designing interfaces that look great and feel intuitive, from wireframe to polished pixel.',
     longDescription:
@@ -408,7 +415,8 @@ export const skills: Skill[] = [
     proficiency: 70,
     icon: 'ai',
     logoPath: '/logos/skills/ai.svg',
-    modelPath: '/models/skills/ai.glb',
+    modelPath: modelUrl('skills/ai.glb'),
+    turntable: getTurntable('ai'),
     description:
       'Integrating large language models and ML pipelines into real products people use daily.',
     longDescription:
@@ -483,7 +491,8 @@ export const skills: Skill[] = [
     proficiency: 75,
     icon: 'c',
     logoPath: '/logos/skills/c.svg',
-    modelPath: '/models/skills/c.glb',
+    modelPath: modelUrl('skills/c.glb'),
+    turntable: getTurntable('c'),
     description:
       'Writing efficient, low-level systems code with manual memory management and hardware awareness.',
     longDescription:
@@ -559,7 +568,8 @@ export const skills: Skill[] = [
     proficiency: 65,
     icon: 'rust',
     logoPath: '/logos/skills/rust.svg',
-    modelPath: '/models/skills/rust.glb',
+    modelPath: modelUrl('skills/rust.glb'),
+    turntable: getTurntable('rust'),
     description:
       'Building safe, concurrent systems with zero-cost abstractions and no garbage collector.',
     longDescription:
@@ -635,7 +645,8 @@ export const skills: Skill[] = [
     proficiency: 80,
     icon: 'python',
     logoPath: '/logos/skills/python.svg',
-    modelPath: '/models/skills/python.glb',
+    modelPath: modelUrl('skills/python.glb'),
+    turntable: getTurntable('python'),
     description:
       'Scripting, automation, data processing, and rapid prototyping with clean, readable code.',
     longDescription:
@@ -711,7 +722,8 @@ export const skills: Skill[] = [
     proficiency: 70,
     icon: 'networking',
     logoPath: '/logos/skills/networking.svg',
-    modelPath: '/models/skills/networking.glb',
+    modelPath: modelUrl('skills/networking.glb'),
+    turntable: getTurntable('networking'),
     description:
       'Understanding network protocols, architecture, and security from the physical layer to the application layer.',
     longDescription:
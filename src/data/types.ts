@@ -1,3 +1,5 @@
+import type { Turntable } from '@/lib/turntables';
+
 export interface Project {
   id: string;
   slug: string;
@@ -34,6 +36,7 @@ export interface Skill {
   icon: string; // emoji or icon name
   logoPath?: string; // path to logo SVG/PNG in /public
   modelPath?: string; // path to 3D GLB model in /public
+  turntable?: Turntable; // pre-rendered sprite strip of the model
   description: string;
   longDescription: string;
   highlights: string[];
@@ -0,0 +1,33 @@
+import manifest from '@/data/globe-textures.json';
+
+export interface GlobeTextureFile {
+  fallback: string;
+  fallbackBytes: number;
+  ktx2?: string;
+  ktx2Bytes?: number;
+}
+
+export interface GlobeTextureTier {
+  label: string;
+  width: number;
+  height: number;
+  files: { day: GlobeTextureFile; relief: GlobeTextureFile };
+}
+
+const { base, tiers } = manifest as { base: string; tiers: GlobeTextureTier[] };
+
+export const BASIS_TRANSCODER_PATH = '/basis/';
+
+// Generated by scripts/generate-globe-textures.py. Picks the smallest tier at
+// least as wide as the screen in device pixels (the globe never shows more
+// than half the map across its diameter), within the GPU's texture limit.
+export function pickGlobeTier(maxTextureSize: number, screenPixels: number): GlobeTextureTier {
+  const usable = tiers.filter((tier) => tier.width <= maxTextureSize);
+  const candidates = usable.length > 0 ? usable : tiers.slice(0, 1);
+  return candidates.find((tier) => tier.width >= screenPixels) ?? candidates[candidates.length - 1];
+}
+
+/** URL of a tier file, preferring the KTX2 encoding when the GPU can transcode it */
+export function globeTextureUrl(file: GlobeTextureFile, ktx2: boolean): string {
+  return base + (ktx2 && file.ktx2 ? file.ktx2 : file.fallback);
+}
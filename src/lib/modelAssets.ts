@@ -0,0 +1,22 @@
+import manifest from '@/data/model-manifest.json';
+
+export interface ModelAsset {
+  url: string;
+  bytes: number;
+  sha256: string;
+  boundingSphere: { center: [number, number, number]; radius: number };
+  priority: 'high' | 'auto' | 'low';
+  dracoDecoderPath: string | null;
+}
+
+const models = manifest as Record<string, ModelAsset>;
+
+// Generated by scripts/model_manifest.py. Falls back to the fixed name so a
+// model that has not been published yet still loads in development.
+export function getModelAsset(name: string): ModelAsset | undefined {
+  return models[name];
+}
+
+export function modelUrl(name: string): string {
+  return models[name]?.url ?? `/models/${name}`;
+}
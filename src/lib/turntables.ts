@@ -0,0 +1,17 @@
+import metadata from '@/data/skill-turntables.json';
+
+export interface Turntable {
+  url: string;
+  bytes: number;
+  frames: number;
+  frameWidth: number;
+  frameHeight: number;
+  duration: number;
+}
+
+const turntables = metadata as Record<string, Turntable>;
+
+// Generated by scripts/turntable.py: one strip of frames per skill model
+export function getTurntable(name: string): Turntable | undefined {
+  return turntables[name];
+}
@@ -1,4 +1,6 @@
 import { describe, it, expect } from 'vitest';
+import { existsSync } from 'node:fs';
+import { join } from 'node:path';
 import { skills, getSkillBySlug, getSkillsByCategory } from '@/data/skills';
 import { projects } from '@/data/projects';
 
@@ -48,4 +50,19 @@ describe('getSkillsByCategory', () => {
     expect(frontend.length).toBeGreaterThan(0);
     expect(frontend.every((s) => s.category === 'frontend')).toBe(true);
   });
+
+  it('all modelPaths point at published content-hashed files', () => {
+    for (const s of skills) {
+      expect(s.modelPath).toMatch(/\.[0-9a-f]{12}\.glb$/);
+      expect(existsSync(join(process.cwd(), 'public', s.modelPath!))).toBe(true);
+    }
+  });
+
+  it('every skill model has a rendered turntable strip', () => {
+    for (const s of skills.filter((skill) => skill.modelPath)) {
+      expect(s.turntable).toBeDefined();
+      const file = s.turntable!.url.split('?')[0];
+      expect(existsSync(join(process.cwd(), 'public', file))).toBe(true);
+    }
+  });
 });
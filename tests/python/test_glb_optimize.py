@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+import numpy_backend as nb
+from glb_optimize import EXTENSION, SHORT, acmr_misses, optimize_file
+from gltf_io import encode_glb, read_accessor, read_floats, read_glb
+from model_manifest import placements
+
+# Well above the int16 rounding error of these unit-sized scenes
+TOLERANCE = 1e-4
+
+
+@pytest.fixture(autouse=True)
+def scene():
+    nb.clear_scene()
+    nb.OPTIONS["gpu_instances"] = True
+    yield
+    nb.clear_scene()
+    nb.OPTIONS["gpu_instances"] = True
+
+
+def world_triangles(path):
+    """(triangles, 3, 3) world-space corners of every placed primitive."""
+    gltf, binary = read_glb(path)
+    found = []
+    for mesh, matrix in placements(gltf, binary):
+        for primitive in gltf["meshes"][mesh]["primitives"]:
+            positions = read_floats(gltf, binary, primitive["attributes"]["POSITION"])
+            world = positions @ matrix[:3, :3].T + matrix[:3, 3]
+            found.append(world[read_accessor(gltf, binary, primitive["indices"]).reshape(-1, 3)])
+    return np.concatenate(found)
+
+
+def canonical(triangles, vertices):
+    """Triangles as sorted index triples into vertices, rotated to keep their winding."""
+    corners = triangles.reshape(-1, 3)
+    distance = np.linalg.norm(corners[:, None] - vertices[None], axis=2)
+    assert distance.min(axis=1).max() < TOLERANCE
+    indices = distance.argmin(axis=1).reshape(-1, 3)
+    rolled = np.array([np.roll(t, -int(np.argmin(t))) for t in indices])
+    return rolled[np.lexsort(rolled.T[::-1])]
+
+
+def assert_same_surface(before, after):
+    vertices = np.unique(before.reshape(-1, 3), axis=0)
+    np.testing.assert_array_equal(canonical(after, vertices), canonical(before, vertices))
+
+
+def write_scene(path, shift=(0.25, -0.5, 0.75)):
+    """Write the scene with every mesh moved off its local origin, which the folded offset has to undo."""
+    nb.write_glb(str(path))
+    gltf, binary = read_glb(str(path))
+    binary = bytearray(binary)
+    for mesh in gltf["meshes"]:
+        accessor = gltf["accessors"][mesh["primitives"][0]["attributes"]["POSITION"]]
+        start = gltf["bufferViews"][accessor["bufferView"]]["byteOffset"]
+        positions = (np.frombuffer(binary, np.float32, accessor["count"] * 3, start).reshape(-1, 3) + shift).astype(np.float32)
+        binary[start:start + positions.nbytes] = positions.tobytes()
+        accessor.update(min=positions.min(axis=0).tolist(), max=positions.max(axis=0).tolist())
+    path.write_bytes(encode_glb(gltf, bytes(binary)))
+    return world_triangles(str(path))
+
+
+def test_acmr_misses():
+    assert acmr_misses(np.array([0, 1, 2, 2, 1, 3])) == 4
+    # A 3-entry FIFO has evicted vertex 0 by the time it comes back
+    assert acmr_misses(np.array([0, 1, 2, 3, 0]), cache_size=3) == 5
+
+
+def test_quantized_positions_keep_world_space(tmp_path):
+    sphere = nb.add_uv_sphere(0.5, (0.3, -0.2, 0.1), segments=24, ring_count=12)
+    nb.apply_scale(sphere, (1.0, 1.5, 1.0))
+    nb.add_torus(0.6, 0.15, (0, 0, 0.4), rotation=(0.4, 0.2, 0.0))
+    path = tmp_path / "scene.glb"
+    before = write_scene(path)
+
+    stats = optimize_file(str(path))
+    assert stats["maxPositionError"] < TOLERANCE
+    gltf, binary = read_glb(str(path))
+    assert EXTENSION in gltf["extensionsRequired"]
+    for mesh in gltf["meshes"]:
+        for primitive in mesh["primitives"]:
+            assert gltf["accessors"][primitive["attributes"]["POSITION"]]["componentType"] == SHORT
+    assert_same_surface(before, world_triangles(str(path)))
+
+
+def test_reorder_lowers_acmr(tmp_path):
+    nb.add_uv_sphere(0.5, (0, 0, 0), segments=64, ring_count=32)
+    path = tmp_path / "sphere.glb"
+    nb.write_glb(str(path))
+    gltf, binary = read_glb(str(path))
+    indices = read_accessor(gltf, binary, gltf["meshes"][0]["primitives"][0]["indices"]).ravel()
+
+    stats = optimize_file(str(path))
+    gltf, binary = read_glb(str(path))
+    primitive = gltf["meshes"][0]["primitives"][0]
+    optimized = read_accessor(gltf, binary, primitive["indices"]).ravel()
+    vertices = gltf["accessors"][primitive["attributes"]["POSITION"]]["count"]
+    assert stats["misses"] == [acmr_misses(indices), acmr_misses(optimized)]
+    assert vertices <= acmr_misses(optimized) < acmr_misses(indices)
+    # Renumbered in first-use order
+    _, first = np.unique(optimized, return_index=True)
+    assert (np.diff(first) > 0).all()
+
+
+@pytest.mark.parametrize("gpu_instances", [True, False])
+def test_instances_keep_world_space(tmp_path, gpu_instances):
+    nb.OPTIONS["gpu_instances"] = gpu_instances
+    proto = nb.add_cube(0.4, (0, 0, 0))
+    transforms = [((x, 0.2 * x, 0), (0, 0, 0.5 * x), (1, 1 + abs(x), 1)) for x in (-1.0, 0.0, 1.0)]
+    nb.instance_copies(proto, "Cubes", transforms)
+    path = tmp_path / "instances.glb"
+    before = write_scene(path)
+
+    optimize_file(str(path))
+    assert_same_surface(before, world_triangles(str(path)))
+
+
+def test_parent_node_gets_mesh_child(tmp_path):
+    nb.add_uv_sphere(0.5, (0.5, 0, 0), segments=16, ring_count=8)
+    path = tmp_path / "parent.glb"
+    write_scene(path)
+    # Parent a second placement of the same mesh under the sphere's node
+    gltf, binary = read_glb(str(path))
+    gltf["nodes"].append({"name": "Child", "mesh": 0, "translation": [0.0, 1.0, 0.0]})
+    gltf["nodes"][0]["children"] = [1]
+    path.write_bytes(encode_glb(gltf, binary))
+    before = world_triangles(str(path))
+
+    optimize_file(str(path))
+    gltf, binary = read_glb(str(path))
+    parent = gltf["nodes"][0]
+    assert "mesh" not in parent and "scale" not in parent
+    assert [gltf["nodes"][i]["name"] for i in parent["children"]] == ["Child", "sphere.000.mesh"]
+    assert_same_surface(before, world_triangles(str(path)))
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+import numpy_backend as nb
+from gltf_io import read_accessor, read_floats, read_glb
+
+
+def sphere(levels=0):
+    obj = nb.add_uv_sphere(0.5, (0, 0, 0), segments=16, ring_count=8)
+    nb.add_subsurf(obj, levels)
+    return obj
+
+
+def torus():
+    return nb.add_torus(0.6, 0.15, (0, 0, 0), major_segments=24, minor_segments=8)
+
+
+def cylinder():
+    return nb.add_cylinder(0.4, 0.2, (0, 0, 0), vertices=12)
+
+
+def cube():
+    return nb.add_cube(0.5, (0, 0, 0))
+
+
+# (primitive, vertices, triangles) after welding
+PRIMITIVES = {
+    # 7 rings of 16 plus the two poles; two pole fans and six quad bands
+    "sphere": (sphere, 7 * 16 + 2, 2 * 16 * 7),
+    # subsurf doubles segments and rings per level
+    "sphere-subsurf": (lambda: sphere(1), 15 * 32 + 2, 2 * 32 * 15),
+    "torus": (torus, 24 * 8, 2 * 24 * 8),
+    # two rims and two cap centers; cap fans plus the side quads
+    "cylinder": (cylinder, 2 * 12 + 2, 4 * 12),
+    "cube": (cube, 8, 12),
+}
+CONVEX = ("sphere", "sphere-subsurf", "cylinder", "cube")
+
+
+@pytest.fixture(autouse=True)
+def scene():
+    nb.clear_scene()
+    yield
+    nb.clear_scene()
+
+
+@pytest.mark.parametrize("name", PRIMITIVES)
+def test_counts(name):
+    build, vertices, triangles = PRIMITIVES[name]
+    positions, indices, normals = build().geometry()
+    assert len(positions) == len(normals) == vertices
+    assert len(indices) == triangles
+    assert nb.triangle_count() == triangles
+
+
+@pytest.mark.parametrize("name", PRIMITIVES)
+def test_normals_unit_length(name):
+    _, _, normals = PRIMITIVES[name][0]().geometry()
+    np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0, atol=1e-9)
+
+
+@pytest.mark.parametrize("name", CONVEX)
+def test_normals_point_outward(name):
+    positions, indices, normals = PRIMITIVES[name][0]().geometry()
+    assert (np.einsum("ij,ij->i", normals, positions) > 0).all()
+    # Counter-clockwise winding seen from outside
+    a, b, c = (positions[indices[:, i]] for i in range(3))
+    assert (np.einsum("ij,ij->i", np.cross(b - a, c - a), a + b + c) > 0).all()
+
+
+@pytest.mark.parametrize("name", PRIMITIVES)
+def test_glb_round_trip(name, tmp_path):
+    obj = PRIMITIVES[name][0]()
+    mat = nb.pbr_material("Accent", 0x61DAFB, emission_hex=0x61DAFB, emission_strength=2.0)
+    nb.apply_mat(obj, mat)
+    positions, indices, normals = obj.geometry()
+    path = tmp_path / f"{name}.glb"
+    assert nb.write_glb(str(path)) == path.stat().st_size
+
+    gltf, binary = read_glb(str(path))
+    (primitive,) = gltf["meshes"][0]["primitives"]
+    attributes = primitive["attributes"]
+    np.testing.assert_allclose(read_floats(gltf, binary, attributes["POSITION"]),
+                               nb.to_yup(positions), atol=1e-6)
+    np.testing.assert_allclose(read_floats(gltf, binary, attributes["NORMAL"]), nb.to_yup(normals), atol=1e-6)
+    np.testing.assert_array_equal(read_accessor(gltf, binary, primitive["indices"]).reshape(-1, 3), indices)
+    accessor = gltf["accessors"][attributes["POSITION"]]
+    np.testing.assert_allclose(accessor["min"], nb.to_yup(positions).min(axis=0), atol=1e-6)
+    np.testing.assert_allclose(accessor["max"], nb.to_yup(positions).max(axis=0), atol=1e-6)
+    material = gltf["materials"][primitive["material"]]
+    assert material["extensions"]["KHR_materials_emissive_strength"]["emissiveStrength"] == 2.0
+
+
+def test_instances_round_trip(tmp_path):
+    proto = cube()
+    transforms = [((x, 0, 0), (0, 0, 0), (1, 1, 1)) for x in (-1.0, 0.0, 1.0)]
+    nb.instance_copies(proto, "Cubes", transforms)
+    path = tmp_path / "instances.glb"
+    nb.write_glb(str(path))
+
+    gltf, binary = read_glb(str(path))
+    assert gltf["extensionsUsed"] == ["EXT_mesh_gpu_instancing"]
+    (node,) = gltf["nodes"]
+    attributes = node["extensions"]["EXT_mesh_gpu_instancing"]["attributes"]
+    np.testing.assert_allclose(read_floats(gltf, binary, attributes["TRANSLATION"]),
+                               nb.to_yup([t[0] for t in transforms]))
+    assert nb.triangle_count() == 3 * 12
+    assert nb.draw_call_stats()["after"]["drawCalls"] == 1